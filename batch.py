@@ -0,0 +1,147 @@
+""" File: batch.py
+
+    This module runs a simulation of Conway's Game of Life without
+    a window, checkpointing as it goes.
+
+    To run a world file until it stops changing or reaches a generation
+    cap, type the following command:
+    >>> python -m batch worlds/diamondloop.txt --generations 10000
+
+    To pick up where the last run left off, type:
+    >>> python -m batch --resume
+
+    To run a world too large for memory, keeping at most 512 MB of it
+    in memory and the rest on disk, type:
+    >>> python -m batch --rows 200000 --columns 200000 --chunked --memory 512
+
+    To report the memory the world holds and allocates each generation,
+    with 16 MB of boards kept for rewinding as the window would, type:
+    >>> python -m batch --rows 1000 --columns 1000 --profile-memory --history 16
+"""
+import argparse
+import time
+from census import Census
+from checkpoint import Checkpointer
+from chunkedworld import ChunkedWorld
+from history import History
+from memory import MemoryProfiler
+from world import World
+
+def run(world:World|ChunkedWorld, generations:int, checkpointer:Checkpointer|None=None, profiler:MemoryProfiler|None=None) -> bool:
+    """ Steps a world until it stops changing or reaches a generation.
+
+        Args:
+            world (World|ChunkedWorld): the world to run.
+            generations (int): the generation to stop at.
+            checkpointer (Checkpointer|None): writes checkpoints while running, if given.
+            profiler (MemoryProfiler|None): records the memory allocated by each generation, if given.
+        Returns:
+            stable (bool): True if the world stopped changing.
+    """
+    stable = False
+    while world.generation < generations:
+        changes_made = world.step() if profiler is None else profiler.step(world)
+        if changes_made is False:
+            stable = True
+            break
+        if checkpointer is not None:
+            checkpointer.update(world)
+    if checkpointer is not None:
+        checkpointer.save(world)
+    return stable
+
+def main() -> None:
+    """ Parses the command line and runs a world.
+
+        Returns:
+            None
+    """
+    parser = argparse.ArgumentParser(description="Run a Game of Life world without a window.")
+    parser.add_argument("filepath", nargs="?", help="world file to run (a random world is made if omitted)")
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--density", type=float, default=.5, help="chance of each cell being alive in a random world")
+    parser.add_argument("--symmetry", choices=World.SYMMETRIES, default="none")
+    parser.add_argument("--soup", type=int, help="side of the centered box a random world is generated in")
+    parser.add_argument("--rule", help='rule in B/S notation, like "B36/S23" (the world\'s own by default)')
+    parser.add_argument("--edge", choices=World.EDGES, help="how cells beyond the edges behave, \"grow\" to grow the board as cells near them (the world's own by default)")
+    parser.add_argument("--engine", choices=World.ENGINES, default=World.DEFAULT_ENGINE, help="how generations are computed (jit when Numba is installed, otherwise tile)")
+    parser.add_argument("--memo", type=int, default=0, help="number of tile results the tile engine remembers")
+    parser.add_argument("--generations", type=int, default=1000, help="generation to stop at")
+    parser.add_argument("--chunked", action="store_true", help="keep the board on disk in chunks, for worlds larger than memory")
+    parser.add_argument("--chunk-size", type=int, default=256, help="rows and columns of each chunk of a chunked world")
+    parser.add_argument("--memory", type=int, default=64, help="megabytes of a chunked world held in memory")
+    parser.add_argument("--chunk-dir", help="directory a chunked world is stored in (a temporary one by default)")
+    parser.add_argument("--checkpoint-dir", default="checkpoints")
+    parser.add_argument("--every", type=int, default=1000, help="generations between checkpoints")
+    parser.add_argument("--seconds", type=float, default=300, help="seconds between checkpoints")
+    parser.add_argument("--keep", type=int, default=3, help="number of checkpoints kept")
+    parser.add_argument("--resume", action="store_true", help="start from the latest checkpoint")
+    parser.add_argument("--census", action="store_true", help="count the still lifes, oscillators and spaceships left at the end")
+    parser.add_argument("--profile-memory", action="store_true", help="report the memory held and allocated each generation (slows the run)")
+    parser.add_argument("--history", type=int, default=0, help="megabytes of compressed boards kept for rewinding, 0 to keep none")
+    args = parser.parse_args()
+
+    filepath = args.filepath
+    if args.resume is True:
+        filepath = Checkpointer.latest(args.checkpoint_dir)
+        if filepath is None:
+            parser.error(f'no checkpoints found in "{args.checkpoint_dir}".')
+    soup = None if args.soup is None else (args.soup, args.soup)
+    if args.chunked is True:
+        if args.symmetry != "none" or args.census is True or args.edge == "grow" or args.history > 0:
+            parser.error("--symmetry, --census, --edge grow and --history are not supported with --chunked.")
+        options = {"chunk_size": args.chunk_size, "memory": args.memory * 1024 * 1024, "directory": args.chunk_dir}
+        if filepath is not None:
+            world = ChunkedWorld.from_file(filepath, **options)
+        else:
+            world = ChunkedWorld.random(args.rows, args.columns, seed=args.seed, density=args.density, soup=soup, **options)
+    elif filepath is not None:
+        world = World.from_file(filepath)
+    else:
+        world = World.random(args.rows, args.columns, seed=args.seed, density=args.density, symmetry=args.symmetry, soup=soup)
+    if args.rule is not None:
+        world.set_rule(args.rule)
+    if args.edge is not None:
+        world.set_boundary(args.edge)
+    if args.chunked is False:
+        if args.engine == "tile":
+            world.set_engine(args.engine, memo_size=args.memo)
+        else:
+            world.set_engine(args.engine)
+        if args.history > 0:
+            world.history = History(args.history * 1024 * 1024)
+            world.history.record(world.generation, world.current_board.to_numpy(), world.origin)
+
+    checkpointer = Checkpointer(args.checkpoint_dir, args.every, args.seconds, args.keep)
+    profiler = MemoryProfiler() if args.profile_memory is True else None
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.start()
+        stable = run(world, args.generations, checkpointer, profiler)
+        # counted before a chunked world is closed and its cached chunks dropped
+        holdings = MemoryProfiler.holdings(world) if profiler is not None else None
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        if args.chunked is True:
+            world.close()
+    elapsed = time.perf_counter() - start
+
+    state = "stable" if stable else "running"
+    population = world.statistics.latest["population"]
+    print(f"generation {world.generation} ({state}), population {population}, in {elapsed:.2f}s, checkpoint: {Checkpointer.latest(args.checkpoint_dir)}")
+    if args.census is True:
+        print(f"census: {Census.format(Census(world.rule).count(world.current_board.to_numpy(), world.statistics.latest['bbox']))}")
+    if profiler is not None:
+        summary = profiler.summary()
+        print(f"memory: {MemoryProfiler.format(holdings)}")
+        print(f"allocated: peak {MemoryProfiler.format_bytes(summary['peak_step'])} per generation "
+              f"({MemoryProfiler.format_bytes(summary['peak_traced'])} traced), "
+              f"steady {MemoryProfiler.format_bytes(summary['steady_step'])} per generation "
+              f"({MemoryProfiler.format_bytes(summary['steady_traced'])} traced)")
+
+if __name__ == "__main__":
+    main()
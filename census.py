@@ -0,0 +1,251 @@
+""" File: census.py
+
+    This module holds the Census class.
+"""
+import hashlib
+from collections import Counter, deque
+import numpy as np
+from engines.lookup import LookupEngine
+from engines.rule import Rule
+
+class Census:
+    """ This class counts the objects left on a board: it splits the
+        live cells into connected objects, puts each into a canonical
+        form that is the same under rotation, reflection and
+        translation, and names it from an index of known still lifes,
+        oscillators and spaceships. Objects not in the index are
+        counted by their canonical code.
+
+        Given the bounding box of the live cells, which worlds keep in
+        their statistics, only the cells inside it are looked at, so the
+        work follows the size of the pattern rather than the board;
+        otherwise the whole board is scanned once to find the live cells.
+        The index of known objects is built when the first census with a
+        reach is made, by stepping each object through its phases, and is
+        shared by every census with that reach after that.
+    """
+    # known objects of B3/S23 by name, with their kind and one phase ("X" alive). Objects
+    # with a phase that splits into parts more than a cell apart (like the pentadecathlon)
+    # cannot be named and are left out.
+    KNOWN = {
+        "block": ("still life", ["XX", "XX"]),
+        "beehive": ("still life", ["-XX-", "X--X", "-XX-"]),
+        "loaf": ("still life", ["-XX-", "X--X", "-X-X", "--X-"]),
+        "boat": ("still life", ["XX-", "X-X", "-X-"]),
+        "ship": ("still life", ["XX-", "X-X", "-XX"]),
+        "tub": ("still life", ["-X-", "X-X", "-X-"]),
+        "pond": ("still life", ["-XX-", "X--X", "X--X", "-XX-"]),
+        "barge": ("still life", ["-X--", "X-X-", "-X-X", "--X-"]),
+        "long boat": ("still life", ["XX--", "X-X-", "-X-X", "--X-"]),
+        "snake": ("still life", ["XX-X", "X-XX"]),
+        "aircraft carrier": ("still life", ["XX--", "X--X", "--XX"]),
+        "eater": ("still life", ["XX--", "X-X-", "--X-", "--XX"]),
+        "mango": ("still life", ["-XX--", "X--X-", "-X--X", "--XX-"]),
+        "blinker": ("oscillator", ["XXX"]),
+        "toad": ("oscillator", ["-XXX", "XXX-"]),
+        "beacon": ("oscillator", ["XX--", "XX--", "--XX", "--XX"]),
+        "pulsar": ("oscillator", ["--XXX---XXX--", "-------------", "X----X-X----X", "X----X-X----X", "X----X-X----X", "--XXX---XXX--",
+                                  "-------------", "--XXX---XXX--", "X----X-X----X", "X----X-X----X", "X----X-X----X", "-------------",
+                                  "--XXX---XXX--"]),
+        "glider": ("spaceship", ["-X-", "--X", "XXX"]),
+        "lightweight spaceship": ("spaceship", ["-X--X", "X----", "X---X", "XXXX-"]),
+        "middleweight spaceship": ("spaceship", ["---X--", "-X---X", "X-----", "X----X", "XXXXX-"]),
+        "heavyweight spaceship": ("spaceship", ["---XX--", "-X----X", "X------", "X-----X", "XXXXXX-"]),
+    }
+    # canonical codes of every phase of the known objects by reach, built on first use
+    _indexes = {}
+
+    def __init__(self, rule:str="B3/S23", reach:int=2) -> None:
+        """ Initializes an instance of the Census.
+
+            Args:
+                rule (str): the rule of the boards counted. Known objects are only
+                named under B3/S23, other rules count every object by its code.
+                reach (int): how far apart (in rows or columns) two live cells may be
+                and still belong to the same object, 1 for touching cells. At 2, the
+                parts of oscillators and spaceships one dead cell apart stay together.
+            Returns:
+                None
+        """
+        self.reach = reach
+        self.index = Census.known_index(reach) if Rule(rule) == Rule("B3/S23") else {}
+
+    @staticmethod
+    def known_index(reach:int=2) -> dict[str, tuple[str, str]]:
+        """ Steps every known object through its phases and indexes the
+            canonical code of each phase. Phases are split into objects the
+            way a census with the same reach splits a board, and an object
+            with a phase that splits into several is left out of the index,
+            since the census never sees that phase whole.
+
+            Examples:
+                >>> census = Census()
+                >>> engine = LookupEngine(Rule("B3/S23"))
+                >>> missed = []
+                >>> for name, (kind, lines) in Census.KNOWN.items():
+                ...     cells = Census.place(lines)
+                ...     for _ in range(15):
+                ...         if census.count(cells) != {name: 1}:
+                ...             missed.append(name)
+                ...         cells = engine.step(cells)
+                >>> print(missed)
+                []
+
+            Args:
+                reach (int): the reach of the census the index is for.
+            Returns:
+                index (dict[str, tuple[str, str]]): the name and kind of the object by code.
+        """
+        if reach not in Census._indexes:
+            engine = LookupEngine(Rule("B3/S23"))
+            index = {}
+            for name, (kind, lines) in Census.KNOWN.items():
+                cells = Census.place(lines)
+                codes = []
+                first = None
+                for _ in range(30):
+                    objects = Census.split(cells, reach)
+                    if len(objects) != 1:
+                        codes = []
+                        break
+                    code = Census.canonical(objects[0])
+                    if code == first:
+                        break
+                    first = first or code
+                    codes.append(code)
+                    cells = engine.step(cells)
+                for code in codes:
+                    index[code] = (name, kind)
+            Census._indexes[reach] = index
+        return Census._indexes[reach]
+
+    @staticmethod
+    def place(lines:list[str]) -> np.ndarray:
+        """ Draws an object from its lines ("X" alive) in the middle of an
+            empty board with room for a spaceship to travel a full period
+            without reaching the edge.
+
+            Args:
+                lines (list[str]): the rows of the object.
+            Returns:
+                cells (np.ndarray): a 2D boolean array of live cells.
+        """
+        margin = 10
+        cells = np.zeros((len(lines) + 2 * margin, len(lines[0]) + 2 * margin), dtype=bool)
+        for row, line in enumerate(lines):
+            for column, cell in enumerate(line):
+                cells[margin + row, margin + column] = cell == "X"
+        return cells
+
+    def objects(self, cells:np.ndarray, bbox:tuple[int, int, int, int]|None=None) -> list[np.ndarray]:
+        """ Splits the live cells of a board into objects, each the cells
+            reachable from one another in steps of at most reach rows and columns.
+
+            Args:
+                cells (np.ndarray): a 2D boolean array of live cells.
+                bbox (tuple[int, int, int, int]|None): the bounding box of the live
+                cells (see World.bounding_box), to only look inside it, or None to
+                look at the whole board.
+            Returns:
+                objects (list[np.ndarray]): the (row, column) coordinates of each object.
+        """
+        if bbox is None:
+            return Census.split(cells, self.reach)
+        top, left, bottom, right = bbox
+        objects = Census.split(cells[top:bottom + 1, left:right + 1], self.reach)
+        return [coordinates + (top, left) for coordinates in objects]
+
+    @staticmethod
+    def split(cells:np.ndarray, reach:int) -> list[np.ndarray]:
+        """ Splits the live cells of a board into objects, each the cells
+            reachable from one another in steps of at most reach rows and columns.
+
+            Args:
+                cells (np.ndarray): a 2D boolean array of live cells.
+                reach (int): the most rows or columns between cells of one object.
+            Returns:
+                objects (list[np.ndarray]): the (row, column) coordinates of each object.
+        """
+        coordinates = np.argwhere(cells)
+        unvisited = {(int(row), int(column)) for row, column in coordinates}
+        offsets = [(row, column) for row in range(-reach, reach + 1) for column in range(-reach, reach + 1) if row or column]
+        objects = []
+        while unvisited:
+            start = unvisited.pop()
+            members = [start]
+            queue = deque([start])
+            while queue:
+                row, column = queue.popleft()
+                for row_offset, column_offset in offsets:
+                    neighbor = (row + row_offset, column + column_offset)
+                    if neighbor in unvisited:
+                        unvisited.remove(neighbor)
+                        members.append(neighbor)
+                        queue.append(neighbor)
+            objects.append(np.array(members))
+        return objects
+
+    @staticmethod
+    def canonical(coordinates:np.ndarray) -> str:
+        """ Makes a code for the shape of an object that is the same
+            wherever it is and however it is rotated or reflected: the
+            smallest of its 8 orientations, hashed.
+
+            Args:
+                coordinates (np.ndarray): the (row, column) coordinates of the object's cells.
+            Returns:
+                code (str): the number of cells and a hash of the canonical orientation.
+        """
+        if len(coordinates) == 0:
+            return "0"
+        rows = coordinates[:, 0]
+        columns = coordinates[:, 1]
+        smallest = None
+        for first, second in ((rows, columns), (columns, rows)):
+            for first_sign in (1, -1):
+                for second_sign in (1, -1):
+                    oriented_rows = first * first_sign
+                    oriented_columns = second * second_sign
+                    oriented_rows = oriented_rows - oriented_rows.min()
+                    oriented_columns = oriented_columns - oriented_columns.min()
+                    height = int(oriented_rows.max()) + 1
+                    width = int(oriented_columns.max()) + 1
+                    grid = np.zeros((height, width), dtype=bool)
+                    grid[oriented_rows, oriented_columns] = True
+                    key = (height, width, np.packbits(grid).tobytes())
+                    if smallest is None or key < smallest:
+                        smallest = key
+        height, width, packed = smallest
+        digest = hashlib.sha1(f"{height}x{width}".encode() + packed).hexdigest()[:12]
+        return f"{len(coordinates)}c_{digest}"
+
+    def count(self, cells:np.ndarray, bbox:tuple[int, int, int, int]|None=None) -> dict[str, int]:
+        """ Takes a census of a board.
+
+            Args:
+                cells (np.ndarray): a 2D boolean array of live cells.
+                bbox (tuple[int, int, int, int]|None): the bounding box of the live
+                cells, to only look inside it, or None to look at the whole board.
+            Returns:
+                counts (dict[str, int]): the number of each object, by name for known
+                objects and by canonical code for the others, most common first.
+        """
+        counts = Counter()
+        for coordinates in self.objects(cells, bbox):
+            code = Census.canonical(coordinates)
+            if code in self.index:
+                counts[self.index[code][0]] += 1
+            else:
+                counts[code] += 1
+        return dict(counts.most_common())
+
+    @staticmethod
+    def format(counts:dict[str, int]) -> str:
+        """ Writes a census on one line, like "block:3, blinker:2".
+
+            Args:
+                counts (dict[str, int]): a census from count.
+            Returns:
+                text (str): the census.
+        """
+        return ", ".join(f"{name}:{count}" for name, count in counts.items())
@@ -0,0 +1,129 @@
+""" File: checkpoint.py
+
+    This module holds the Checkpointer class.
+
+    Checkpoints are ordinary world files (see world.py) that also record
+    the generation, rule, edge and seed, so a checkpoint can be opened
+    like any preset to resume a run.
+"""
+import os
+import re
+import tempfile
+import time
+from typing import TYPE_CHECKING
+if TYPE_CHECKING: # only for annotations, so the window can start without loading numpy
+    from datastructures.array2d import Array2D
+    from world import World
+
+class Checkpointer:
+    """ This class periodically writes the state of a world to a
+        checkpoint directory, keeping only the most recent checkpoints.
+    """
+    def __init__(self, directory:str="checkpoints", every_generations:int|None=1000, every_seconds:float|None=300, keep:int=3) -> None:
+        """ Initializes an instance of the Checkpointer.
+
+            Args:
+                directory (str): the directory checkpoints are written to.
+                every_generations (int|None): checkpoints are written each time the generation
+                passes a multiple of this, None to disable.
+                every_seconds (float|None): seconds between checkpoints, None to disable.
+                keep (int): the number of checkpoints kept in the directory (at least 1).
+            Returns:
+                None
+        """
+        self.directory = directory
+        self.every_generations = every_generations
+        self.every_seconds = every_seconds
+        self.keep = max(keep, 1)
+        self.last_generation = None
+        self.last_time = time.monotonic()
+
+    def update(self, world:'World', board:'Array2D|None'=None, generation:int|None=None) -> str|None:
+        """ Writes a checkpoint of the world if one is due.
+
+            Args:
+                world (World): the world being run.
+                board (Array2D|None): the board of the world to checkpoint, like the
+                one shown while a worker steps ahead, the current board if None.
+                generation (int|None): the generation of that board.
+            Returns:
+                filepath (str|None): the checkpoint written, or None if none was due.
+        """
+        if board is None:
+            generation = world.generation
+        if self.last_generation is None:
+            # first call comes right after the world's first step
+            self.last_generation = generation - 1
+        due = False
+        if self.every_generations is not None and generation // self.every_generations > self.last_generation // self.every_generations:
+            due = True
+        if self.every_seconds is not None and time.monotonic() - self.last_time >= self.every_seconds:
+            due = True
+        if due is True:
+            return self.save(world, board, generation)
+        return None
+
+    def save(self, world:'World', board:'Array2D|None'=None, generation:int|None=None) -> str:
+        """ Atomically writes a checkpoint of the world and removes
+            checkpoints beyond the retention limit.
+
+            The checkpoint is written to a temporary file in the same directory
+            and renamed over its final name, so a crash never leaves a partially
+            written checkpoint behind.
+
+            Args:
+                world (World): the world to checkpoint.
+                board (Array2D|None): the board of the world to checkpoint, the current board if None.
+                generation (int|None): the generation of that board.
+            Returns:
+                filepath (str): the checkpoint written.
+        """
+        if board is None:
+            generation = world.generation
+        os.makedirs(self.directory, exist_ok=True)
+        filepath = os.path.join(self.directory, f"checkpoint-{generation:09d}.txt")
+
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix=".checkpoint-", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w") as checkpoint_file:
+                world.write(checkpoint_file, board=board, generation=generation)
+                checkpoint_file.flush()
+                os.fsync(checkpoint_file.fileno())
+            os.replace(temporary_path, filepath)
+        except:
+            os.remove(temporary_path)
+            raise
+
+        self.last_generation = generation
+        self.last_time = time.monotonic()
+        for old_filepath in Checkpointer.list(self.directory)[self.keep:]:
+            os.remove(old_filepath)
+        return filepath
+
+    @staticmethod
+    def list(directory:str) -> list[str]:
+        """ Lists the checkpoints in a directory, newest first.
+
+            Args:
+                directory (str): the checkpoint directory.
+            Returns:
+                filepaths (list[str]): the checkpoint filepaths.
+        """
+        if not os.path.isdir(directory):
+            return []
+        filepaths = [os.path.join(directory, name) for name in os.listdir(directory) if re.fullmatch(r"checkpoint-\d+\.txt", name)]
+        return sorted(filepaths, key=lambda filepath: (os.path.getmtime(filepath), filepath), reverse=True)
+
+    @staticmethod
+    def latest(directory:str) -> str|None:
+        """ Finds the most recently written checkpoint in a directory.
+
+            Args:
+                directory (str): the checkpoint directory.
+            Returns:
+                filepath (str|None): the latest checkpoint, or None if there are none.
+        """
+        filepaths = Checkpointer.list(directory)
+        if filepaths:
+            return filepaths[0]
+        return None
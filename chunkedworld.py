@@ -0,0 +1,288 @@
+""" File: chunkedworld.py
+
+    This module holds the ChunkedWorld class.
+"""
+import random
+import numpy as np
+from datastructures.chunked_array2d import ChunkedArray2D
+from engines.rule import Rule
+from stats import Statistics
+from world import World
+
+class ChunkedWorld:
+    """ This class is a world whose board is too large to hold in
+        memory. The board is kept on disk in chunks (see ChunkedArray2D)
+        and stepped one chunk at a time, each with a one cell halo
+        read from its neighbors, so memory use is capped by the memory
+        setting whatever the size of the board.
+
+        It steps, checkpoints and writes world files like a World, for
+        running without a window. Chunks with no live cells nearby are
+        skipped entirely.
+    """
+    def __init__(self, rows:int, columns:int, cell_size:int=10, generation:int=0, rule:str="B3/S23", boundary:str="dead",
+                 chunk_size:int=256, memory:int=64 * 1024 * 1024, directory:str|None=None, seed:int|None=None, density:float=.5,
+                 soup:tuple[int, int]|None=None) -> None:
+        """ Initializes an instance of the ChunkedWorld with an empty board.
+
+            Args:
+                rows (int): the number of rows.
+                columns (int): the number of columns.
+                cell_size (int): the cell size in pixels, written to world files.
+                generation (int): the generation number of the starting board.
+                rule (str): the birth/survival rule in B/S notation.
+                boundary (str): how cells beyond the edges of the board behave,
+                one of LookupEngine.BOUNDARIES.
+                chunk_size (int): the number of rows and columns of each chunk.
+                memory (int): the most bytes of chunks held in memory, split
+                between the current and the next board.
+                directory (str|None): the directory the boards are stored in,
+                a temporary one if None.
+                seed (int|None): the seed the board was randomly generated from, if any.
+                density (float): the chance of each cell being alive when randomly generated.
+                soup (tuple[int, int]|None): the rows and columns of the centered box
+                cells were randomly generated in, None if the whole board was used.
+            Returns:
+                None
+        """
+        self.rows = rows
+        self.columns = columns
+        self.cell_size = cell_size
+        self.generation = generation
+        self.boundary = boundary
+        self.seed = seed
+        self.density = density
+        self.soup = soup
+        self.engine = World.ENGINES[World.DEFAULT_ENGINE](Rule(rule), boundary)
+        self.rule = str(self.engine.rule)
+
+        self.current_board = ChunkedArray2D(rows, columns, chunk_size, memory // 2, directory)
+        self.next_board = ChunkedArray2D(rows, columns, chunk_size, memory // 2, directory)
+        self.statistics = Statistics()
+
+    @staticmethod
+    def random(rows:int, columns:int, cell_size:int=10, seed:int|None=None, density:float=.5, soup:tuple[int, int]|None=None,
+               **options) -> 'ChunkedWorld':
+        """ Creates a world where each cell has a chance of being alive,
+            one row of chunks at a time. The same arguments make the same
+            board as World.random.
+
+            Args:
+                rows (int): the number of rows.
+                columns (int): the number of columns.
+                cell_size (int): the cell size in pixels.
+                seed (int|None): the seed for the generator, a new one is picked if None.
+                density (float): the chance of each cell being alive, from 0 to 1.
+                soup (tuple[int, int]|None): the rows and columns of a box in the center
+                of the board to fill, leaving the rest dead. None fills the whole board.
+                options: the other arguments of the ChunkedWorld, like memory.
+            Returns:
+                world (ChunkedWorld): the randomly generated world.
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        generator = np.random.default_rng(seed)
+        world = ChunkedWorld(rows, columns, cell_size, seed=seed, density=density, soup=soup, **options)
+
+        if soup is None:
+            box_rows, box_columns = rows, columns
+        else:
+            box_rows, box_columns = min(soup[0], rows), min(soup[1], columns)
+        top = (rows - box_rows) // 2
+        left = (columns - box_columns) // 2
+
+        # the generator draws the box row by row, so drawing it a band at a time gives the same cells
+        size = world.current_board.chunk_size
+        for chunk_row in range(world.current_board.chunk_rows):
+            first = chunk_row * size
+            last = min(first + size, rows)
+            cells = np.zeros((last - first, columns), dtype=bool)
+            box_first = max(first, top)
+            box_last = min(last, top + box_rows)
+            if box_first < box_last:
+                cells[box_first - first:box_last - first, left:left + box_columns] = generator.random((box_last - box_first, box_columns), dtype=np.float32) < density
+            world.current_board.set_band(chunk_row, cells)
+        world.record_start()
+        return world
+
+    @staticmethod
+    def from_file(filepath:str, **options) -> 'ChunkedWorld':
+        """ Creates a world from a world file, reading one row of chunks
+            at a time.
+
+            Args:
+                filepath (str): the filepath of the world file.
+                options: the other arguments of the ChunkedWorld, like memory.
+            Returns:
+                world (ChunkedWorld): the world stored in the file.
+            Raises:
+                ValueError: if the file is not a valid world file.
+        """
+        with open(filepath) as world_file:
+            settings = {}
+            line = world_file.readline()
+            while ":" in line:
+                key, value = line.split(":", 1)
+                settings[key.strip()] = value.strip()
+                line = world_file.readline()
+            try:
+                rows = int(settings["rows"])
+                columns = int(settings["cols"])
+                cell_size = int(settings["size"])
+            except (KeyError, ValueError):
+                raise ValueError(f'"{filepath}" is missing its size, rows or cols.')
+
+            seed = settings.get("seed")
+            soup = settings.get("soup")
+            if soup:
+                soup_rows, soup_columns = soup.split("x")
+                soup = (int(soup_rows), int(soup_columns))
+            world = ChunkedWorld(rows, columns, cell_size, generation=int(settings.get("gen", 0)), rule=settings.get("rule", "B3/S23"),
+                                 boundary=settings.get("edge", "dead"), seed=int(seed) if seed else None, density=float(settings.get("density", .5)),
+                                 soup=soup or None, **options)
+
+            size = world.current_board.chunk_size
+            row = 0
+            for chunk_row in range(world.current_board.chunk_rows):
+                height = min(size, rows - row)
+                cells = np.zeros((height, columns), dtype=bool)
+                for band_row in range(height):
+                    text = line.rstrip()
+                    if len(text) != columns:
+                        world.close()
+                        raise ValueError(f'row {row} of "{filepath}" does not have {columns} columns.')
+                    cells[band_row] = np.frombuffer(text.encode(), dtype=np.uint8) == ord("X")
+                    line = world_file.readline()
+                    row += 1
+                world.current_board.set_band(chunk_row, cells)
+        world.record_start()
+        return world
+
+    def record_start(self) -> None:
+        """ Records the counts of the starting board.
+
+            Returns:
+                None
+        """
+        self.statistics.record(self.generation, self.current_board.population, 0, 0, None)
+
+    def write(self, world_file, initial:bool=False) -> None:
+        """ Writes the world in the world file format to an open file,
+            one row of chunks at a time.
+
+            Args:
+                world_file (file): a file opened for writing text.
+                initial (bool): accepted for World compatibility; only the
+                current board is kept, so it is always the one written.
+            Returns:
+                None
+        """
+        world_file.write(f"size:{self.cell_size}\nrows:{self.rows}\ncols:{self.columns}\n")
+        if self.generation != 0:
+            world_file.write(f"gen:{self.generation}\n")
+        if self.rule != "B3/S23":
+            world_file.write(f"rule:{self.rule}\n")
+        if self.boundary != "dead":
+            world_file.write(f"edge:{self.boundary}\n")
+        if self.seed is not None:
+            world_file.write(f"seed:{self.seed}\ndensity:{self.density}\n")
+            if self.soup is not None:
+                world_file.write(f"soup:{self.soup[0]}x{self.soup[1]}\n")
+        characters = np.array([ord("-"), ord("X")], dtype=np.uint8)
+        for chunk_row in range(self.current_board.chunk_rows):
+            for cells in self.current_board.band(chunk_row):
+                world_file.write(characters[cells.view(np.uint8)].tobytes().decode() + "\n")
+
+    def set_rule(self, rule:str) -> None:
+        """ Changes the birth/survival rule the world is stepped with.
+
+            Args:
+                rule (str): the rule in B/S notation, like "B3/S23" or "B36/S23".
+            Returns:
+                None
+            Raises:
+                ValueError: if the rule is not valid B/S notation.
+        """
+        self.engine = World.ENGINES[World.DEFAULT_ENGINE](Rule(rule), self.boundary)
+        self.rule = str(self.engine.rule)
+
+    def set_boundary(self, boundary:str) -> None:
+        """ Changes how cells beyond the edges of the board behave.
+
+            Args:
+                boundary (str): "dead", "torus" or "mirror", as for World.
+            Returns:
+                None
+            Raises:
+                ValueError: if the boundary is not one of LookupEngine.BOUNDARIES.
+        """
+        self.engine = World.ENGINES[World.DEFAULT_ENGINE](self.engine.rule, boundary)
+        self.boundary = boundary
+
+    def halo_indices(self, first:int, length:int, size:int) -> np.ndarray:
+        """ Lists the rows (or columns) of a chunk and the one on each side
+            of it, mapped back onto the board the way the boundary does.
+
+            Args:
+                first (int): the first row of the chunk.
+                length (int): the number of rows of the chunk.
+                size (int): the number of rows of the board.
+            Returns:
+                indices (np.ndarray): the rows, -1 for dead cells beyond the edge.
+        """
+        indices = np.arange(first - 1, first + length + 1)
+        if self.boundary == "torus":
+            return indices % size
+        if self.boundary == "mirror":
+            return np.where(indices < 0, -indices - 1, np.where(indices >= size, 2 * size - indices - 1, indices))
+        return np.where((indices < 0) | (indices >= size), -1, indices)
+
+    def step(self) -> bool:
+        """ Calculates the next generation of cells one chunk at a time
+            and replaces the current generation with it.
+
+            Returns:
+                changes_made (bool): False if the board did not change.
+        """
+        board = self.current_board
+        size = board.chunk_size
+        # without births from nothing, a chunk with no live cells in or around it stays empty
+        skip_empty = 0 not in self.engine.rule.birth
+        births = 0
+        deaths = 0
+        for chunk_row in range(board.chunk_rows):
+            height = min(size, self.rows - chunk_row * size)
+            row_indices = self.halo_indices(chunk_row * size, height, self.rows)
+            row_chunks = np.unique(row_indices[row_indices >= 0] // size)
+            for chunk_column in range(board.chunk_columns):
+                width = min(size, self.columns - chunk_column * size)
+                column_indices = self.halo_indices(chunk_column * size, width, self.columns)
+                if skip_empty:
+                    column_chunks = np.unique(column_indices[column_indices >= 0] // size)
+                    if not board.populations[np.ix_(row_chunks, column_chunks)].any():
+                        self.next_board.set_chunk(chunk_row, chunk_column, board.empty)
+                        continue
+
+                halo = board.gather(row_indices, column_indices)
+                cells = self.engine.step_padded(halo.astype(np.uint16))
+                old_cells = halo[1:-1, 1:-1]
+                births += int(np.count_nonzero(cells > old_cells))
+                deaths += int(np.count_nonzero(cells < old_cells))
+                chunk = np.zeros((size, size), dtype=bool)
+                chunk[:height, :width] = cells
+                self.next_board.set_chunk(chunk_row, chunk_column, chunk)
+
+        self.current_board, self.next_board = self.next_board, self.current_board
+        self.generation += 1
+        population = self.statistics.latest["population"] + births - deaths
+        self.statistics.record(self.generation, population, births, deaths, None)
+        return births > 0 or deaths > 0
+
+    def close(self) -> None:
+        """ Removes the files the boards are stored in.
+
+            Returns:
+                None
+        """
+        self.current_board.close()
+        self.next_board.close()
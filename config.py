@@ -2,31 +2,52 @@
     
     This module holds the Config class.
 """
-from simulator import Simulator
+import workspace as workspaces
+from checkpoint import Checkpointer
 import tkinter as tk
-from tkinter import filedialog
+from tkinter import ttk, filedialog
 
 class Config:
     """ This is class starts up a window with several 
         options for configuring a Game of Life simulation.
     """
-    def __init__(self, cell_size, rows, columns) -> None:
+    # well known rules offered in the rule box, any other B/S rule can be typed in
+    RULES = ("B3/S23", "B36/S23", "B3678/S34678", "B2/S", "B3/S012345678", "B1357/S1357")
+    # World.SYMMETRIES and World.EDGES, listed here so the options are shown without loading numpy
+    SYMMETRIES = ("none", "horizontal", "vertical", "both", "rotational")
+    EDGES = ("dead", "torus", "mirror", "grow")
+    # Simulator.HISTORY_BYTES in megabytes, the rewind history offered by default
+    HISTORY_MEGABYTES = 64
+
+    def __init__(self, cell_size, rows, columns, workspace:'workspaces.Workspace|None'=None) -> None:
         """ Initializes an instance of the Config
             
             Args:
                 cell_size (int): the desired cell size in pixels (at least 1).
                 rows (int): the desired number of rows (at least 10).
                 columns (int): the desired number of columns (at least 10).
+                workspace (Workspace|None): the window the world is opened in,
+                None to start a new one.
             Returns:
                 None
         """
-        self.root = tk.Tk()
-
+        standalone = workspace is None
+        if standalone is True:
+            workspace = workspaces.Workspace()
+        self.workspace = workspace
+        if workspace.simulators:
+            # other worlds are running, so the options get a window of their own over them
+            self.root = tk.Toplevel(workspace.root)
+            self.root.transient(workspace.root)
+            self.root.title("Conway's Game of Life")
+            self.root.iconbitmap("assets/gol.ico")
+        else:
+            self.root = workspace.show_view()
         background_color = "#F4F4F4"
         foreground_color = "black"
+        self.background_color = background_color
+        self.foreground_color = foreground_color
         
-        self.root.title("Conway's Game of Life")
-        self.root.iconbitmap("assets/gol.ico")
         self.root.configure(bg=background_color)
 
         # creating cell size widget
@@ -88,19 +109,112 @@ class Config:
         self.col_text.bind("<Return>",self.col_text_entry)
         self.col_text.bind("<FocusOut>",self.col_text_entry)   
 
+        # creating density widget
+        density_element = tk.Frame(self.root, bg=background_color)
+        density_element.grid(row=3, column=0, padx=(20,10), pady=(0,10))
+
+        density_label = tk.Label(density_element, text="Density (%)", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13))
+        density_label.pack()
+
+        self.density_text = tk.Entry(density_element, justify="center", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13), 
+                                  validate="key", validatecommand=(numeric_validation, "%P"), relief=tk.SOLID)
+        self.density_text.pack()
+        self.density_text.insert(0, "50")
+        self.density_text.bind("<Return>",self.density_text_entry)
+        self.density_text.bind("<FocusOut>",self.density_text_entry)
+
+        # creating seed widget, left empty for a new seed each time
+        seed_element = tk.Frame(self.root, bg=background_color)
+        seed_element.grid(row=3, column=1, padx=(10,20), pady=(0,10))
+
+        seed_label = tk.Label(seed_element, text="Seed", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13))
+        seed_label.pack()
+
+        self.seed_text = tk.Entry(seed_element, justify="center", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13), 
+                                  validate="key", validatecommand=(numeric_validation, "%P"), relief=tk.SOLID)
+        self.seed_text.pack()
+
+        # creating symmetry widget
+        symmetry_element = tk.Frame(self.root, bg=background_color)
+        symmetry_element.grid(row=4, column=0, padx=(20,10), pady=(0,10))
+
+        symmetry_label = tk.Label(symmetry_element, text="Symmetry", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13))
+        symmetry_label.pack()
+
+        self.symmetry = tk.StringVar(self.root, self.SYMMETRIES[0])
+        symmetry_menu = tk.OptionMenu(symmetry_element, self.symmetry, *self.SYMMETRIES)
+        symmetry_menu.config(bg=background_color, fg=foreground_color, width=8, font=("Helvetica", 11), relief=tk.SOLID, highlightthickness=0)
+        symmetry_menu.pack()
+
+        # creating soup size widget, left empty to fill the whole board
+        soup_element = tk.Frame(self.root, bg=background_color)
+        soup_element.grid(row=4, column=1, padx=(10,20), pady=(0,10))
+
+        soup_label = tk.Label(soup_element, text="Soup Size", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13))
+        soup_label.pack()
+
+        self.soup_text = tk.Entry(soup_element, justify="center", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13), 
+                                  validate="key", validatecommand=(numeric_validation, "%P"), relief=tk.SOLID)
+        self.soup_text.pack()
+
+        # creating rule widget
+        rule_element = tk.Frame(self.root, bg=background_color)
+        rule_element.grid(row=5, column=0, padx=(20,10), pady=(0,10))
+
+        rule_label = tk.Label(rule_element, text="Rule", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13))
+        rule_label.pack()
+
+        self.rule_text = ttk.Combobox(rule_element, justify="center", values=self.RULES, width=12, font=("Helvetica", 13))
+        self.rule_text.pack()
+        self.rule_text.set(self.RULES[0])
+        self.rule_text.bind("<Return>",self.rule_text_entry)
+        self.rule_text.bind("<FocusOut>",self.rule_text_entry)
+
+        # creating edge widget
+        edge_element = tk.Frame(self.root, bg=background_color)
+        edge_element.grid(row=5, column=1, padx=(10,20), pady=(0,10))
+
+        edge_label = tk.Label(edge_element, text="Edges", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13))
+        edge_label.pack()
+
+        self.edge = tk.StringVar(self.root, "dead")
+        edge_menu = tk.OptionMenu(edge_element, self.edge, *self.EDGES)
+        edge_menu.config(bg=background_color, fg=foreground_color, width=8, font=("Helvetica", 11), relief=tk.SOLID, highlightthickness=0)
+        edge_menu.pack()
+
+        # creating rewind history widget, 0 to keep no boards for rewinding
+        history_element = tk.Frame(self.root, bg=background_color)
+        history_element.grid(row=6, column=0, columnspan=2, pady=(0,10))
+
+        history_label = tk.Label(history_element, text="Rewind History (MB)", bg=background_color, fg=foreground_color, width=20, font=("Helvetica", 13))
+        history_label.pack()
+
+        self.history_text = tk.Entry(history_element, justify="center", bg=background_color, fg=foreground_color, width=10, font=("Helvetica", 13),
+                                  validate="key", validatecommand=(numeric_validation, "%P"), relief=tk.SOLID)
+        self.history_text.pack()
+        self.history_text.insert(0, str(self.HISTORY_MEGABYTES))
+        self.history_text.bind("<Return>",self.history_text_entry)
+        self.history_text.bind("<FocusOut>",self.history_text_entry)
+
         # creating generation buttons
         random_button = tk.Button(self.root, text="Generate Random World", command=self.random, bg=background_color, fg=foreground_color, font=("Helvetica", 11), width=20, relief=tk.SOLID)
-        random_button.grid(row=3, column=0, columnspan=2, pady=(0,10))
+        random_button.grid(row=7, column=0, columnspan=2, pady=(0,10))
 
         from_file_button = tk.Button(self.root, text="Generate World From File", command=self.from_file, bg=background_color, fg=foreground_color, font=("Helvetica", 11), width=20, relief=tk.SOLID)
-        from_file_button.grid(row=4, column=0, columnspan=2, pady=(0,10))
+        from_file_button.grid(row=8, column=0, columnspan=2, pady=(0,10))
 
-        # starting up window
-        window_x = self.root.winfo_screenwidth() // 2 - self.root.winfo_width() // 2
-        window_y = self.root.winfo_screenheight() // 2 - self.root.winfo_height() // 2
-        self.root.geometry(f"+{window_x}+{window_y}")
+        resume_button = tk.Button(self.root, text="Resume Last Run", command=self.resume, bg=background_color, fg=foreground_color, font=("Helvetica", 11), width=20, relief=tk.SOLID)
+        resume_button.grid(row=9, column=0, columnspan=2, pady=(0,10))
+        if Checkpointer.latest("checkpoints") is None:
+            resume_button.config(state=tk.DISABLED)
 
-        self.root.mainloop()
+        # starting up window
+        if standalone is True:
+            workspace.run()
+        elif isinstance(self.root, tk.Toplevel):
+            window_x = self.root.winfo_screenwidth() // 2 - self.root.winfo_width() // 2
+            window_y = self.root.winfo_screenheight() // 2 - self.root.winfo_height() // 2
+            self.root.geometry(f"+{window_x}+{window_y}")
         
     def validate_numeric(self, entry:str) -> bool:
         """ Checks if a text entry is numeric
@@ -139,7 +253,7 @@ class Config:
         """ Updates cell_size based on rows text entry.
         
             If the input value is less than 10, the value will be 10.
-            If the input value is greater than 1000, the value will be 1000.
+            If the input value is greater than 10000, the value will be 10000.
 
             Args:
                 event: the text box event which called the function.
@@ -149,9 +263,9 @@ class Config:
         if self.row_text.get() == "" or int(self.row_text.get()) < 10:
             self.row_text.delete(0, tk.END)
             self.row_text.insert(0, "10")
-        elif int(self.row_text.get()) > 1000:
+        elif int(self.row_text.get()) > 10000:
             self.row_text.delete(0, tk.END)
-            self.row_text.insert(0, "1000")
+            self.row_text.insert(0, "10000")
         if self.rows != int(self.row_text.get()):
             self.rows = int(self.row_text.get())
 
@@ -159,7 +273,7 @@ class Config:
         """ Updates cell_size based on columns text entry.
         
             If the input value is less than 10, the value will be 10.
-            If the input value is greater than 1000, the value will be 1000.
+            If the input value is greater than 10000, the value will be 10000.
 
             Args:
                 event: the text box event which called the function.
@@ -169,33 +283,195 @@ class Config:
         if self.col_text.get() == "" or int(self.col_text.get()) < 10:
             self.col_text.delete(0, tk.END)
             self.col_text.insert(0, "10")
-        elif int(self.col_text.get()) > 1000:
+        elif int(self.col_text.get()) > 10000:
             self.col_text.delete(0, tk.END)
-            self.col_text.insert(0, "1000")
+            self.col_text.insert(0, "10000")
         if self.columns != int(self.col_text.get()):
             self.columns = int(self.col_text.get())
 
+    def density_text_entry(self, event:object=None) -> None:
+        """ Updates the density text entry to stay within range.
+        
+            If the input value is less than 1, the value will be 1.
+            If the input value is greater than 100, the value will be 100.
+
+            Args:
+                event: the text box event which called the function.
+            Returns:
+                None
+        """
+        if self.density_text.get() == "" or int(self.density_text.get()) < 1:
+            self.density_text.delete(0, tk.END)
+            self.density_text.insert(0, "1")
+        elif int(self.density_text.get()) > 100:
+            self.density_text.delete(0, tk.END)
+            self.density_text.insert(0, "100")
+
+    def history_text_entry(self, event:object=None) -> None:
+        """ Updates the rewind history text entry to stay within range.
+
+            If the input is empty, the value will be 0, keeping no history.
+
+            Args:
+                event: the text box event which called the function.
+            Returns:
+                None
+        """
+        if self.history_text.get() == "":
+            self.history_text.insert(0, "0")
+
+    def rule_text_entry(self, event:object=None) -> None:
+        """ Updates the rule text entry to the rule in standard B/S notation.
+        
+            If the input is not a valid rule, the value will be B3/S23.
+
+            Args:
+                event: the text box event which called the function.
+            Returns:
+                None
+        """
+        from engines.rule import Rule
+        try:
+            rule = str(Rule(self.rule_text.get()))
+        except ValueError:
+            rule = self.RULES[0]
+        self.rule_text.set(rule)
+
     def random(self) -> None:
         """ Action for when random generation button is pressed.
-            Invokes an instance of the Simulator class.
+            Generates a world from the density, seed, symmetry,
+            soup size, rule and edge options and invokes an instance of
+            the Simulator class with it.
             
             Returns:
                 None
         """
+        from world import World
         self.cell_size_text_entry()
         self.row_text_entry()
         self.col_text_entry()
-        self.root.destroy()
-        Simulator(rows=self.rows, columns=self.columns, cell_size=self.cell_size)   
+        self.density_text_entry()
+        self.rule_text_entry()
+
+        seed = None
+        if self.seed_text.get() != "":
+            seed = int(self.seed_text.get())
+        soup = None
+        if self.soup_text.get() != "" and int(self.soup_text.get()) > 0:
+            soup = (int(self.soup_text.get()), int(self.soup_text.get()))
+        world = World.random(self.rows, self.columns, self.cell_size, seed=seed, density=int(self.density_text.get()) / 100,
+                             symmetry=self.symmetry.get(), soup=soup)
+        world.set_rule(self.rule_text.get())
+        world.set_boundary(self.edge.get())
+
+        self.open(rows=self.rows, columns=self.columns, cell_size=self.cell_size, world=world)
 
     def from_file(self) -> None:
         """ Action for when generate from preset button is pressed.
-            Invokes an instance of the Simulator class.
+            Opens a browser over the indexed worlds folder, with a
+            thumbnail and details of the selected world.
+            
+            Returns:
+                None
+        """
+        from library import PatternLibrary
+        if self.workspace.library is None:
+            self.workspace.library = PatternLibrary("worlds")
+        library = self.workspace.library
+        entries = library.scan()
+
+        browser = tk.Toplevel(self.root, bg=self.background_color)
+        browser.title("Choose a World")
+        browser.transient(self.root.winfo_toplevel())
+
+        list_frame = tk.Frame(browser, bg=self.background_color)
+        list_frame.grid(row=0, column=0, rowspan=2, padx=10, pady=10, sticky="ns")
+        scrollbar = tk.Scrollbar(list_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        pattern_list = tk.Listbox(list_frame, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 11), width=30, height=16,
+                                  relief=tk.SOLID, yscrollcommand=scrollbar.set, exportselection=False)
+        pattern_list.pack(side=tk.LEFT, fill=tk.Y)
+        scrollbar.config(command=pattern_list.yview)
+        pattern_list.insert(tk.END, *[entry["name"] for entry in entries])
+
+        thumbnail_size = 4 * PatternLibrary.THUMBNAIL_SIZE
+        thumbnail = tk.Canvas(browser, bg="white", highlightbackground=self.foreground_color, highlightthickness=1, width=thumbnail_size, height=thumbnail_size)
+        thumbnail.grid(row=0, column=1, padx=10, pady=10)
+        details = tk.Label(browser, justify="left", bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 10), width=22, anchor="nw")
+        details.grid(row=1, column=1, padx=10, sticky="n")
+
+        def selected_entry():
+            selection = pattern_list.curselection()
+            if selection:
+                return entries[selection[0]]
+            return None
+
+        def show_entry(event=None):
+            entry = selected_entry()
+            thumbnail.delete("all")
+            if entry is None:
+                details.config(text="")
+                return
+            scale = thumbnail_size // max(len(entry["thumbnail"]), len(entry["thumbnail"][0]), 1)
+            for row, line in enumerate(entry["thumbnail"]):
+                for column, cell in enumerate(line):
+                    if cell == "X":
+                        thumbnail.create_rectangle(scale*column+1, scale*row+1, scale*(column+1)+1, scale*(row+1)+1, fill="#323232", outline="")
+            details.config(text=f"{entry['rows']} x {entry['cols']}, cell size {entry['size']}\nPopulation {entry['population']}")
+
+        def open_entry(event=None):
+            entry = selected_entry()
+            if entry is not None:
+                try:
+                    world = library.load(f"{library.directory}/{entry['name']}")
+                except (OSError, ValueError):
+                    details.config(text="File Is Incompatible")
+                    return
+                self.open(rows=self.rows, columns=self.columns, world=world)
+
+        def open_other():
+            filepath = filedialog.askopenfilename(initialdir="./worlds")
+            if filepath != "":
+                self.open(rows=self.rows, columns=self.columns, filepath=filepath)
+
+        pattern_list.bind("<<ListboxSelect>>", show_entry)
+        pattern_list.bind("<Double-Button-1>", open_entry)
+        pattern_list.bind("<Return>", open_entry)
+
+        open_button = tk.Button(browser, text="Open", command=open_entry, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 11), width=12, relief=tk.SOLID)
+        open_button.grid(row=2, column=1, padx=10, pady=(0,10))
+        other_button = tk.Button(browser, text="Other File...", command=open_other, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 11), width=12, relief=tk.SOLID)
+        other_button.grid(row=2, column=0, padx=10, pady=(0,10))
+
+        if entries:
+            pattern_list.selection_set(0)
+            show_entry()
+        pattern_list.focus_set()
+
+    def resume(self) -> None:
+        """ Action for when resume button is pressed.
+            Invokes an instance of the Simulator class starting
+            from the latest checkpoint.
             
             Returns:
                 None
         """
-        filepath = filedialog.askopenfilename(initialdir="./worlds")
-        if filepath != "":
-            self.root.destroy()
-            Simulator(rows=self.rows, columns=self.columns, filepath=filepath)
\ No newline at end of file
+        filepath = Checkpointer.latest("checkpoints")
+        if filepath is not None:
+            self.open(rows=self.rows, columns=self.columns, filepath=filepath)
+
+    def open(self, **options) -> None:
+        """ Closes the configuration options and opens the simulation
+            in a new tab of the workspace.
+
+            Args:
+                options: the arguments of the Simulator, like world or filepath.
+            Returns:
+                None
+        """
+        self.history_text_entry()
+        options["history_bytes"] = int(self.history_text.get()) * 1024 * 1024
+        self.root.destroy()
+        if self.root is self.workspace.view:
+            self.workspace.view = None
+        self.workspace.add(**options)
\ No newline at end of file
@@ -6,6 +6,7 @@
     The Array class adheres to the docstring requirements per method, including raising appropriate exceptions where indicated.
 """
 
+import sys
 from typing import Any
 import numpy as np
 class Array:
@@ -66,6 +67,32 @@ class Array:
         
         raise TypeError(f'"{list_items}" is not a list.')
     
+    @staticmethod
+    def from_numpy(items: np.ndarray) -> 'Array':
+        """
+        Create an Array from a one-dimensional numpy array, wrapping it without a copy.
+        The Array shares its items with `items`, so `items` must not be changed afterwards.
+
+        Examples:
+            >>> array = Array.from_numpy(np.array([1, 2, 3]))
+            >>> print(array)
+            [1, 2, 3]
+
+        Args:
+            items (np.ndarray): the numpy array to create the Array from.
+
+        Returns:
+            array (Array): A new Array instance holding `items` itself.
+
+        Raises:
+            ValueError: if items is not 1-dimensional.
+        """
+        if len(items.shape) != 1:
+            raise ValueError('"items" is not a 1-dimensional array.')
+        array = Array()
+        array._array = np.asarray(items)
+        return array
+
     def __getitem__(self, index: int) -> Any:
         """ Bracket operator for getting an item from an Array.
 
@@ -312,6 +339,38 @@ class Array:
             
         return False
 
+    @property
+    def nbytes(self) -> int:
+        """ Property for getting the bytes of memory the Array holds.
+
+        Examples:
+            >>> array = Array(1000, False)
+            >>> print(array.nbytes - Array(0, False).nbytes)
+            1000
+            >>> import numpy as np
+            >>> print(Array.from_numpy(np.zeros((10, 100), dtype=bool).reshape(-1)).nbytes - Array(0, False).nbytes)
+            1000
+
+        Returns:
+            nbytes (int): the bytes of the Array object and its numpy array, items included.
+        """
+        # a numpy array wrapping another one's items (see from_numpy) does not count them in its size
+        items = 0 if self._array.base is None else self._array.nbytes
+        return sys.getsizeof(self) + sys.getsizeof(self._array) + items
+
+    def to_numpy(self) -> np.ndarray:
+        """ Get the numpy array holding the items. Changes to it change the Array.
+
+        Examples:
+            >>> array = Array.from_list([1, 2, 3])
+            >>> print(array.to_numpy().sum())
+            6
+
+        Returns:
+            numpy_array (np.ndarray): the internal numpy array.
+        """
+        return self._array
+
     def clear(self) -> None:
         """ Clear the Array
         
@@ -8,6 +8,7 @@
 
 
 
+import sys
 from typing import Any
 from datastructures.array import Array
 
@@ -82,6 +83,36 @@ class Array2D:
 
         return array     
 
+    @staticmethod
+    def from_numpy(items) -> 'Array2D':
+        """
+        Create a 2D Array from a two-dimensional numpy array, wrapping it without a copy
+        when it is contiguous. The Array2D may share its items with `items`, so `items`
+        must not be changed afterwards.
+
+        Examples:
+            >>> import numpy as np
+            >>> array = Array2D.from_numpy(np.array([[1, 2, 3], [4, 5, 6]]))
+            >>> print(array)
+            [[1, 2, 3], [4, 5, 6]]
+
+        Args:
+            items (np.ndarray): the 2D numpy array to create the Array2D from.
+
+        Returns:
+            array (Array2D): A new Array2D instance holding the items of `items`.
+
+        Raises:
+            ValueError: if items is not 2-dimensional.
+        """
+        if len(items.shape) != 2:
+            raise ValueError('"items" is not a 2-dimensional array.')
+
+        array = Array2D()
+        array._row_n, array._col_n = items.shape
+        array._array = Array.from_numpy(items.reshape(-1))
+        return array
+
     class _Item:
         """ Class _Item - internal class for Array2D storing methods 
             which require access to the second bracket operator.
@@ -198,6 +229,37 @@ class Array2D:
         """
         return self._row_n, self._col_n
     
+    @property
+    def nbytes(self) -> int:
+        """ Property for getting the bytes of memory the Array2D holds.
+
+        Examples:
+            >>> board = Array2D(100, 100, False)
+            >>> print(board.nbytes - Array2D(0, 0, False).nbytes)
+            10000
+
+        Returns:
+            nbytes (int): the bytes of the Array2D object and its Array, items included.
+        """
+        return sys.getsizeof(self) + self._array.nbytes
+
+    def to_numpy(self) -> Any:
+        """ Get a two-dimensional numpy view of the items. Changes to
+            the view change the Array2D.
+
+        Examples:
+            >>> array2d = Array2D(rows=2, columns=3, default_item_value=0)
+            >>> array2d[1][2] = 5
+            >>> print(array2d.to_numpy()[1, 2])
+            5
+            >>> print(array2d.to_numpy().shape)
+            (2, 3)
+
+        Returns:
+            np.ndarray: the items with shape (rows, columns).
+        """
+        return self._array.to_numpy().reshape(self._row_n, self._col_n)
+
     def clear(self) -> None:
         """ Clear the Array2D
         
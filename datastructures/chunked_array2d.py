@@ -0,0 +1,261 @@
+# datastructures.chunked_array2d.ChunkedArray2D
+
+""" This module defines a ChunkedArray2D class that represents a two-dimensional boolean
+    array too large to hold in memory. The array is split into square chunks stored in a
+    memory-mapped file, and only recently used chunks are held in memory.
+"""
+
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+import numpy as np
+
+
+class ChunkedArray2D:
+    """ Class ChunkedArray2D - a 2D boolean array stored on disk in chunks
+            1. Chunks are stored one after another in a memory-mapped file, so reading or
+               writing a chunk touches one contiguous part of the file.
+            2. Recently used chunks are kept in an LRU cache of a fixed number of bytes and
+               written back to the file when they are dropped, so memory use does not grow
+               with the size of the array.
+            3. The number of live cells of every chunk is kept, so chunks with none are
+               never read, written or cached.
+    """
+
+    def __init__(self, rows: int, columns: int, chunk_size: int = 256, memory: int = 64 * 1024 * 1024, directory: str | None = None) -> None:
+        """ ChunkedArray2D Constructor. Every cell starts out False.
+
+        Examples:
+            >>> array = ChunkedArray2D(100000, 100000, chunk_size=512, memory=256 * 1024 * 1024)
+
+        Args:
+            rows (int): the number of rows.
+            columns (int): the number of columns.
+            chunk_size (int): the number of rows and columns of each chunk.
+            memory (int): the most bytes of chunks cached in memory, at least 9 chunks.
+            directory (str | None): the directory of the file the chunks are stored in,
+                a new temporary directory if None.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: if the rows, columns or chunk size are less than 1.
+        """
+        if rows < 1 or columns < 1:
+            raise ValueError("rows and columns must be at least 1.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.rows = rows
+        self.columns = columns
+        self.chunk_size = chunk_size
+        self.chunk_rows = -(-rows // chunk_size)
+        self.chunk_columns = -(-columns // chunk_size)
+        # a chunk and its 8 neighbors always fit, so stepping a chunk never evicts what it reads
+        self.capacity = max(memory // (chunk_size * chunk_size), 9)
+
+        self.temporary = directory is None
+        self.directory = tempfile.mkdtemp(prefix="chunks-") if directory is None else directory
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, self.filepath = tempfile.mkstemp(dir=self.directory, prefix="chunks-", suffix=".bin")
+        os.close(descriptor)
+        self.store = np.memmap(self.filepath, dtype=bool, mode="w+", shape=(self.chunk_rows, self.chunk_columns, chunk_size, chunk_size))
+
+        self.populations = np.zeros((self.chunk_rows, self.chunk_columns), dtype=np.uint32)
+        self.cache = OrderedDict()
+        self.empty = np.zeros((chunk_size, chunk_size), dtype=bool)
+        self.empty.flags.writeable = False
+
+    def chunk(self, chunk_row: int, chunk_column: int) -> np.ndarray:
+        """ Get the cells of a chunk, reading it into the cache if it is not there.
+
+        Examples:
+            >>> array = ChunkedArray2D(1000, 1000)
+            >>> print(array.chunk(0, 0).shape)
+            (256, 256)
+
+        Args:
+            chunk_row (int): the row of the chunk.
+            chunk_column (int): the column of the chunk.
+
+        Returns:
+            np.ndarray: the chunk_size x chunk_size cells of the chunk, which must not be changed.
+                Use set_chunk to change a chunk.
+        """
+        if self.populations[chunk_row, chunk_column] == 0:
+            return self.empty
+        key = (chunk_row, chunk_column)
+        entry = self.cache.get(key)
+        if entry is None:
+            entry = [np.array(self.store[chunk_row, chunk_column]), False]
+            self.cache[key] = entry
+            self.evict()
+        else:
+            self.cache.move_to_end(key)
+        return entry[0]
+
+    def set_chunk(self, chunk_row: int, chunk_column: int, cells: np.ndarray) -> None:
+        """ Replace the cells of a chunk. The chunk is written to the file once it is
+            dropped from the cache, unless it has no live cells.
+
+        Examples:
+            >>> array = ChunkedArray2D(1000, 1000)
+            >>> array.set_chunk(1, 2, np.ones((256, 256), dtype=bool))
+            >>> print(array.population)
+            65536
+
+        Args:
+            chunk_row (int): the row of the chunk.
+            chunk_column (int): the column of the chunk.
+            cells (np.ndarray): chunk_size x chunk_size booleans, kept by the array. Cells
+                beyond the last row or column of the array must be False.
+
+        Returns:
+            None
+        """
+        key = (chunk_row, chunk_column)
+        population = int(np.count_nonzero(cells))
+        self.populations[chunk_row, chunk_column] = population
+        if population == 0:
+            self.cache.pop(key, None)
+            return
+        self.cache[key] = [cells, True]
+        self.cache.move_to_end(key)
+        self.evict()
+
+    def evict(self) -> None:
+        """ Drop the least recently used chunks until the cache fits its capacity,
+            writing changed ones to the file.
+
+        Returns:
+            None
+        """
+        while len(self.cache) > self.capacity:
+            (chunk_row, chunk_column), (cells, dirty) = self.cache.popitem(last=False)
+            if dirty is True:
+                self.store[chunk_row, chunk_column] = cells
+
+    def gather(self, row_indices: np.ndarray, column_indices: np.ndarray) -> np.ndarray:
+        """ Get the cells at every pair of a list of rows and a list of columns, where
+            an index of -1 stands for a dead cell beyond the edge.
+
+        Examples:
+            >>> array = ChunkedArray2D(1000, 1000)
+            >>> print(array.gather(np.arange(-1, 3), np.arange(254, 258)).shape)
+            (4, 4)
+
+        Args:
+            row_indices (np.ndarray): the rows, in any order, -1 for none.
+            column_indices (np.ndarray): the columns, in any order, -1 for none.
+
+        Returns:
+            np.ndarray: a new len(row_indices) x len(column_indices) boolean array.
+        """
+        size = self.chunk_size
+        cells = np.zeros((len(row_indices), len(column_indices)), dtype=bool)
+        row_chunks = np.where(row_indices >= 0, row_indices // size, -1)
+        column_chunks = np.where(column_indices >= 0, column_indices // size, -1)
+        for chunk_row in np.unique(row_chunks[row_chunks >= 0]):
+            selected_rows = np.flatnonzero(row_chunks == chunk_row)
+            for chunk_column in np.unique(column_chunks[column_chunks >= 0]):
+                if self.populations[chunk_row, chunk_column] == 0:
+                    continue
+                selected_columns = np.flatnonzero(column_chunks == chunk_column)
+                chunk = self.chunk(chunk_row, chunk_column)
+                cells[np.ix_(selected_rows, selected_columns)] = chunk[np.ix_(row_indices[selected_rows] % size, column_indices[selected_columns] % size)]
+        return cells
+
+    def band(self, chunk_row: int) -> np.ndarray:
+        """ Get every row of a row of chunks, for reading the array in order.
+
+        Examples:
+            >>> array = ChunkedArray2D(1000, 1000)
+            >>> print(array.band(3).shape)
+            (232, 1000)
+
+        Args:
+            chunk_row (int): the row of chunks.
+
+        Returns:
+            np.ndarray: a new boolean array of the rows, without cells beyond the last column.
+        """
+        size = self.chunk_size
+        height = min(size, self.rows - chunk_row * size)
+        cells = np.zeros((height, self.chunk_columns * size), dtype=bool)
+        for chunk_column in range(self.chunk_columns):
+            if self.populations[chunk_row, chunk_column] > 0:
+                cells[:, chunk_column * size:(chunk_column + 1) * size] = self.chunk(chunk_row, chunk_column)[:height]
+        return cells[:, :self.columns]
+
+    def set_band(self, chunk_row: int, cells: np.ndarray) -> None:
+        """ Replace every row of a row of chunks, for writing the array in order.
+
+        Examples:
+            >>> array = ChunkedArray2D(1000, 1000)
+            >>> array.set_band(0, np.ones((256, 1000), dtype=bool))
+
+        Args:
+            chunk_row (int): the row of chunks.
+            cells (np.ndarray): a boolean array of the rows of the band, one per row of the
+                array in the band, with one column per column of the array.
+
+        Returns:
+            None
+        """
+        size = self.chunk_size
+        for chunk_column in range(self.chunk_columns):
+            piece = cells[:, chunk_column * size:(chunk_column + 1) * size]
+            chunk = np.zeros((size, size), dtype=bool)
+            chunk[:piece.shape[0], :piece.shape[1]] = piece
+            self.set_chunk(chunk_row, chunk_column, chunk)
+
+    @property
+    def population(self) -> int:
+        """ Property for getting the number of True cells.
+
+        Returns:
+            int: the number of True cells, from the counts kept per chunk.
+        """
+        return int(self.populations.sum())
+
+    @property
+    def nbytes(self) -> int:
+        """ Property for getting the bytes of chunks held in memory.
+
+        Returns:
+            int: the bytes of the cached chunks and the per-chunk counts.
+        """
+        return len(self.cache) * self.chunk_size * self.chunk_size + self.populations.nbytes
+
+    def to_numpy(self) -> np.ndarray:
+        """ Copy the whole array into memory, for arrays small enough to hold.
+
+        Returns:
+            np.ndarray: a new rows x columns boolean array.
+        """
+        return np.concatenate([self.band(chunk_row) for chunk_row in range(self.chunk_rows)])
+
+    def flush(self) -> None:
+        """ Write every changed chunk in the cache to the file.
+
+        Returns:
+            None
+        """
+        for (chunk_row, chunk_column), entry in self.cache.items():
+            if entry[1] is True:
+                self.store[chunk_row, chunk_column] = entry[0]
+                entry[1] = False
+        self.store.flush()
+
+    def close(self) -> None:
+        """ Release the file, removing it (and its directory if it was temporary).
+
+        Returns:
+            None
+        """
+        self.cache.clear()
+        del self.store
+        os.remove(self.filepath)
+        if self.temporary is True:
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,257 @@
+# engines.jit.JitEngine
+
+""" This module defines a JitEngine class that steps a board under any Life-like rule
+    with a single loop over the cells, counting each cell's neighbors and applying the
+    rule in one pass. The loop is compiled with Numba when it is installed; without it
+    the engine is not available and the numpy engines are used instead.
+"""
+
+import numpy as np
+from engines.lookup import LookupEngine
+from engines.rule import Rule
+
+try:
+    import numba
+except ImportError: # optional, World falls back to the numpy engines without it
+    numba = None
+
+
+def step_cells(cells: np.ndarray, table: np.ndarray, ages: np.ndarray) -> tuple[int, int, int, int, int, int]:
+    """ Replace a padded board with its next generation, in place. Copies of the rows
+        above and at the current row keep their cells from before the step, so only two
+        rows are copied at a time. Ages, births, deaths and the bounding box of the next
+        generation are updated in the same loop, as each cell's next state is found.
+
+    Args:
+        cells (np.ndarray): a 2D uint8 array of live cells with a one cell border, which
+            is read but not changed.
+        table (np.ndarray): the next state of a cell, at 9 * its state + its live neighbors.
+        ages (np.ndarray): the 2D uint8 ages of the cells without the border (see
+            LookupEngine.age_cells), or an empty 0 x 0 array when ages are not kept.
+
+    Returns:
+        tuple[int, int, int, int, int, int]: the cells born, the cells that died and the top
+            row, left column, bottom row and right column of the live cells without the
+            border, the box being (-1, -1, -1, -1) if no cells are alive.
+    """
+    rows = cells.shape[0] - 2
+    columns = cells.shape[1] - 2
+    aged = ages.shape[0] > 0
+    births = deaths = 0
+    top = left = bottom = right = -1
+    above = cells[0].copy()
+    current = np.empty(columns + 2, dtype=np.uint8)
+    for row in range(1, rows + 1):
+        current[:] = cells[row]
+        below = cells[row + 1]
+        for column in range(1, columns + 1):
+            count = (above[column - 1] + above[column] + above[column + 1] + current[column - 1] + current[column + 1]
+                     + below[column - 1] + below[column] + below[column + 1])
+            state = table[9 * current[column] + count]
+            cells[row, column] = state
+            if state != current[column]:
+                if state:
+                    births += 1
+                else:
+                    deaths += 1
+            if state:
+                if top < 0:
+                    top = row - 1
+                    left = right = column - 1
+                bottom = row - 1
+                left = min(left, column - 1)
+                right = max(right, column - 1)
+            if aged:
+                age = ages[row - 1, column - 1]
+                ages[row - 1, column - 1] = 0 if state == 0 else (age + 1 if age < 255 else 255)
+        above, current = current, above
+    return births, deaths, top, left, bottom, right
+
+
+if numba is not None:
+    # released from the GIL, so the threads of a StepPool step worlds at the same time
+    step_cells = numba.njit(cache=True, nogil=True)(step_cells)
+
+
+class JitEngine:
+    """ Class JitEngine - steps boards with a compiled loop over the cells.
+            1. Counting neighbors and applying the rule happen in the same loop, so no
+               temporary arrays are made for the neighborhoods, only the board returned.
+            2. Boards are stepped in a padded buffer kept between generations, with
+               the border filled in for the boundary as in LookupEngine.
+            3. Births, deaths and the bounding box are counted in the same loop too.
+            4. Only available when Numba is installed (see JitEngine.AVAILABLE).
+    """
+
+    BOUNDARIES = LookupEngine.BOUNDARIES
+    AVAILABLE = numba is not None
+    # passed to step_cells when ages are not kept, so it is compiled for one type of call
+    NO_AGES = np.zeros((0, 0), dtype=np.uint8)
+
+    def __init__(self, rule: Rule, boundary: str = "dead") -> None:
+        """ JitEngine Constructor.
+
+        Examples:
+            >>> engine = JitEngine(Rule("B3/S23"), "torus")
+
+        Args:
+            rule (Rule): the rule to step boards with.
+            boundary (str): one of JitEngine.BOUNDARIES.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: if the boundary is not one of JitEngine.BOUNDARIES.
+            ImportError: if Numba is not installed.
+        """
+        if boundary not in self.BOUNDARIES:
+            raise ValueError(f'"{boundary}" is not one of {", ".join(self.BOUNDARIES)}.')
+        if self.AVAILABLE is False:
+            raise ImportError("the jit engine needs Numba, which is not installed.")
+        self.rule = rule
+        self.boundary = boundary
+        self.table = JitEngine.cell_table(rule)
+        self.buffer = None
+
+    @staticmethod
+    def cell_table(rule: Rule) -> np.ndarray:
+        """ Build the next state of a cell from its state and its number of live neighbors.
+
+        Examples:
+            >>> print(JitEngine.cell_table(Rule("B3/S23"))[[3, 9 + 2, 9 + 4]])
+            [1 1 0]
+
+        Args:
+            rule (Rule): the rule.
+
+        Returns:
+            np.ndarray: 18 uint8 states, at 9 * the cell's state + its live neighbors.
+        """
+        table = np.zeros(18, dtype=np.uint8)
+        for count in range(9):
+            table[count] = count in rule.birth
+            table[9 + count] = count in rule.survival
+        return table
+
+    @property
+    def nbytes(self) -> int:
+        """ Property for getting the bytes of tables, buffers and caches the engine holds.
+
+        Examples:
+            >>> engine = JitEngine(Rule("B3/S23"))
+            >>> engine.step(np.zeros((98, 98), dtype=bool)).shape
+            (98, 98)
+            >>> print(engine.nbytes)
+            10018
+
+        Returns:
+            int: the bytes of the cell table and the padded buffer.
+        """
+        return self.table.nbytes + (0 if self.buffer is None else self.buffer.nbytes)
+
+    def step(self, board: np.ndarray, ages: np.ndarray | None = None) -> np.ndarray:
+        """ Compute the next generation of a board.
+
+        Examples:
+            >>> engine = JitEngine(Rule("B3/S23"))
+            >>> blinker = np.zeros((5, 5), dtype=bool)
+            >>> blinker[2, 1:4] = True
+            >>> print(engine.step(blinker)[1:4, 2])
+            [ True  True  True]
+
+        Args:
+            board (np.ndarray): a 2D boolean array of live cells.
+            ages (np.ndarray | None): the 2D uint8 ages of the cells (see LookupEngine.age_cells),
+                updated in place to those of the next generation if given.
+
+        Returns:
+            np.ndarray: a new 2D boolean array of the next generation.
+        """
+        return self.step_counted(board, ages)[0]
+
+    def step_counted(self, board: np.ndarray, ages: np.ndarray | None = None) -> tuple[np.ndarray, int, int, tuple[int, int, int, int] | None]:
+        """ Compute the next generation of a board, counting the cells born and the cells
+            that died in the same loop.
+
+        Examples:
+            >>> engine = JitEngine(Rule("B3/S23"))
+            >>> blinker = np.zeros((5, 5), dtype=bool)
+            >>> blinker[2, 1:4] = True
+            >>> print(engine.step_counted(blinker)[1:])
+            (2, 2, (1, 2, 3, 2))
+
+        Args:
+            board (np.ndarray): a 2D boolean array of live cells.
+            ages (np.ndarray | None): the 2D uint8 ages of the cells (see LookupEngine.age_cells),
+                updated in place to those of the next generation if given.
+
+        Returns:
+            tuple[np.ndarray, int, int, tuple[int, int, int, int] | None]: a new 2D boolean
+                array of the next generation, the cells born, the cells that died and the
+                bounding box of the next generation (see LookupEngine.bounding_box).
+        """
+        rows, columns = board.shape
+        if self.buffer is None or self.buffer.shape != (rows + 2, columns + 2):
+            self.buffer = np.zeros((rows + 2, columns + 2), dtype=np.uint8)
+        cells = self.buffer
+        cells[1:-1, 1:-1] = board
+        if self.boundary == "torus":
+            cells[0, 1:-1] = board[-1]
+            cells[-1, 1:-1] = board[0]
+            cells[:, 0] = cells[:, -2]
+            cells[:, -1] = cells[:, 1]
+        elif self.boundary == "mirror":
+            cells[0, 1:-1] = board[0]
+            cells[-1, 1:-1] = board[-1]
+            cells[:, 0] = cells[:, 1]
+            cells[:, -1] = cells[:, -2]
+        births, deaths, *bbox = step_cells(cells, self.table, JitEngine.NO_AGES if ages is None else ages)
+        # the board returned is kept by the world, so it is the one copy made
+        return cells[1:-1, 1:-1].astype(bool), births, deaths, None if bbox[0] < 0 else tuple(bbox)
+
+    def step_padded(self, padded: np.ndarray, ages: np.ndarray | None = None) -> np.ndarray:
+        """ Compute the next generation of a board that already has the cells beyond its
+            edges around it, like a piece of a larger board with its neighbors' cells.
+
+        Examples:
+            >>> engine = JitEngine(Rule("B3/S23"))
+            >>> piece = np.zeros((5, 5), dtype=np.uint16)
+            >>> piece[2, 1:4] = 1
+            >>> print(engine.step_padded(piece)[:, 1])
+            [ True  True  True]
+
+        Args:
+            padded (np.ndarray): a 2D uint16 array of live cells with a one cell border.
+            ages (np.ndarray | None): the 2D uint8 ages of the cells without the border, updated
+                in place to those of the next generation if given.
+
+        Returns:
+            np.ndarray: a new 2D boolean array of the next generation, without the border.
+        """
+        return self.step_padded_counted(padded, ages)[0]
+
+    def step_padded_counted(self, padded: np.ndarray, ages: np.ndarray | None = None) -> tuple[np.ndarray, int, int, tuple[int, int, int, int] | None]:
+        """ Compute the next generation of a padded board (see step_padded), counting the
+            cells born and the cells that died in the same loop.
+
+        Examples:
+            >>> engine = JitEngine(Rule("B3/S23"))
+            >>> piece = np.zeros((5, 5), dtype=np.uint16)
+            >>> piece[2, 1:4] = 1
+            >>> print(engine.step_padded_counted(piece)[1:])
+            (2, 2, (0, 1, 2, 1))
+
+        Args:
+            padded (np.ndarray): a 2D uint16 array of live cells with a one cell border.
+            ages (np.ndarray | None): the 2D uint8 ages of the cells without the border, updated
+                in place to those of the next generation if given.
+
+        Returns:
+            tuple[np.ndarray, int, int, tuple[int, int, int, int] | None]: a new 2D boolean
+                array of the next generation without the border, the cells born, the cells
+                that died and the bounding box of the next generation.
+        """
+        cells = padded.astype(np.uint8)
+        births, deaths, *bbox = step_cells(cells, self.table, JitEngine.NO_AGES if ages is None else ages)
+        return cells[1:-1, 1:-1].astype(bool), births, deaths, None if bbox[0] < 0 else tuple(bbox)
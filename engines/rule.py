@@ -0,0 +1,112 @@
+# engines.rule.Rule
+
+""" This module defines a Rule class that represents a Life-like cellular automaton rule
+    in B/S notation, such as B3/S23 for Conway's Game of Life or B36/S23 for HighLife.
+"""
+
+import re
+import numpy as np
+
+
+class Rule:
+    """ Class Rule - the neighbor counts at which dead cells are born and live cells survive.
+    """
+
+    def __init__(self, notation: str = "B3/S23") -> None:
+        """ Rule Constructor. Parses a rule written in B/S notation.
+
+        Examples:
+            >>> rule = Rule("B36/S23")
+            >>> print(rule.birth, rule.survival)
+            frozenset({3, 6}) frozenset({2, 3})
+            >>> print(Rule("s23/b3"))
+            B3/S23
+
+        Args:
+            notation (str): the rule, as "B" followed by the birth counts and "S" followed by
+                the survival counts, separated by "/", in either order.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: if the notation is not a valid B/S rule.
+        """
+        parts = {}
+        for part in notation.strip().upper().split("/"):
+            match = re.fullmatch(r"([BS])([0-8]*)", part.strip())
+            if match is None or match.group(1) in parts:
+                raise ValueError(f'"{notation}" is not a rule in B/S notation, like B3/S23.')
+            parts[match.group(1)] = frozenset(int(count) for count in match.group(2))
+        if set(parts) != {"B", "S"}:
+            raise ValueError(f'"{notation}" is not a rule in B/S notation, like B3/S23.')
+
+        self.birth = parts["B"]
+        self.survival = parts["S"]
+        self._table = None
+
+    @property
+    def table(self) -> np.ndarray:
+        """ Property for getting the lookup table of the rule. Index the table with the
+            3x3 neighborhood of a cell packed into 9 bits (bit 4 is the cell itself) to
+            get whether the cell is alive in the next generation.
+
+        Examples:
+            >>> table = Rule("B3/S23").table
+            >>> print(len(table), table[0b000000111], table[0b000010000])
+            512 True False
+
+        Returns:
+            np.ndarray: 512 booleans, built the first time the table is used.
+        """
+        if self._table is None:
+            table = np.zeros(512, dtype=bool)
+            for neighborhood in range(512):
+                count = bin(neighborhood & ~0b000010000).count("1")
+                if neighborhood & 0b000010000:
+                    table[neighborhood] = count in self.survival
+                else:
+                    table[neighborhood] = count in self.birth
+            self._table = table
+        return self._table
+
+    def __eq__(self, other: object) -> bool:
+        """ Equality operator ==.
+
+        Examples:
+            >>> print(Rule("B3/S23") == Rule("S23/B3"))
+            True
+
+        Args:
+            other (object): the other object to compare to.
+
+        Returns:
+            bool: True if both rules have the same birth and survival counts.
+        """
+        if not isinstance(other, Rule):
+            return False
+        return self.birth == other.birth and self.survival == other.survival
+
+    def __str__(self) -> str:
+        """ Return the rule in B/S notation.
+
+        Examples:
+            >>> print(Rule("b63/s32"))
+            B36/S23
+
+        Returns:
+            str: the rule in B/S notation.
+        """
+        return "B" + "".join(str(count) for count in sorted(self.birth)) + "/S" + "".join(str(count) for count in sorted(self.survival))
+
+    def __repr__(self) -> str:
+        """ Return a string representation of the rule.
+
+        Examples:
+            >>> print(repr(Rule()))
+            Rule('B3/S23')
+
+        Returns:
+            str: a string representation of the rule.
+        """
+        return f"Rule('{self}')"
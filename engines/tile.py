@@ -0,0 +1,305 @@
+# engines.tile.TileEngine
+
+""" This module defines a TileEngine class that steps a board under any Life-like rule
+    2x2 cells at a time, looking up each 2x2 block's next state from the 4x4 block
+    around it in a 65,536-entry table, for the whole board at once.
+"""
+
+from collections import OrderedDict
+import numpy as np
+from engines.lookup import LookupEngine
+from engines.rule import Rule
+
+
+class TileEngine:
+    """ Class TileEngine - steps boards with a 4x4-to-2x2 block lookup table.
+            1. Packs 16 cells per lookup instead of 9 and computes 4 cells per lookup
+               instead of 1, so it does about half the work of LookupEngine per generation.
+            2. Boundaries are handled by padding the whole board, as in LookupEngine.
+            3. Optionally remembers the results of recently seen larger tiles in an LRU
+               memo, so boards with many repeated tiles skip computing them again.
+            4. The table also holds each block's cells before the step, so births and
+               deaths are counted from the blocks looked up.
+    """
+
+    BOUNDARIES = LookupEngine.BOUNDARIES
+    _tables = {}
+    # the cells born and the cells that died in a block, indexed by its table value
+    BIRTHS = np.array([bin(value & 15 & ~(value >> 4)).count("1") for value in range(256)])
+    DEATHS = np.array([bin((value >> 4) & ~value & 15).count("1") for value in range(256)])
+
+    def __init__(self, rule: Rule, boundary: str = "dead", memo_size: int = 0, tile_size: int = 64) -> None:
+        """ TileEngine Constructor.
+
+        Examples:
+            >>> engine = TileEngine(Rule("B3/S23"), "torus", memo_size=4096)
+
+        Args:
+            rule (Rule): the rule to step boards with.
+            boundary (str): one of TileEngine.BOUNDARIES.
+            memo_size (int): the number of tile results remembered, 0 for no memo.
+            tile_size (int): the side of the memo's tiles in cells, an even number.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: if the boundary is not one of TileEngine.BOUNDARIES or the tile size is odd.
+        """
+        if boundary not in self.BOUNDARIES:
+            raise ValueError(f'"{boundary}" is not one of {", ".join(self.BOUNDARIES)}.')
+        if tile_size < 2 or tile_size % 2 != 0:
+            raise ValueError("tile_size must be an even number of at least 2.")
+        self.rule = rule
+        self.boundary = boundary
+        self.memo_size = memo_size
+        self.tile_size = tile_size
+        self.memo = OrderedDict()
+        self.table = TileEngine.block_table(rule)
+
+    @staticmethod
+    def block_table(rule: Rule) -> np.ndarray:
+        """ Build (or reuse) the 4x4-to-2x2 table of a rule. Index it with a 4x4 block packed
+            into 16 bits, row by row with the top left cell in bit 15, to get the next state
+            of the center 2x2 block packed the same way into the low 4 bits, and its state
+            before the step in the high 4 bits.
+
+        Examples:
+            >>> table = TileEngine.block_table(Rule("B3/S23"))
+            >>> print(len(table), table[0b0000011001100000], table[0b0000011000000000] & 15)
+            65536 255 0
+
+        Args:
+            rule (Rule): the rule to build the table for.
+
+        Returns:
+            np.ndarray: 65,536 uint8 values, shared by engines with the same rule.
+        """
+        key = str(rule)
+        if key not in TileEngine._tables:
+            blocks = np.arange(65536, dtype=np.uint32)
+            cells = [[(blocks >> (15 - 4 * row - column)) & 1 for column in range(4)] for row in range(4)]
+            table = np.zeros(65536, dtype=np.uint8)
+            bit = 3
+            for row in (1, 2):
+                for column in (1, 2):
+                    neighborhood = np.zeros(65536, dtype=np.uint32)
+                    for neighbor_row in range(3):
+                        for neighbor_column in range(3):
+                            neighborhood = (neighborhood << 1) | cells[row - 1 + neighbor_row][column - 1 + neighbor_column]
+                    table |= rule.table[neighborhood].astype(np.uint8) << bit
+                    table |= cells[row][column].astype(np.uint8) << (bit + 4)
+                    bit -= 1
+            TileEngine._tables[key] = table
+        return TileEngine._tables[key]
+
+    @property
+    def nbytes(self) -> int:
+        """ Property for getting the bytes of tables, buffers and caches the engine holds.
+
+        Examples:
+            >>> print(TileEngine(Rule("B3/S23")).nbytes)
+            65536
+
+        Returns:
+            int: the bytes of the block table (shared with engines of the same rule) and of
+                the tiles and results in the memo.
+        """
+        # the memo is copied in one go first, since it may be counted while another thread steps
+        return self.table.nbytes + sum(len(key[-1]) + result[0].nbytes for key, result in list(self.memo.items()))
+
+    def step(self, board: np.ndarray, ages: np.ndarray | None = None) -> np.ndarray:
+        """ Compute the next generation of a board.
+
+        Examples:
+            >>> engine = TileEngine(Rule("B3/S23"))
+            >>> blinker = np.zeros((5, 5), dtype=bool)
+            >>> blinker[2, 1:4] = True
+            >>> print(engine.step(blinker)[1:4, 2])
+            [ True  True  True]
+
+        Args:
+            board (np.ndarray): a 2D boolean array of live cells.
+            ages (np.ndarray | None): the 2D uint8 ages of the cells (see LookupEngine.age_cells), updated
+                in place to those of the next generation if given.
+
+        Returns:
+            np.ndarray: a new 2D boolean array of the next generation.
+        """
+        return self.step_padded(np.pad(board.astype(np.uint16), 1, mode=self.BOUNDARIES[self.boundary]), ages)
+
+    def step_counted(self, board: np.ndarray, ages: np.ndarray | None = None) -> tuple[np.ndarray, int, int, tuple[int, int, int, int] | None]:
+        """ Compute the next generation of a board, counting the cells born and the cells
+            that died from the same lookup.
+
+        Examples:
+            >>> engine = TileEngine(Rule("B3/S23"))
+            >>> blinker = np.zeros((5, 5), dtype=bool)
+            >>> blinker[2, 1:4] = True
+            >>> print(engine.step_counted(blinker)[1:])
+            (2, 2, (1, 2, 3, 2))
+
+        Args:
+            board (np.ndarray): a 2D boolean array of live cells.
+            ages (np.ndarray | None): the 2D uint8 ages of the cells (see LookupEngine.age_cells), updated
+                in place to those of the next generation if given.
+
+        Returns:
+            tuple[np.ndarray, int, int, tuple[int, int, int, int] | None]: a new 2D boolean
+                array of the next generation, the cells born, the cells that died and the
+                bounding box of the next generation (see LookupEngine.bounding_box).
+        """
+        return self.step_padded_counted(np.pad(board.astype(np.uint16), 1, mode=self.BOUNDARIES[self.boundary]), ages)
+
+    def step_padded(self, padded: np.ndarray, ages: np.ndarray | None = None) -> np.ndarray:
+        """ Compute the next generation of a board that already has the cells beyond its
+            edges around it, like a piece of a larger board with its neighbors' cells.
+
+        Examples:
+            >>> engine = TileEngine(Rule("B3/S23"))
+            >>> piece = np.zeros((5, 5), dtype=np.uint16)
+            >>> piece[2, 1:4] = 1
+            >>> print(engine.step_padded(piece)[:, 1])
+            [ True  True  True]
+
+        Args:
+            padded (np.ndarray): a 2D uint16 array of live cells with a one cell border.
+            ages (np.ndarray | None): the 2D uint8 ages of the cells without the border, updated
+                in place to those of the next generation if given.
+
+        Returns:
+            np.ndarray: a new 2D boolean array of the next generation, without the border.
+        """
+        new_board = self.step_changes(padded)[0]
+        if ages is not None:
+            LookupEngine.age_cells(ages, new_board)
+        return new_board
+
+    def step_padded_counted(self, padded: np.ndarray, ages: np.ndarray | None = None) -> tuple[np.ndarray, int, int, tuple[int, int, int, int] | None]:
+        """ Compute the next generation of a padded board (see step_padded), counting the
+            cells born and the cells that died from the same lookup.
+
+        Examples:
+            >>> engine = TileEngine(Rule("B3/S23"))
+            >>> piece = np.zeros((5, 5), dtype=np.uint16)
+            >>> piece[2, 1:4] = 1
+            >>> print(engine.step_padded_counted(piece)[1:])
+            (2, 2, (0, 1, 2, 1))
+
+        Args:
+            padded (np.ndarray): a 2D uint16 array of live cells with a one cell border.
+            ages (np.ndarray | None): the 2D uint8 ages of the cells without the border, updated
+                in place to those of the next generation if given.
+
+        Returns:
+            tuple[np.ndarray, int, int, tuple[int, int, int, int] | None]: a new 2D boolean
+                array of the next generation without the border, the cells born, the cells
+                that died and the bounding box of the next generation.
+        """
+        new_board, births, deaths = self.step_changes(padded)
+        if ages is not None:
+            LookupEngine.age_cells(ages, new_board)
+        return new_board, births, deaths, LookupEngine.bounding_box(new_board)
+
+    def step_changes(self, padded: np.ndarray) -> tuple[np.ndarray, int, int]:
+        """ Compute the next generation of a padded board with the memo or without it.
+
+        Args:
+            padded (np.ndarray): a 2D uint16 array of live cells with a one cell border.
+
+        Returns:
+            tuple[np.ndarray, int, int]: a 2D boolean array of the next generation without
+                the border, the cells born and the cells that died.
+        """
+        rows = padded.shape[0] - 2
+        columns = padded.shape[1] - 2
+        # an odd board gets an extra row or column of blocks, cropped off at the end
+        padded = np.pad(padded, ((0, rows % 2), (0, columns % 2)))
+
+        if self.memo_size > 0:
+            return self.step_tiles(padded, rows, columns)
+        return self.step_blocks(padded, rows, columns)
+
+    def step_blocks(self, padded: np.ndarray, rows: int, columns: int) -> tuple[np.ndarray, int, int]:
+        """ Compute the next generation of every 2x2 block of a padded board.
+
+        Args:
+            padded (np.ndarray): a 2D uint16 array of the board with a one cell border
+                around it, with an even number of rows and columns inside the border.
+            rows (int): the rows of the board, one less than inside the border if it was odd.
+            columns (int): the columns of the board, one less than inside the border if it was odd.
+
+        Returns:
+            tuple[np.ndarray, int, int]: a 2D boolean array of the next generation without
+                the border or the extra row and column, the cells born and the cells that died.
+        """
+        block_rows = (padded.shape[0] - 2) // 2
+        block_columns = (padded.shape[1] - 2) // 2
+
+        # split the board into its four (even/odd row, even/odd column) planes once, so
+        # the 16 cells of every block are read from contiguous slices of the planes
+        planes = [[np.ascontiguousarray(padded[row::2, column::2]) for column in range(2)] for row in range(2)]
+
+        blocks = np.zeros((block_rows, block_columns), dtype=np.uint16)
+        bit = 15
+        for row in range(4):
+            for column in range(4):
+                plane = planes[row % 2][column % 2]
+                blocks |= plane[row // 2:row // 2 + block_rows, column // 2:column // 2 + block_columns] << bit
+                bit -= 1
+        results = self.table[blocks]
+        # the cells of an extra row or column are dropped before counting, so they are not counted
+        if rows % 2 == 1:
+            results[-1] &= 0b11001100
+        if columns % 2 == 1:
+            results[:, -1] &= 0b10101010
+        counts = np.bincount(results.ravel(), minlength=256)
+
+        new_board = np.empty((2 * block_rows, 2 * block_columns), dtype=bool)
+        new_board[0::2, 0::2] = results & 8
+        new_board[0::2, 1::2] = results & 4
+        new_board[1::2, 0::2] = results & 2
+        new_board[1::2, 1::2] = results & 1
+        return new_board[:rows, :columns], int(counts @ TileEngine.BIRTHS), int(counts @ TileEngine.DEATHS)
+
+    def step_tiles(self, padded: np.ndarray, rows: int, columns: int) -> tuple[np.ndarray, int, int]:
+        """ Compute the next generation of a padded board tile by tile, reusing remembered
+            results for tiles seen recently and skipping tiles with no live cells nearby.
+
+        Args:
+            padded (np.ndarray): a 2D uint16 array of the board with a one cell border
+                around it, with an even number of rows and columns inside the border.
+            rows (int): the rows of the board, one less than inside the border if it was odd.
+            columns (int): the columns of the board, one less than inside the border if it was odd.
+
+        Returns:
+            tuple[np.ndarray, int, int]: a 2D boolean array of the next generation without
+                the border or the extra row and column, the cells born and the cells that died.
+        """
+        size = self.tile_size
+        new_board = np.zeros((rows, columns), dtype=bool)
+        births = deaths = 0
+        # tiles with no live cells in them or their border stay empty, unless cells are born with no neighbors
+        skip_empty = 0 not in self.rule.birth
+
+        for top in range(0, rows, size):
+            for left in range(0, columns, size):
+                tile = padded[top:top + size + 2, left:left + size + 2]
+                if skip_empty and not tile.any():
+                    continue
+                # tiles at the edge of an odd board leave out their extra row or column
+                tile_rows = min(size, rows - top)
+                tile_columns = min(size, columns - left)
+                key = (tile_rows, tile_columns, tile.shape, tile.astype(bool).tobytes())
+                result = self.memo.get(key)
+                if result is None:
+                    result = self.step_blocks(tile, tile_rows, tile_columns)
+                    self.memo[key] = result
+                    if len(self.memo) > self.memo_size:
+                        self.memo.popitem(last=False)
+                else:
+                    self.memo.move_to_end(key)
+                new_board[top:top + size, left:left + size] = result[0]
+                births += result[1]
+                deaths += result[2]
+        return new_board, births, deaths
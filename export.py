@@ -0,0 +1,338 @@
+""" File: export.py
+
+    This module runs a world without a window and saves each generation
+    as a frame of an animated GIF or as a numbered sequence of PNG images.
+
+    Frames are encoded one at a time as they are stepped, so memory use
+    does not grow with the length of the run. With --worker, encoding
+    happens in a second process so stepping and encoding overlap. GIF
+    frames are compressed by Pillow when it is installed, which is much
+    faster than the built in encoder.
+
+    To export the first 200 generations of a preset, type:
+    >>> python -m export worlds/diamondloop.txt diamondloop.gif --generations 200
+
+    To export PNG frames into a folder instead, give a folder name:
+    >>> python -m export worlds/diamondloop.txt frames --generations 200
+"""
+import argparse
+import multiprocessing
+import os
+import struct
+import zlib
+import numpy as np
+from world import World
+
+try:
+    from PIL import Image
+except ImportError: # optional, GIF frames are compressed by GifWriter.compress without it
+    Image = None
+
+BACKGROUND_COLOR = (255, 255, 255)
+FOREGROUND_COLOR = (0x32, 0x32, 0x32)
+
+class GifWriter:
+    """ This class writes an animated GIF one frame at a time.
+    """
+    def __init__(self, filepath:str, width:int, height:int, delay:int=10) -> None:
+        """ Initializes an instance of the GifWriter, writing the header.
+
+            Args:
+                filepath (str): the filepath of the GIF.
+                width (int): the width of each frame in pixels.
+                height (int): the height of each frame in pixels.
+                delay (int): the time each frame is shown in hundredths of a second.
+            Returns:
+                None
+        """
+        self.width = width
+        self.height = height
+        self.delay = delay
+        self.file = open(filepath, "wb")
+
+        # header, logical screen with a 2 color global palette, and looping forever
+        self.file.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0x80, 0, 0))
+        self.file.write(bytes(BACKGROUND_COLOR) + bytes(FOREGROUND_COLOR))
+        self.file.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+    def write_frame(self, pixels:np.ndarray) -> None:
+        """ Appends a frame to the GIF.
+
+            Args:
+                pixels (np.ndarray): a height x width uint8 array, 0 for
+                background and 1 for foreground.
+            Returns:
+                None
+        """
+        self.file.write(b"\x21\xf9\x04\x00" + struct.pack("<H", self.delay) + b"\x00\x00")
+        self.file.write(b"\x2c" + struct.pack("<HHHHB", 0, 0, self.width, self.height, 0))
+        if Image is not None:
+            # Pillow codes pixels with 8 bits and splits the data into blocks itself
+            self.file.write(b"\x08")
+            self.file.write(Image.fromarray(pixels, "L").tobytes("gif", "L"))
+        else:
+            self.file.write(b"\x02")
+            data = GifWriter.compress(pixels.tobytes(), 2)
+            for start in range(0, len(data), 255):
+                block = data[start:start + 255]
+                self.file.write(bytes((len(block),)) + block)
+        self.file.write(b"\x00")
+
+    def close(self) -> None:
+        """ Writes the trailer and closes the GIF.
+
+            Returns:
+                None
+        """
+        self.file.write(b"\x3b")
+        self.file.close()
+
+    @staticmethod
+    def compress(pixels:bytes, minimum_code_size:int) -> bytes:
+        """ Compresses pixels with the variable length LZW coding used by GIF.
+
+            Args:
+                pixels (bytes): the palette index of each pixel.
+                minimum_code_size (int): the number of bits the palette indexes need (at least 2).
+            Returns:
+                data (bytes): the packed codes.
+        """
+        clear_code = 1 << minimum_code_size
+        end_code = clear_code + 1
+        output = bytearray()
+        buffer = 0
+        buffer_bits = 0
+
+        codes = {}
+        next_code = end_code + 1
+        code_size = minimum_code_size + 1
+
+        def emit(code, size):
+            nonlocal buffer, buffer_bits
+            buffer |= code << buffer_bits
+            buffer_bits += size
+            while buffer_bits >= 8:
+                output.append(buffer & 0xff)
+                buffer >>= 8
+                buffer_bits -= 8
+
+        emit(clear_code, code_size)
+        prefix = pixels[0]
+        for pixel in pixels[1:]:
+            key = (prefix << 8) | pixel
+            code = codes.get(key)
+            if code is not None:
+                prefix = code
+                continue
+            emit(prefix, code_size)
+            if next_code < 4096:
+                codes[key] = next_code
+                next_code += 1
+                if next_code > (1 << code_size) and code_size < 12:
+                    code_size += 1
+            else:
+                # table is full, start over
+                emit(clear_code, code_size)
+                codes.clear()
+                next_code = end_code + 1
+                code_size = minimum_code_size + 1
+            prefix = pixel
+        emit(prefix, code_size)
+        emit(end_code, code_size)
+        if buffer_bits > 0:
+            output.append(buffer & 0xff)
+        return bytes(output)
+
+class ImageSequenceWriter:
+    """ This class writes each frame as a numbered PNG image in a folder.
+    """
+    def __init__(self, directory:str, width:int, height:int) -> None:
+        """ Initializes an instance of the ImageSequenceWriter.
+
+            Args:
+                directory (str): the folder the images are written to.
+                width (int): the width of each frame in pixels.
+                height (int): the height of each frame in pixels.
+            Returns:
+                None
+        """
+        self.directory = directory
+        self.width = width
+        self.height = height
+        self.frame = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write_frame(self, pixels:np.ndarray) -> None:
+        """ Writes a frame as the next numbered image.
+
+            Args:
+                pixels (np.ndarray): a height x width uint8 array, 0 for
+                background and 1 for foreground.
+            Returns:
+                None
+        """
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        # every row starts with a 0 byte, meaning no filter
+        rows = np.zeros((self.height, self.width + 1), dtype=np.uint8)
+        rows[:, 1:] = pixels
+
+        with open(os.path.join(self.directory, f"frame_{self.frame:05d}.png"), "wb") as image:
+            image.write(b"\x89PNG\r\n\x1a\n")
+            image.write(chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 3, 0, 0, 0)))
+            image.write(chunk(b"PLTE", bytes(BACKGROUND_COLOR) + bytes(FOREGROUND_COLOR)))
+            image.write(chunk(b"IDAT", zlib.compress(rows.tobytes())))
+            image.write(chunk(b"IEND", b""))
+        self.frame += 1
+
+    def close(self) -> None:
+        """ Finishes the sequence. Each image is complete once written,
+            so there is nothing left to do.
+
+            Returns:
+                None
+        """
+
+def board_cells(world:World, rows:int|None=None, columns:int|None=None) -> np.ndarray:
+    """ Copies the current board of a world, one byte per cell. A board
+        that has grown is copied at the place of its first rows and columns,
+        so every frame shows the same area.
+
+        Args:
+            world (World): the world to copy.
+            rows (int|None): the number of rows to copy, all of them if None.
+            columns (int|None): the number of columns to copy, all of them if None.
+        Returns:
+            cells (np.ndarray): a new rows x columns uint8 array, 1 for live cells and 0 for dead cells.
+    """
+    top, left = world.origin
+    if rows is None:
+        rows = world.rows - top
+    if columns is None:
+        columns = world.columns - left
+    return world.current_board.to_numpy()[top:top + rows, left:left + columns].astype(np.uint8)
+
+def frame_pixels(cells:np.ndarray, cell_size:int) -> np.ndarray:
+    """ Scales board cells up into frame pixels, leaving a background
+        line between cells like the simulation window does.
+
+        Args:
+            cells (np.ndarray): a 2D uint8 array of the board, 1 for live cells.
+            cell_size (int): the size of each cell in pixels.
+        Returns:
+            pixels (np.ndarray): a new (rows * cell_size) x (columns * cell_size)
+            uint8 array, 1 for foreground pixels.
+    """
+    cell = np.ones((cell_size, cell_size), dtype=np.uint8)
+    if cell_size >= 3:
+        cell[-1, :] = 0
+        cell[:, -1] = 0
+    return np.kron(cells, cell)
+
+def make_writer(filepath:str, width:int, height:int, delay:int) -> GifWriter|ImageSequenceWriter:
+    """ Picks a writer from the output filepath: a GIF for ".gif" files,
+        otherwise a folder of numbered PNG images.
+
+        Args:
+            filepath (str): the output filepath.
+            width (int): the width of each frame in pixels.
+            height (int): the height of each frame in pixels.
+            delay (int): the time each GIF frame is shown in hundredths of a second.
+        Returns:
+            writer (GifWriter|ImageSequenceWriter): the writer for the output.
+    """
+    if filepath.lower().endswith(".gif"):
+        return GifWriter(filepath, width, height, delay)
+    return ImageSequenceWriter(filepath, width, height)
+
+def encode_frames(queue:multiprocessing.Queue, filepath:str, width:int, height:int, delay:int, cell_size:int) -> None:
+    """ Encodes frames taken from a queue until None is taken.
+        This is the body of the encoding worker process.
+
+        Args:
+            queue (multiprocessing.Queue): the queue of board cells.
+            filepath (str): the output filepath.
+            width (int): the width of each frame in pixels.
+            height (int): the height of each frame in pixels.
+            delay (int): the time each GIF frame is shown in hundredths of a second.
+            cell_size (int): the size of each cell in pixels.
+        Returns:
+            None
+    """
+    writer = make_writer(filepath, width, height, delay)
+    cells = queue.get()
+    while cells is not None:
+        writer.write_frame(frame_pixels(cells, cell_size))
+        cells = queue.get()
+    writer.close()
+
+def export(world:World, filepath:str, generations:int, cell_size:int|None=None, delay:int=10, worker:bool=False) -> int:
+    """ Steps a world and writes one frame per generation, starting with
+        the current board, until it stops changing or the number of
+        generations is reached.
+
+        Args:
+            world (World): the world to run.
+            filepath (str): the output filepath, a ".gif" file or a folder.
+            generations (int): the number of generations to step.
+            cell_size (int|None): the size of each cell in pixels, the world's own if None.
+            delay (int): the time each GIF frame is shown in hundredths of a second.
+            worker (bool): True to encode in a separate process.
+        Returns:
+            frames (int): the number of frames written.
+    """
+    if cell_size is None:
+        cell_size = world.cell_size
+    # a growing world is shown at the size it starts at
+    rows = world.rows
+    columns = world.columns
+    width = columns * cell_size
+    height = rows * cell_size
+
+    if worker is True:
+        # a small queue keeps memory bounded when stepping outpaces encoding
+        queue = multiprocessing.Queue(maxsize=4)
+        process = multiprocessing.Process(target=encode_frames, args=(queue, filepath, width, height, delay, cell_size))
+        process.start()
+        write = queue.put
+    else:
+        writer = make_writer(filepath, width, height, delay)
+        write = lambda cells: writer.write_frame(frame_pixels(cells, cell_size))
+
+    frames = 1
+    write(board_cells(world, rows, columns))
+    for _ in range(generations):
+        if world.step() is False:
+            break
+        write(board_cells(world, rows, columns))
+        frames += 1
+
+    if worker is True:
+        queue.put(None)
+        process.join()
+    else:
+        writer.close()
+    return frames
+
+def main() -> None:
+    """ Parses the command line and exports a world.
+
+        Returns:
+            None
+    """
+    parser = argparse.ArgumentParser(description="Export a Game of Life run as an animated GIF or PNG frames.")
+    parser.add_argument("filepath", help="world file to run")
+    parser.add_argument("output", help="a .gif file, or a folder for numbered PNG frames")
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--cell-size", type=int, help="size of each cell in pixels (the world's own by default)")
+    parser.add_argument("--delay", type=int, default=10, help="time each GIF frame is shown in hundredths of a second")
+    parser.add_argument("--worker", action="store_true", help="encode in a separate process")
+    args = parser.parse_args()
+
+    world = World.from_file(args.filepath)
+    frames = export(world, args.output, args.generations, args.cell_size, args.delay, args.worker)
+    print(f"wrote {frames} frames to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+""" File: history.py
+
+    This module holds the History class.
+"""
+import threading
+import zlib
+from collections import deque
+import numpy as np
+
+class History:
+    """ This class keeps compressed copies of the boards of recent
+        generations within a memory budget, dropping the oldest once
+        the budget is used up, so a world can be rewound without
+        computing it again from its initial board.
+
+        Boards are packed to one bit per cell and then compressed, so
+        mostly empty or repetitive boards take very little memory. The
+        generations kept are always consecutive. Boards may be added
+        from a worker thread while the window reads them.
+    """
+    def __init__(self, budget:int=64 * 1024 * 1024) -> None:
+        """ Initializes an instance of the History.
+
+            Args:
+                budget (int): the most bytes of compressed boards kept, 0 to keep none.
+            Returns:
+                None
+        """
+        self.budget = budget
+        self.snapshots = deque()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+
+    def record(self, generation:int, board:np.ndarray, origin:tuple[int, int]=(0, 0)) -> None:
+        """ Adds the board of a generation. Generations already kept are
+            not added again, since a world always steps to the same board,
+            and nothing is added (or compressed) with a budget of 0.
+
+            Args:
+                generation (int): the generation number.
+                board (np.ndarray): a 2D boolean array of live cells.
+                origin (tuple[int, int]): the world's origin at the generation,
+                which changes as a board grows (see World.grow).
+            Returns:
+                None
+        """
+        if self.budget <= 0:
+            return
+        with self.lock:
+            if self.snapshots and self.snapshots[0][0] <= generation <= self.snapshots[-1][0]:
+                return
+        data = zlib.compress(np.packbits(board).tobytes(), 1)
+        with self.lock:
+            if self.snapshots and generation != self.snapshots[-1][0] + 1:
+                # a gap or a rewind past the oldest board, so the kept boards no longer lead up to it
+                self.snapshots.clear()
+                self.nbytes = 0
+            self.snapshots.append((generation, board.shape, data, origin))
+            self.nbytes += len(data)
+            while len(self.snapshots) > 1 and self.nbytes > self.budget:
+                self.nbytes -= len(self.snapshots.popleft()[2])
+
+    def get(self, generation:int) -> tuple[np.ndarray, tuple[int, int]]|None:
+        """ Uncompresses the board of a generation.
+
+            Args:
+                generation (int): the generation number.
+            Returns:
+                snapshot (tuple[np.ndarray, tuple[int, int]]|None): a new 2D boolean array of
+                live cells and the world's origin, or None if the generation is not kept.
+        """
+        with self.lock:
+            if not self.snapshots or not self.snapshots[0][0] <= generation <= self.snapshots[-1][0]:
+                return None
+            _, shape, data, origin = self.snapshots[generation - self.snapshots[0][0]]
+        cells = np.unpackbits(np.frombuffer(zlib.decompress(data), dtype=np.uint8), count=shape[0] * shape[1])
+        return cells.reshape(shape).astype(bool), origin
+
+    @property
+    def span(self) -> tuple[int, int]|None:
+        """ Property for getting the generations kept.
+
+            Returns:
+                span (tuple[int, int]|None): the oldest and newest generation, or None if there are none.
+        """
+        with self.lock:
+            if self.snapshots:
+                return self.snapshots[0][0], self.snapshots[-1][0]
+            return None
+
+    def clear(self) -> None:
+        """ Removes every board.
+
+            Returns:
+                None
+        """
+        with self.lock:
+            self.snapshots.clear()
+            self.nbytes = 0
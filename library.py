@@ -0,0 +1,183 @@
+""" File: library.py
+
+    This module holds the PatternLibrary class.
+"""
+import copy
+import hashlib
+import json
+import math
+import os
+import tempfile
+from collections import OrderedDict
+from world import World
+
+class PatternLibrary:
+    """ This class indexes the world files in a directory and caches
+        recently opened worlds.
+
+        The index (dimensions, population, bounding box, content hash and
+        a small thumbnail per file) is kept in an index file inside the
+        directory and an entry is only rebuilt when its file's modification
+        time or size changes, so rescanning thousands of files is cheap.
+    """
+    INDEX_NAME = ".index.json"
+    THUMBNAIL_SIZE = 32
+
+    def __init__(self, directory:str="worlds", cache_bytes:int=64*1024*1024) -> None:
+        """ Initializes an instance of the PatternLibrary.
+
+            Args:
+                directory (str): the directory holding world files.
+                cache_bytes (int): the most memory the boards of recently
+                opened worlds may take up.
+            Returns:
+                None
+        """
+        self.directory = directory
+        self.cache_bytes = cache_bytes
+        self.cached_bytes = 0
+        self.cache = OrderedDict()
+        self.entries = {}
+
+        index_path = os.path.join(self.directory, self.INDEX_NAME)
+        try:
+            with open(index_path) as index_file:
+                self.entries = json.load(index_file)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def scan(self) -> list[dict]:
+        """ Brings the index up to date with the directory, only reading
+            files that are new or have changed since they were indexed.
+
+            Returns:
+                entries (list[dict]): the index entries sorted by name. Files
+                that are not valid world files are left out.
+        """
+        entries = {}
+        changed = False
+        for folder, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".txt"):
+                    continue
+                filepath = os.path.join(folder, name)
+                key = os.path.relpath(filepath, self.directory)
+                try:
+                    stat = os.stat(filepath)
+                except OSError:
+                    continue
+                entry = self.entries.get(key)
+                if entry is None or entry["mtime"] != stat.st_mtime_ns or entry["bytes"] != stat.st_size:
+                    entry = PatternLibrary.index_pattern(filepath, stat)
+                    entry["name"] = key
+                    changed = True
+                entries[key] = entry
+
+        if changed is True or len(entries) != len(self.entries):
+            self.entries = entries
+            self.save_index()
+        return sorted((entry for entry in self.entries.values() if entry["valid"]), key=lambda entry: entry["name"].lower())
+
+    def save_index(self) -> None:
+        """ Atomically writes the index file. A directory that cannot be
+            written to simply goes without a saved index.
+
+            Returns:
+                None
+        """
+        try:
+            descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix=".index-", suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(descriptor, "w") as index_file:
+                json.dump(self.entries, index_file, separators=(",", ":"))
+            os.replace(temporary_path, os.path.join(self.directory, self.INDEX_NAME))
+        except OSError:
+            os.remove(temporary_path)
+
+    @staticmethod
+    def index_pattern(filepath:str, stat:os.stat_result) -> dict:
+        """ Builds the index entry of a world file straight from its text.
+
+            Args:
+                filepath (str): the filepath of the world file.
+                stat (os.stat_result): the file's status, used to detect changes.
+            Returns:
+                entry (dict): the index entry, with "valid" False if the
+                file is not a valid world file.
+        """
+        entry = {"mtime": stat.st_mtime_ns, "bytes": stat.st_size, "valid": False}
+        try:
+            settings, lines = World.read(filepath)
+            with open(filepath, "rb") as world_file:
+                entry["hash"] = hashlib.sha1(world_file.read()).hexdigest()
+        except (OSError, UnicodeDecodeError, ValueError):
+            return entry
+
+        rows = len(lines)
+        columns = int(settings["cols"])
+        population = 0
+        top = bottom = left = right = None
+        for row in range(rows):
+            count = lines[row].count("X")
+            if count > 0:
+                population += count
+                if top is None:
+                    top = row
+                    left = lines[row].find("X")
+                    right = lines[row].rfind("X")
+                bottom = row
+                left = min(left, lines[row].find("X"))
+                right = max(right, lines[row].rfind("X"))
+
+        # each thumbnail cell covers a scale x scale block, live if any cell in it is
+        scale = max(1, math.ceil(max(rows, columns) / PatternLibrary.THUMBNAIL_SIZE))
+        thumbnail = []
+        for block_row in range(0, rows, scale):
+            block_lines = lines[block_row:block_row + scale]
+            thumbnail_line = ""
+            for block_column in range(0, columns, scale):
+                if any("X" in line[block_column:block_column + scale] for line in block_lines):
+                    thumbnail_line += "X"
+                else:
+                    thumbnail_line += "-"
+            thumbnail.append(thumbnail_line)
+
+        entry.update({"valid": True, "rows": rows, "cols": columns, "size": int(settings["size"]), "population": population,
+                      "bbox": None if top is None else [top, left, bottom, right], "thumbnail": thumbnail})
+        return entry
+
+    def load(self, filepath:str) -> World:
+        """ Opens a world file, reusing the parsed world if it was opened
+            recently and has not changed since.
+
+            Args:
+                filepath (str): the filepath of the world file.
+            Returns:
+                world (World): a fresh copy of the world in the file.
+            Raises:
+                ValueError: if the file is not a valid world file.
+        """
+        stat = os.stat(filepath)
+        key = os.path.abspath(filepath)
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            self.cache.move_to_end(key)
+            return copy.deepcopy(cached[1])
+
+        if cached is not None:
+            self.cached_bytes -= cached[2]
+            del self.cache[key]
+
+        world = World.from_file(filepath)
+        # boards hold one byte per cell, and a cached world holds two boards
+        size = 2 * world.rows * world.columns
+        if size <= self.cache_bytes:
+            self.cache[key] = ((stat.st_mtime_ns, stat.st_size), world, size)
+            self.cached_bytes += size
+            while self.cached_bytes > self.cache_bytes:
+                _, (_, _, evicted_size) = self.cache.popitem(last=False)
+                self.cached_bytes -= evicted_size
+            return copy.deepcopy(world)
+        return world
@@ -0,0 +1,150 @@
+""" File: memory.py
+
+    This module holds the MemoryProfiler class.
+"""
+import tracemalloc
+from collections import deque
+from chunkedworld import ChunkedWorld
+from history import History
+from library import PatternLibrary
+from world import World
+
+class MemoryProfiler:
+    """ This class measures the memory a world uses while it runs: the
+        bytes held by each of its boards and caches, and the bytes
+        allocated while stepping each generation, traced with
+        tracemalloc.
+
+        Tracing is process-wide and slows allocations down, so it is
+        only started for runs that ask for it. The allocations of the
+        most recent generations are kept, from which the peak and the
+        steady state (the mean of the later half) are reported.
+    """
+    def __init__(self, capacity:int=1000) -> None:
+        """ Initializes an instance of the MemoryProfiler.
+
+            Args:
+                capacity (int): the number of generations whose allocations are kept.
+            Returns:
+                None
+        """
+        self.records = deque(maxlen=capacity)
+        self.peak_traced = 0
+        self.peak_step = 0
+        self.started = False
+
+    def start(self) -> None:
+        """ Starts tracing allocations, unless something else already is.
+
+            Returns:
+                None
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+
+    def stop(self) -> None:
+        """ Stops tracing allocations, if this profiler started it.
+
+            Returns:
+                None
+        """
+        if self.started is True:
+            tracemalloc.stop()
+            self.started = False
+
+    def step(self, world:World|ChunkedWorld) -> bool:
+        """ Steps a world, recording the memory allocated while doing so.
+
+            Args:
+                world (World|ChunkedWorld): the world to step.
+            Returns:
+                changes_made (bool): the result of the world's step.
+        """
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        changes_made = world.step()
+        current, peak = tracemalloc.get_traced_memory()
+        # allocated is the most held at once during the step, retained what is still held after it
+        record = {"generation": world.generation, "allocated": peak - before, "retained": current - before, "traced": current}
+        self.records.append(record)
+        self.peak_traced = max(self.peak_traced, peak)
+        self.peak_step = max(self.peak_step, record["allocated"])
+        return changes_made
+
+    def summary(self) -> dict[str, int]:
+        """ Sums up the generations recorded.
+
+            Returns:
+                summary (dict[str, int]): "peak_traced" is the most bytes traced at
+                once, "peak_step" the most allocated by one generation, and
+                "steady_traced" and "steady_step" the means of the later half of
+                the generations kept, 0 if none were recorded.
+        """
+        records = list(self.records)[len(self.records) // 2:]
+        if not records:
+            return {"peak_traced": 0, "peak_step": 0, "steady_traced": 0, "steady_step": 0}
+        return {"peak_traced": self.peak_traced, "peak_step": self.peak_step,
+                "steady_traced": sum(record["traced"] for record in records) // len(records),
+                "steady_step": sum(record["allocated"] for record in records) // len(records)}
+
+    @staticmethod
+    def holdings(world:World|ChunkedWorld, library:PatternLibrary|None=None, histories:list[History|None]=()) -> dict[str, int]:
+        """ Counts the bytes held by each board and cache of a world, and
+            by the caches it is run alongside.
+
+            Args:
+                world (World|ChunkedWorld): the world.
+                library (PatternLibrary|None): the pattern library worlds are
+                loaded from, whose cache is counted as "library".
+                histories (list[History|None]): the rewind histories of other
+                worlds run alongside, like the other tabs of a window, counted
+                together as "histories".
+            Returns:
+                holdings (dict[str, int]): the bytes of each part held, like
+                "current_board" or "engine", with "total" for their sum.
+        """
+        holdings = {}
+        for name in ("initial_board", "current_board", "new_board", "next_board"):
+            board = getattr(world, name, None)
+            # the current board is usually also the new one, so it is only counted once
+            if board is not None and all(board is not getattr(world, counted, None) for counted in holdings):
+                holdings[name] = board.nbytes
+        if getattr(world, "ages", None) is not None:
+            holdings["ages"] = world.ages.nbytes
+        if getattr(world, "history", None) is not None:
+            holdings["history"] = world.history.nbytes
+        holdings["engine"] = world.engine.nbytes
+        holdings["statistics"] = world.statistics.nbytes
+        if library is not None:
+            holdings["library"] = library.cached_bytes
+        if histories:
+            holdings["histories"] = sum(history.nbytes for history in histories if history is not None)
+        holdings["total"] = sum(holdings.values())
+        return holdings
+
+    @staticmethod
+    def format_bytes(count:int) -> str:
+        """ Writes a number of bytes in the largest unit under 1024 of it, like "1.5 MB".
+
+            Args:
+                count (int): the number of bytes.
+            Returns:
+                text (str): the number of bytes with its unit.
+        """
+        for unit in ("B", "KB", "MB"):
+            if abs(count) < 1024:
+                return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+            count /= 1024
+        return f"{count:.1f} GB"
+
+    @staticmethod
+    def format(holdings:dict[str, int]) -> str:
+        """ Writes the holdings of a world on one line, like "current_board:2.5 KB, engine:64.0 KB".
+
+            Args:
+                holdings (dict[str, int]): the holdings from holdings.
+            Returns:
+                text (str): the holdings.
+        """
+        return ", ".join(f"{name}:{MemoryProfiler.format_bytes(count)}" for name, count in holdings.items())
@@ -0,0 +1,385 @@
+""" File: server.py
+
+    This module runs a simulation of Conway's Game of Life without
+    a window and streams its generations to any number of viewers,
+    so a long run can be watched from several places at once.
+
+    To serve a world file on localhost, type the following command:
+    >>> python -m server worlds/diamondloop.txt --generations 100000
+
+    To serve on a Unix socket instead, type:
+    >>> python -m server worlds/diamondloop.txt --socket /tmp/life.sock
+
+    To watch a served run, printing each generation received, type:
+    >>> python -m server --watch
+"""
+import argparse
+import asyncio
+import struct
+import zlib
+import numpy as np
+from world import World
+
+# every message is its length, then this header, then a compressed payload:
+# kind, generation, rows, columns and two counts (population and 0 for a keyframe,
+# births and deaths for a delta)
+LENGTH = struct.Struct("!I")
+HEADER = struct.Struct("!cQIIII")
+KEYFRAME = b"K"
+DELTA = b"D"
+END = b"E"
+
+def encode_keyframe(generation:int, board:np.ndarray) -> bytes:
+    """ Encodes a whole board, which a viewer can start from.
+
+        Args:
+            generation (int): the generation number.
+            board (np.ndarray): a 2D boolean array of live cells.
+        Returns:
+            message (bytes): the message, with its length.
+    """
+    rows, columns = board.shape
+    header = HEADER.pack(KEYFRAME, generation, rows, columns, int(np.count_nonzero(board)), 0)
+    message = header + zlib.compress(np.packbits(board).tobytes(), 1)
+    return LENGTH.pack(len(message)) + message
+
+def encode_delta(generation:int, old_board:np.ndarray, new_board:np.ndarray) -> bytes:
+    """ Encodes the cells born and the cells that died since the last
+        generation, by their index in the flattened board.
+
+        Args:
+            generation (int): the generation number of the new board.
+            old_board (np.ndarray): the board of the generation before.
+            new_board (np.ndarray): the board of the generation, the same shape.
+        Returns:
+            message (bytes): the message, with its length.
+    """
+    rows, columns = new_board.shape
+    births = np.flatnonzero(new_board > old_board).astype(">u4")
+    deaths = np.flatnonzero(new_board < old_board).astype(">u4")
+    header = HEADER.pack(DELTA, generation, rows, columns, len(births), len(deaths))
+    message = header + zlib.compress(births.tobytes() + deaths.tobytes(), 1)
+    return LENGTH.pack(len(message)) + message
+
+def encode_end(generation:int) -> bytes:
+    """ Encodes the end of a run.
+
+        Args:
+            generation (int): the last generation.
+        Returns:
+            message (bytes): the message, with its length.
+    """
+    message = HEADER.pack(END, generation, 0, 0, 0, 0)
+    return LENGTH.pack(len(message)) + message
+
+def apply(board:np.ndarray|None, message:bytes) -> tuple[bytes, int, np.ndarray|None]:
+    """ Decodes a message (without its length) and applies it to a
+        viewer's board.
+
+        Args:
+            board (np.ndarray|None): the board so far, None before the first keyframe.
+            message (bytes): the message.
+        Returns:
+            kind (bytes): KEYFRAME, DELTA or END.
+            generation (int): the generation of the message.
+            board (np.ndarray|None): the board at the generation, changed in place by deltas.
+        Raises:
+            ValueError: if a delta does not apply to the board.
+    """
+    kind, generation, rows, columns, first, second = HEADER.unpack_from(message)
+    if kind == END:
+        return kind, generation, board
+    payload = zlib.decompress(message[HEADER.size:])
+    if kind == KEYFRAME:
+        cells = np.unpackbits(np.frombuffer(payload, dtype=np.uint8), count=rows * columns)
+        return kind, generation, cells.reshape(rows, columns).astype(bool)
+    if board is None or board.shape != (rows, columns):
+        raise ValueError(f"delta for generation {generation} does not apply to the board.")
+    indices = np.frombuffer(payload, dtype=">u4")
+    cells = board.reshape(-1)
+    cells[indices[:first]] = True
+    cells[indices[first:first + second]] = False
+    return kind, generation, board
+
+async def read_message(reader:asyncio.StreamReader) -> bytes|None:
+    """ Reads the next message sent by a server.
+
+        Args:
+            reader (asyncio.StreamReader): the connection to the server.
+        Returns:
+            message (bytes|None): the message without its length, or None once the server has gone.
+    """
+    try:
+        length, = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+        return await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+class Subscriber:
+    """ This class holds the state of one viewer of a FrameServer: the
+        messages waiting to be sent to it, and whether it has a board
+        the next delta applies to.
+    """
+    def __init__(self, writer:asyncio.StreamWriter, queue_size:int) -> None:
+        """ Initializes an instance of the Subscriber.
+
+            Args:
+                writer (asyncio.StreamWriter): the connection to the viewer.
+                queue_size (int): the most messages waiting to be sent.
+            Returns:
+                None
+        """
+        self.writer = writer
+        self.queue = asyncio.Queue(queue_size)
+        # False until the viewer is sent a keyframe, and again after it misses a generation
+        self.synced = False
+        self.skipped = 0
+        self.task = None
+        # set once the viewer has hung up or been hung up on
+        self.closed = asyncio.Event()
+
+    async def send(self) -> None:
+        """ Sends messages in order until the None that ends them, or
+            until the viewer goes away.
+
+            Returns:
+                None
+        """
+        try:
+            while (message := await self.queue.get()) is not None:
+                self.writer.write(message)
+                await self.writer.drain()
+        except ConnectionError:
+            pass
+
+class FrameServer:
+    """ This class steps a world and pushes every generation to the
+        viewers connected to it, as the cells born and the cells that
+        died (a delta), with the whole board (a keyframe) sent to new
+        viewers, to every viewer every so many generations and whenever
+        the board grows.
+
+        Each viewer has a small queue of messages. A viewer too slow to
+        keep its queue from filling misses generations rather than
+        having them pile up, and is sent a keyframe once it catches up,
+        so the server's memory does not grow with slow viewers and they
+        never hold back the run or other viewers. Each message is
+        encoded once however many viewers it is sent to.
+    """
+    def __init__(self, world:World, keyframe_every:int=100, queue_size:int=8, interval:float=0) -> None:
+        """ Initializes an instance of the FrameServer.
+
+            Args:
+                world (World): the world to run.
+                keyframe_every (int): the generations between keyframes sent to every viewer.
+                queue_size (int): the most messages waiting to be sent to each viewer.
+                interval (float): the least seconds between generations, 0 to step as
+                fast as possible.
+            Returns:
+                None
+        """
+        self.world = world
+        self.keyframe_every = keyframe_every
+        self.queue_size = queue_size
+        self.interval = interval
+        self.subscribers = set()
+
+    async def handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        """ Serves a viewer from when it connects until it hangs up.
+            Called by the asyncio server.
+
+            Args:
+                reader (asyncio.StreamReader): the connection from the viewer.
+                writer (asyncio.StreamWriter): the connection to the viewer.
+            Returns:
+                None
+        """
+        subscriber = Subscriber(writer, self.queue_size)
+        subscriber.task = asyncio.create_task(subscriber.send())
+        self.subscribers.add(subscriber)
+        try:
+            # viewers only listen, so reading just waits for them to hang up
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            subscriber.task.cancel()
+            writer.close()
+            subscriber.closed.set()
+
+    def publish(self, generation:int, old_board:np.ndarray, new_board:np.ndarray) -> None:
+        """ Queues a generation for every viewer with room for it.
+
+            Args:
+                generation (int): the generation number of the new board.
+                old_board (np.ndarray): the board of the generation before.
+                new_board (np.ndarray): the board of the generation.
+            Returns:
+                None
+        """
+        every = old_board.shape != new_board.shape or generation % self.keyframe_every == 0
+        keyframe = None
+        delta = None
+        for subscriber in self.subscribers:
+            if subscriber.queue.full():
+                subscriber.synced = False
+                subscriber.skipped += 1
+                continue
+            if every is True or subscriber.synced is False:
+                if keyframe is None:
+                    keyframe = encode_keyframe(generation, new_board)
+                message = keyframe
+            else:
+                if delta is None:
+                    delta = encode_delta(generation, old_board, new_board)
+                message = delta
+            subscriber.queue.put_nowait(message)
+            subscriber.synced = True
+
+    async def run(self, generations:int|None=None) -> bool:
+        """ Steps the world until it stops changing or reaches a
+            generation, publishing every generation. The world is stepped
+            on another thread so viewers are served while it computes.
+
+            Args:
+                generations (int|None): the generation to stop at, None to run until stable.
+            Returns:
+                stable (bool): True if the world stopped changing.
+        """
+        loop = asyncio.get_running_loop()
+        board = self.world.current_board.to_numpy()
+        while generations is None or self.world.generation < generations:
+            start = loop.time()
+            changes_made = await asyncio.to_thread(self.world.step)
+            new_board = self.world.current_board.to_numpy()
+            self.publish(self.world.generation, board, new_board)
+            board = new_board
+            if changes_made is False:
+                return True
+            # always yields, so the viewers' messages go out between generations
+            await asyncio.sleep(max(0, self.interval - (loop.time() - start)))
+        return False
+
+    async def finish(self, timeout:float=5) -> None:
+        """ Sends every viewer the end of the run after the messages it
+            is still waiting for, then hangs up. Viewers that missed the
+            last generation are sent it first, so every viewer ends on
+            the last board.
+
+            Args:
+                timeout (float): the most seconds to wait for slow viewers.
+            Returns:
+                None
+        """
+        keyframe = encode_keyframe(self.world.generation, self.world.current_board.to_numpy())
+        message = encode_end(self.world.generation)
+
+        async def end(subscriber:Subscriber) -> None:
+            if subscriber.synced is False:
+                await subscriber.queue.put(keyframe)
+            await subscriber.queue.put(message)
+            await subscriber.queue.put(None)
+            await subscriber.task
+
+        subscribers = list(self.subscribers)
+        if subscribers:
+            await asyncio.wait([asyncio.create_task(end(subscriber)) for subscriber in subscribers], timeout=timeout)
+        for subscriber in subscribers:
+            subscriber.task.cancel()
+            subscriber.writer.close()
+        if subscribers:
+            # lets each viewer's handler see the connection close before the server does
+            await asyncio.wait([asyncio.create_task(subscriber.closed.wait()) for subscriber in subscribers], timeout=timeout)
+
+    async def serve(self, host:str="127.0.0.1", port:int=8765, path:str|None=None, generations:int|None=None) -> bool:
+        """ Listens for viewers and runs the world.
+
+            Args:
+                host (str): the address to listen on, localhost by default.
+                port (int): the port to listen on.
+                path (str|None): a Unix socket to listen on instead, if given.
+                generations (int|None): the generation to stop at, None to run until stable.
+            Returns:
+                stable (bool): True if the world stopped changing.
+        """
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            stable = await self.run(generations)
+            await self.finish()
+        return stable
+
+async def watch(host:str="127.0.0.1", port:int=8765, path:str|None=None) -> np.ndarray|None:
+    """ Connects to a server and prints each generation received until
+        the run ends.
+
+        Args:
+            host (str): the address of the server.
+            port (int): the port of the server.
+            path (str|None): the Unix socket of the server instead, if given.
+        Returns:
+            board (np.ndarray|None): the last board received.
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    board = None
+    while (message := await read_message(reader)) is not None:
+        kind, generation, board = apply(board, message)
+        if kind == END:
+            print(f"generation {generation}, run ended")
+            break
+        keyframe = " (keyframe)" if kind == KEYFRAME else ""
+        print(f"generation {generation}, population {np.count_nonzero(board)}{keyframe}")
+    writer.close()
+    return board
+
+def main() -> None:
+    """ Parses the command line and serves or watches a world.
+
+        Returns:
+            None
+    """
+    parser = argparse.ArgumentParser(description="Stream a Game of Life run to viewers, or watch one.")
+    parser.add_argument("filepath", nargs="?", help="world file to run (a random world is made if omitted)")
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--density", type=float, default=.5, help="chance of each cell being alive in a random world")
+    parser.add_argument("--rule", help='rule in B/S notation, like "B36/S23" (the world\'s own by default)')
+    parser.add_argument("--edge", choices=World.EDGES, help="how cells beyond the edges behave (the world's own by default)")
+    parser.add_argument("--generations", type=int, help="generation to stop at (runs until stable by default)")
+    parser.add_argument("--interval", type=float, default=0, help="least seconds between generations")
+    parser.add_argument("--keyframe-every", type=int, default=100, help="generations between whole boards sent to every viewer")
+    parser.add_argument("--queue", type=int, default=8, help="messages waiting for a viewer before it misses generations")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on or connect to")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="Unix socket to listen on or connect to instead of a port")
+    parser.add_argument("--watch", action="store_true", help="connect to a server and print what it sends")
+    args = parser.parse_args()
+
+    if args.watch is True:
+        asyncio.run(watch(args.host, args.port, args.socket))
+        return
+
+    if args.filepath is not None:
+        world = World.from_file(args.filepath)
+    else:
+        world = World.random(args.rows, args.columns, seed=args.seed, density=args.density)
+    if args.rule is not None:
+        world.set_rule(args.rule)
+    if args.edge is not None:
+        world.set_boundary(args.edge)
+
+    server = FrameServer(world, args.keyframe_every, args.queue, args.interval)
+    stable = asyncio.run(server.serve(args.host, args.port, args.socket, args.generations))
+    state = "stable" if stable else "running"
+    print(f"generation {world.generation} ({state}), population {world.statistics.latest['population']}")
+
+if __name__ == "__main__":
+    main()
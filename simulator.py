@@ -4,45 +4,101 @@
 """
 import tkinter as tk
 from tkinter import ttk, filedialog
-import random
 import time
-import copy
-import config
+import numpy as np
+import workspace as workspaces
+from checkpoint import Checkpointer
 from datastructures.array2d import Array2D
+from history import History
+from memory import MemoryProfiler
+from worker import StepWorker
+from world import World
 
 class Simulator:
     """ This is class starts up a window with several 
         options for configuring a Game of Life simulation.
     """""
-    def __init__(self, rows:int, columns:int, cell_size:int=10, filepath:str|None=None):
+    # views with more cells than this are drawn as a density image instead of cell by cell
+    MAX_DRAWN_CELLS = 100000
+    # cells smaller than this many pixels are drawn as a density image
+    MIN_DRAWN_CELL_SIZE = 3
+    # the most bytes of compressed boards kept for rewinding, unless given
+    HISTORY_BYTES = 64 * 1024 * 1024
+    # the frames per second aimed for when several generations are shown per frame
+    TARGET_FPS = 30
+    # cells colored by age go from the first color when born to the second at this age and older
+    AGE_COLORS = ("#f08c00", "#1c3d8f")
+    OLD_AGE = 64
+
+    def __init__(self, rows:int, columns:int, cell_size:int=10, filepath:str|None=None, checkpoint_dir:str|None="checkpoints", world:World|None=None,
+                 workspace:'workspaces.Workspace|None'=None, history_bytes:int=HISTORY_BYTES):
         """ Initializes an instance of the Simulator.
             
             Args:
                 rows (int): the number of rows.
                 columns (int): the number of columns.
                 cell_size (int): the cell size in pixels.
-                filepath (str): the filepath of a preset.
+                filepath (str): the filepath of a preset or checkpoint.
+                checkpoint_dir (str|None): the directory checkpoints are
+                periodically written to, None to disable checkpoints.
+                world (World|None): an already loaded world to simulate,
+                used instead of filepath if given.
+                workspace (Workspace|None): the window to open the simulation
+                in a new tab of, None to open a window of its own.
+                history_bytes (int): the most bytes of compressed boards kept
+                for rewinding, 0 to keep none.
             Returns:
                 None
         """
-        self.root = tk.Tk()
+        standalone = workspace is None
+        if standalone is True:
+            workspace = workspaces.Workspace()
+            workspace.opened += 1
+        self.workspace = workspace
+        self.root = workspace.root
 
         self.manual = False
         self.moving = False
         self.cell_size = cell_size
         self.speed = .1
+        self.frame_job = None
+        self.frame_deadline = 0.0
+        # the seconds between the frames last scheduled
+        self.period = self.speed
+        # moving averages of the seconds drawing a frame takes and of the rates achieved
+        self.draw_cost = 0.0
+        self.generation_rate = 0.0
+        self.frame_rate = 0.0
+        self.rate_mark = None
+        # the ages of the cells on screen, when colored by age
+        self.ages = None
+        self.age_palette = None
+        self.world = None
+        self.worker = None
+        self.jump_target = None
+        self.jump_cancelled = False
+        self.jump_job = None
+        self.draw_job = None
+        self.canvas_job = None
+        self.board_frame = None
+        self.block_size = 1
+        self.board_image = None
         self.background_color = "white"
         self.foreground_color = "#323232"
 
-        self.root.title("Conway's Game of Life")
-        self.root.iconbitmap("assets/gol.ico")
-        self.root.configure(bg=self.background_color, highlightcolor=self.foreground_color, highlightthickness=1)
+        self.frame = workspace.new_tab(self)
         
         self.rows = rows
         self.columns = columns
+        # how far a growing board has moved from the board on screen (see World.grow)
+        self.origin = (0, 0)
+        self.checkpointer = None
+        if checkpoint_dir is not None:
+            self.checkpointer = Checkpointer(checkpoint_dir)
+        self.history_bytes = history_bytes
 
         # making simulation console
-        self.console = tk.Frame(self.root, bg=self.background_color, highlightbackground="black", highlightthickness=1)
+        self.console = tk.Frame(self.frame, bg=self.background_color, highlightbackground="black", highlightthickness=1)
         self.console.grid(row=0, column=0, sticky="nsew")
 
         # control button
@@ -60,6 +116,9 @@ class Simulator:
         speed_slider = ttk.Scale(self.slider_frame, command=self.update_speed, style="Vertical.TScale", from_=.05, to=.7, orient="vertical", length=150)
         speed_slider.set(.4)
         speed_slider.pack()
+        self.adaptive = tk.BooleanVar(self.root, False)
+        adaptive_toggle = tk.Checkbutton(self.slider_frame, text="Adaptive", variable=self.adaptive, command=self.adaptive_action, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9))
+        adaptive_toggle.pack()
         self.root.update()
 
         # manual/automatic toggle button
@@ -73,54 +132,148 @@ class Simulator:
         self.end_frame.grid(row=2, column=1, padx=(20,0), pady=(25,0))
         end_button = tk.Button(self.end_frame, text="End", command=self.end_simulation, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 11), width=6, borderwidth=0)
         end_button.pack()
+
+        # fast-forward controls, advancing by or going to a generation without drawing the ones between
+        self.jump_frame = tk.Frame(self.console, bg=self.background_color)
+        self.jump_frame.grid(row=3, column=0, columnspan=2, padx=10, pady=(20,0))
+        self.jump_text = tk.Entry(self.jump_frame, justify="center", bg=self.background_color, fg=self.foreground_color, width=10, font=("Helvetica", 11), 
+                                  validate="key", validatecommand=(self.root.register(lambda entry: entry.isdigit() or entry == ""), "%P"), relief=tk.SOLID)
+        self.jump_text.grid(row=0, column=0, rowspan=2, padx=(0,10))
+        self.advance_button = tk.Button(self.jump_frame, text="Advance", command=lambda: self.jump_action(relative=True), bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9), width=8, relief=tk.SOLID, borderwidth=1)
+        self.advance_button.grid(row=0, column=1, pady=(0,2))
+        self.goto_button = tk.Button(self.jump_frame, text="Go To", command=lambda: self.jump_action(relative=False), bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9), width=8, relief=tk.SOLID, borderwidth=1)
+        self.goto_button.grid(row=1, column=1)
+        self.jump_label = tk.Label(self.jump_frame, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9))
+        self.jump_label.grid(row=2, column=0, columnspan=2)
+
+        # rewinding, one generation back or by dragging over the generations kept
+        self.history_frame = tk.Frame(self.console, bg=self.background_color)
+        self.history_frame.grid(row=4, column=0, columnspan=2, padx=10, pady=(10,0))
+        self.previous_button = tk.Button(self.history_frame, text="Previous", command=self.previous_action, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9), width=8, relief=tk.SOLID, borderwidth=1)
+        self.previous_button.grid(row=0, column=0, padx=(0,10))
+        self.history_scale = tk.Scale(self.history_frame, orient="horizontal", from_=0, to=0, showvalue=False, length=110, bg=self.background_color, troughcolor=self.background_color, highlightthickness=0)
+        self.history_scale.grid(row=0, column=1)
+        self.history_scale.bind("<B1-Motion>", self.scrub_action)
+        self.history_scale.bind("<ButtonRelease-1>", self.scrub_action)
+
+        # generation statistics and optional population graph, kept below the controls when the simulation ends
+        self.stats_frame = tk.Frame(self.console, bg=self.background_color)
+        self.stats_frame.grid(row=10, column=0, columnspan=2, padx=10, pady=(20,10))
+        self.stats_label = tk.Label(self.stats_frame, justify="left", anchor="w", bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9), width=26)
+        self.stats_label.pack()
+        self.graph_visible = tk.BooleanVar(self.root, False)
+        graph_toggle = tk.Checkbutton(self.stats_frame, text="Population Graph", variable=self.graph_visible, command=self.draw_statistics, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9))
+        graph_toggle.pack()
+        self.age_colored = tk.BooleanVar(self.root, False)
+        age_toggle = tk.Checkbutton(self.stats_frame, text="Color by Age", variable=self.age_colored, command=self.age_action, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9))
+        age_toggle.pack()
+        self.graph = tk.Canvas(self.stats_frame, bg=self.background_color, highlightbackground=self.foreground_color, highlightthickness=1, width=180, height=70)
+
+        # opening another world in a new tab, kept when the simulation ends
+        new_world_frame = tk.Frame(self.console, highlightbackground=self.foreground_color, highlightthickness=1)
+        new_world_frame.grid(row=11, column=0, columnspan=2, padx=10, pady=(0,10))
+        new_world_button = tk.Button(new_world_frame, text="New World Tab...", command=lambda: self.workspace.new_world(self.cell_size, self.rows, self.columns), bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9), width=15, borderwidth=0)
+        new_world_button.pack()
         
         # starting window
-        self.boot_board(filepath)
+        self.boot_board(filepath, world)
+        if self.world is not None:
+            self.workspace.name_tab(self, f"{self.rows}x{self.columns} {self.world.rule}")
         self.draw_board()
-        self.center_window()
-        self.root.mainloop()
+        self.draw_statistics()
+        self.draw_history()
+        if standalone is True:
+            workspace.run()
 
-    def boot_board(self, filepath:str|None):
+    def boot_board(self, filepath:str|None, world:World|None=None):
         """ Depending on the initial configuration, makes board from
-            random generation or makes board from file.
+            random generation, from file or from an already loaded world.
 
             Args:
                 filepath (str|None): Stores filepath of preset if one
                 is chosen, otherwise stores None.
+                world (World|None): an already loaded world, if any.
             Returns:
                 None
         """
 
         def make_board():
-            self.board_frame = tk.Canvas(self.root, bg=self.background_color, highlightbackground=self.foreground_color, highlightthickness=1, height=self.cell_size*self.rows+1, width=self.cell_size*self.columns+1)
-            self.board_frame.grid(row=0, column=1, sticky="nsew")
-            self.initial_board = Array2D(self.rows, self.columns, False)
+            if self.history_bytes > 0:
+                self.world.history = History(self.history_bytes)
+                self.world.history.record(self.world.generation, self.world.current_board.to_numpy(), self.world.origin)
+            else:
+                # nothing to rewind to, so the world records no boards and the rewind controls are hidden
+                self.world.history = None
+                self.history_frame.grid_remove()
+            self.initial_board = self.world.initial_board
+            self.current_board = self.world.current_board
+            self.generation = self.world.generation
+            self.origin = self.world.origin
+            self.ages = self.world.ages
+            self.start_worker()
+            # the canvas is made once the controls are shown, and drawn on once made
+            self.canvas_job = self.root.after_idle(make_canvas)
 
-        if filepath is None:
-            make_board()
-            
-            for row in range(self.rows):
-                for column in range(self.columns):
-                    self.initial_board[row][column] = random.choice((True, False))
+        def make_canvas():
+            self.canvas_job = None
+            # the canvas is at most the size of the screen and scrolls over the rest of the board
+            view_width = min(self.cell_size*self.columns+1, self.root.winfo_screenwidth() - 300)
+            view_height = min(self.cell_size*self.rows+1, self.root.winfo_screenheight() - 150)
+
+            self.board_view = tk.Frame(self.frame, bg=self.background_color)
+            self.board_view.grid(row=0, column=1, sticky="nsew")
+            self.board_view.grid_rowconfigure(0, weight=1)
+            self.board_view.grid_columnconfigure(0, weight=1)
+            self.frame.grid_rowconfigure(0, weight=1)
+            self.frame.grid_columnconfigure(1, weight=1)
+
+            self.board_frame = tk.Canvas(self.board_view, bg=self.background_color, highlightbackground=self.foreground_color, highlightthickness=1, height=view_height, width=view_width)
+            self.board_frame.grid(row=0, column=0, sticky="nsew")
+            x_scrollbar = ttk.Scrollbar(self.board_view, orient="horizontal", command=self.board_frame.xview)
+            x_scrollbar.grid(row=1, column=0, sticky="ew")
+            y_scrollbar = ttk.Scrollbar(self.board_view, orient="vertical", command=self.board_frame.yview)
+            y_scrollbar.grid(row=0, column=1, sticky="ns")
+
+            def x_view_changed(first, last):
+                x_scrollbar.set(first, last)
+                self.request_draw()
+
+            def y_view_changed(first, last):
+                y_scrollbar.set(first, last)
+                self.request_draw()
+
+            self.board_frame.config(xscrollcommand=x_view_changed, yscrollcommand=y_view_changed)
+            self.board_frame.bind("<Configure>", self.request_draw)
+            self.board_frame.bind("<ButtonPress-1>", lambda event: self.board_frame.scan_mark(event.x, event.y))
+            self.board_frame.bind("<B1-Motion>", lambda event: self.board_frame.scan_dragto(event.x, event.y, gain=1))
+            self.board_frame.bind("<MouseWheel>", self.scroll_action)
+            self.board_frame.bind("<Shift-MouseWheel>", self.scroll_action)
+            self.board_frame.bind("<Control-MouseWheel>", self.zoom_action)
+            self.board_frame.bind("<Button-4>", self.scroll_action)
+            self.board_frame.bind("<Button-5>", self.scroll_action)
+            self.board_frame.bind("<Shift-Button-4>", self.scroll_action)
+            self.board_frame.bind("<Shift-Button-5>", self.scroll_action)
+            self.board_frame.bind("<Control-Button-4>", self.zoom_action)
+            self.board_frame.bind("<Control-Button-5>", self.zoom_action)
+            self.update_scroll_region()
+            self.draw_board()
 
-            self.current_board = copy.deepcopy(self.initial_board)
+        if world is not None:
+            self.world = world
+            self.cell_size = self.world.cell_size
+            self.rows = self.world.rows
+            self.columns = self.world.columns
+            make_board()
+        elif filepath is None:
+            self.world = World.random(self.rows, self.columns, self.cell_size)
+            make_board()
         elif filepath != "":
             try:
-                with open(filepath) as world:
-                    self.cell_size = int(world.readline().rstrip()[5:])
-                    self.rows = int(world.readline().rstrip()[5:])
-                    self.columns = int(world.readline().rstrip()[5:])
-
-                    make_board()
-
-                    for row in range(self.rows):
-                        line = world.readline().rstrip()
-                        assert len(line) == self.columns
-                        for column in range(self.columns):
-                            if line[column] == "X":
-                                self.initial_board[row][column] = True
-                    
-                    self.current_board = copy.deepcopy(self.initial_board)
+                self.world = World.from_file(filepath)
+                self.cell_size = self.world.cell_size
+                self.rows = self.world.rows
+                self.columns = self.world.columns
+                make_board()
             except:
                 self.end_simulation("File Is Incompatible")
                 self.center_window()
@@ -134,6 +287,7 @@ class Simulator:
             Returns:
                 None
         """
+        self.root.update_idletasks()
         window_x = self.root.winfo_screenwidth() // 2 - self.root.winfo_width() // 2
         window_y = self.root.winfo_screenheight() // 2 - self.root.winfo_height() // 2
         self.root.geometry(f"+{window_x}+{window_y}")
@@ -149,20 +303,92 @@ class Simulator:
         elif self.moving is True:
             self.control_button.config(text="Paused")
             self.moving = False
+            self.cancel_frame()
         else:
             self.moving = True
             self.control_button.config(text="Playing")
+            self.frame_deadline = time.perf_counter()
+            self.rate_mark = None
             self.next_frame()
-        self.root.update()
 
     def update_speed(self, speed):
-        """ Action for change in speed slider.
+        """ Action for change in speed slider. A frame that is already
+            scheduled is moved to match the new speed.
 
             Returns:
                 None
         """
         self.speed = float(speed) ** 3
-        self.root.update_idletasks()
+        if self.frame_job is not None:
+            self.schedule_frame(self.frame_deadline - self.period + self.frame_period())
+
+    def adaptive_action(self):
+        """ Action for the adaptive checkbox, which switches between
+            drawing every generation and drawing several generations
+            per frame (see frame_period). A frame that is already
+            scheduled is moved to match.
+
+            Returns:
+                None
+        """
+        self.rate_mark = None
+        if self.frame_job is not None:
+            self.schedule_frame(self.frame_deadline - self.period + self.frame_period())
+
+    def frame_period(self) -> float:
+        """ Works out the seconds between frames and sets how many
+            generations the worker puts in each.
+
+            Normally every generation is drawn, the speed apart. In
+            adaptive mode frames are drawn up to TARGET_FPS times a
+            second, or as often as drawing leaves half of the time to
+            the rest of the window, and each shows as many generations
+            as the speed (or the worker, if it is slower) gets through
+            in that time, so the renderer does not hold back the engine.
+
+            Returns:
+                period (float): the seconds between frames.
+        """
+        if self.adaptive.get() is False or self.manual is True or self.worker is None:
+            self.set_stride(1)
+            return self.speed
+        interval = max(1 / self.TARGET_FPS, 2 * self.draw_cost)
+        generation_time = max(self.speed, self.worker.step_cost)
+        stride = max(1, round(interval / generation_time))
+        self.set_stride(stride)
+        return stride * generation_time
+
+    def set_stride(self, stride:int):
+        """ Sets how many generations the worker puts in each frame.
+            Frames already computed ahead at another stride are dropped
+            by restarting the worker from the generation on screen, so
+            the next frame is exactly stride generations on, like one
+            generation after switching to manual.
+
+            Args:
+                stride (int): the generations per frame.
+            Returns:
+                None
+        """
+        if self.worker is not None and self.worker.stride != stride:
+            step_cost = self.worker.step_cost
+            self.stop_worker()
+            self.start_worker(stride)
+            self.worker.step_cost = step_cost
+
+    def measure_rate(self):
+        """ Updates the moving averages of the generations and frames
+            shown per second, from the time since the last frame.
+
+            Returns:
+                None
+        """
+        now = time.perf_counter()
+        if self.rate_mark is not None and now > self.rate_mark[0]:
+            elapsed = now - self.rate_mark[0]
+            self.generation_rate += ((self.generation - self.rate_mark[1]) / elapsed - self.generation_rate) * .2
+            self.frame_rate += (1 / elapsed - self.frame_rate) * .2
+        self.rate_mark = (now, self.generation)
 
     def manual_action(self):
         """ Action for manual/automatic button press.
@@ -181,92 +407,414 @@ class Simulator:
             self.manual_button.config(text="Manual")
             self.control_button.config(text="Next")
             self.manual = True
+            self.cancel_frame()
         if self.manual is False and self.moving is True:
+            self.frame_deadline = time.perf_counter()
+            self.rate_mark = None
             self.next_frame()
-        self.root.update()
 
     def draw_board(self):
-        """ Draws live cells onto the board canvas.
+        """ Draws the live cells that are inside the visible part of
+            the board canvas. The canvas is repainted once control
+            returns to the event loop.
+
+            When cells are too small or too many to draw one by one,
+            the visible cells are drawn as a density image instead.
             
             returns:
                 None
         """
+        if self.draw_job is not None:
+            self.root.after_cancel(self.draw_job)
+            self.draw_job = None
+        if self.board_frame is None: # not made yet
+            return
         try:
             self.board_frame.delete("all")
         except: # if window has been closed
             self.moving = False
             return
+
+        first_row, last_row, first_column, last_column = self.visible_region()
+        if self.block_size > 1 or self.cell_size < self.MIN_DRAWN_CELL_SIZE or (last_row - first_row) * (last_column - first_column) > self.MAX_DRAWN_CELLS:
+            self.draw_density(first_row, last_row, first_column, last_column)
+            return
         
-        for row in range(self.rows):
-            for column in range(self.columns):
+        colors = None
+        if self.ages is not None:
+            colors = [f"#{red:02x}{green:02x}{blue:02x}" for red, green, blue in self.make_age_palette()]
+        for row in range(first_row, last_row):
+            for column in range(first_column, last_column):
                 if self.current_board[row][column] == True:
-                    self.board_frame.create_rectangle(self.cell_size*column+1, self.cell_size*row+1, self.cell_size*(column+1)+1, self.cell_size*(row+1)+1, fill=self.foreground_color, outline=self.background_color)
-        self.root.update()
+                    fill = self.foreground_color if colors is None else colors[self.ages[row, column]]
+                    self.board_frame.create_rectangle(self.cell_size*column+1, self.cell_size*row+1, self.cell_size*(column+1)+1, self.cell_size*(row+1)+1, fill=fill, outline=self.background_color)
+
+    def draw_density(self, first_row:int, last_row:int, first_column:int, last_column:int):
+        """ Draws part of the board as an image with one square of
+            cell_size pixels per block_size x block_size block of
+            cells, shaded by how many cells in the block are alive.
+            The work done is bounded by the pixels in view rather
+            than the cells in view. When colored by age, each block
+            is colored by the age of its oldest cell instead.
+
+            Args:
+                first_row (int): the first row drawn, a multiple of block_size.
+                last_row (int): the row after the last row drawn.
+                first_column (int): the first column drawn, a multiple of block_size.
+                last_column (int): the column after the last column drawn.
+            Returns:
+                None
+        """
+        if last_row <= first_row or last_column <= first_column:
+            return
+        block = self.block_size
+        if self.ages is not None:
+            # colored by age, each block showing its oldest cell
+            region = self.ages[first_row:last_row, first_column:last_column]
+            palette = self.make_age_palette()
+        else:
+            region = self.current_board.to_numpy()[first_row:last_row, first_column:last_column]
+            palette = self.density_palette()
+        if block > 1:
+            # pad the region out to whole blocks and count the live cells (or find the oldest) in each
+            height = -(-region.shape[0] // block) * block
+            width = -(-region.shape[1] // block) * block
+            padded = np.zeros((height, width), dtype=np.uint32)
+            padded[:region.shape[0], :region.shape[1]] = region
+            blocks = padded.reshape(height // block, block, width // block, block)
+            if self.ages is not None:
+                levels = blocks.max(axis=(1, 3))
+            else:
+                levels = blocks.sum(axis=(1, 3)) * 255 // (block * block)
+        elif self.ages is not None:
+            levels = region
+        else:
+            levels = region.astype(np.uint8) * 255
+
+        pixels = palette[levels]
+        if self.cell_size > 1:
+            pixels = pixels.repeat(self.cell_size, axis=0).repeat(self.cell_size, axis=1)
+        header = f"P6 {pixels.shape[1]} {pixels.shape[0]} 255 ".encode()
+        self.board_image = tk.PhotoImage(data=header + pixels.tobytes(), format="PPM")
+        self.board_frame.create_image(first_column // block * self.cell_size + 1, first_row // block * self.cell_size + 1, image=self.board_image, anchor="nw")
+
+    def density_palette(self) -> np.ndarray:
+        """ Makes the colors for density levels 0 to 255, blending from
+            the background color to the foreground color.
+
+            Returns:
+                palette (np.ndarray): a 256 x 3 array of RGB colors.
+        """
+        background = np.array(self.root.winfo_rgb(self.background_color)) // 256
+        foreground = np.array(self.root.winfo_rgb(self.foreground_color)) // 256
+        weights = np.arange(256).reshape(256, 1) / 255
+        return (background + (foreground - background) * weights).astype(np.uint8)
+
+    def make_age_palette(self) -> np.ndarray:
+        """ Makes the colors for cell ages 0 to 255, the background for
+            dead cells and a blend of AGE_COLORS for live cells, which
+            stops changing at OLD_AGE. Made once and kept.
+
+            Returns:
+                palette (np.ndarray): a 256 x 3 array of RGB colors.
+        """
+        if self.age_palette is None:
+            young = np.array(self.root.winfo_rgb(self.AGE_COLORS[0])) // 256
+            old = np.array(self.root.winfo_rgb(self.AGE_COLORS[1])) // 256
+            weights = (np.minimum(np.arange(256), self.OLD_AGE) - 1).clip(0).reshape(256, 1) / (self.OLD_AGE - 1)
+            palette = (young + (old - young) * weights).astype(np.uint8)
+            palette[0] = np.array(self.root.winfo_rgb(self.background_color)) // 256
+            self.age_palette = palette
+        return self.age_palette
+
+    def age_action(self):
+        """ Action for the color by age checkbox. The world starts (or
+            stops) keeping cell ages, with the cells alive now counted
+            as just born.
+
+            Returns:
+                None
+        """
+        if self.world is None:
+            return
+        stepping = self.worker is not None
+        self.stop_worker()
+        self.world.track_ages(self.age_colored.get())
+        self.ages = self.world.ages
+        if stepping is True:
+            self.start_worker()
+        self.draw_board()
+
+    def visible_region(self) -> tuple[int, int, int, int]:
+        """ Finds the cells inside the visible part of the board canvas.
+            While zoomed out past one cell per pixel, the region is
+            widened to whole blocks.
+
+            Returns:
+                region (tuple[int, int, int, int]): the first row, the row after
+                the last, the first column and the column after the last.
+        """
+        block = self.block_size
+        left = self.board_frame.canvasx(0)
+        top = self.board_frame.canvasy(0)
+        first_row = max(0, int(top // self.cell_size) * block)
+        last_row = min(self.rows, (int((top + self.board_frame.winfo_height()) // self.cell_size) + 1) * block)
+        first_column = max(0, int(left // self.cell_size) * block)
+        last_column = min(self.columns, (int((left + self.board_frame.winfo_width()) // self.cell_size) + 1) * block)
+        return first_row, last_row, first_column, last_column
+
+    def draw_statistics(self):
+        """ Shows the counts of the generation on screen and the memory
+            the simulation holds and, if turned on, graphs the population
+            of recent generations. The counts come from the world's
+            statistics, so nothing is recounted.
+
+            Returns:
+                None
+        """
+        if self.world is None:
+            return
+        records = self.world.statistics.records(until=self.generation)
+        if not records:
+            return
+        latest = records[-1]
+        text = f"Generation {latest['generation']}\nPopulation {latest['population']}\nBirths {latest['births']}   Deaths {latest['deaths']}"
+        if self.moving is True and self.rate_mark is not None:
+            text += f"\n{self.generation_rate:.0f} gen/s at {self.frame_rate:.0f} fps"
+        holdings = self.memory_holdings()
+        rewind = holdings.get("history", 0) + holdings.get("histories", 0)
+        text += (f"\nMemory {MemoryProfiler.format_bytes(holdings['total'])}"
+                 f"\nRewind {MemoryProfiler.format_bytes(rewind)}   Library {MemoryProfiler.format_bytes(holdings.get('library', 0))}")
+        self.stats_label.config(text=text)
+
+        if self.graph_visible.get() is False:
+            self.graph.pack_forget()
+            return
+        self.graph.pack(pady=(5,0))
+        self.graph.delete("all")
+        width = int(self.graph.cget("width"))
+        height = int(self.graph.cget("height"))
+        populations = [record["population"] for record in records[-width:]]
+        highest = max(max(populations), 1)
+        points = []
+        for index, population in enumerate(populations):
+            points.extend((index + 1, height - population * (height - 4) / highest))
+        if len(points) >= 4:
+            self.graph.create_line(*points, fill=self.foreground_color)
+        self.graph.create_text(4, 2, anchor="nw", text=str(highest), fill=self.foreground_color, font=("Helvetica", 7))
+
+    def memory_holdings(self) -> dict[str, int]:
+        """ Counts the bytes held by the world, the pattern library of the
+            window and the rewind histories of the other tabs, which all
+            share the memory of one process.
+
+            Returns:
+                holdings (dict[str, int]): the holdings (see MemoryProfiler.holdings).
+        """
+        histories = [simulation.world.history for simulation in self.workspace.simulators
+                     if simulation is not self and simulation.world is not None]
+        return MemoryProfiler.holdings(self.world, self.workspace.library, histories)
+
+    def draw_history(self):
+        """ Moves the rewind slider to the generation on screen, over
+            the range of generations kept.
+
+            Returns:
+                None
+        """
+        if self.history_scale is None or self.world is None or self.world.history is None:
+            return
+        span = self.world.history.span
+        if span is not None:
+            self.history_scale.config(from_=span[0], to=max(span[1], self.generation))
+        self.history_scale.set(self.generation)
+
+    def request_draw(self, event:object=None):
+        """ Redraws the board once pending events are handled, for when
+            the visible part of the board changes. Several requests
+            before then lead to a single redraw.
+
+            Args:
+                event: the event which called the function.
+            Returns:
+                None
+        """
+        if self.draw_job is None:
+            self.draw_job = self.root.after_idle(self.draw_board)
+
+    def update_scroll_region(self):
+        """ Sets the scrollable area of the board canvas to the size
+            of the whole board at the current cell and block size.
+
+            Returns:
+                None
+        """
+        width = -(-self.columns // self.block_size) * self.cell_size + 1
+        height = -(-self.rows // self.block_size) * self.cell_size + 1
+        self.board_frame.config(scrollregion=(0, 0, width, height))
+
+    def scroll_action(self, event):
+        """ Action for mouse wheel over the board, panning vertically,
+            or horizontally while shift is held.
+
+            Args:
+                event: the mouse wheel event.
+            Returns:
+                None
+        """
+        if event.num == 4 or event.delta > 0:
+            units = -3
+        else:
+            units = 3
+        if event.state & 0x0001: # shift
+            self.board_frame.xview_scroll(units, "units")
+        else:
+            self.board_frame.yview_scroll(units, "units")
+
+    def zoom_action(self, event):
+        """ Action for control and mouse wheel over the board, zooming
+            in or out while keeping the cell under the mouse in place.
+
+            Past one pixel per cell, zooming out doubles the size of
+            the blocks of cells that share a pixel instead.
+
+            Args:
+                event: the mouse wheel event.
+            Returns:
+                None
+        """
+        cell_size = self.cell_size
+        block_size = self.block_size
+        if event.num == 4 or event.delta > 0:
+            if block_size > 1:
+                block_size //= 2
+            else:
+                cell_size = min(50, max(cell_size + 1, round(cell_size * 1.25)))
+        else:
+            if cell_size > 1:
+                cell_size = max(1, min(cell_size - 1, round(cell_size / 1.25)))
+            elif block_size < max(self.rows, self.columns):
+                block_size *= 2
+        if cell_size == self.cell_size and block_size == self.block_size:
+            return
+
+        board_x = self.board_frame.canvasx(event.x) * self.block_size / self.cell_size
+        board_y = self.board_frame.canvasy(event.y) * self.block_size / self.cell_size
+        self.cell_size = cell_size
+        self.block_size = block_size
+        self.update_scroll_region()
+        scale = cell_size / block_size
+        self.board_frame.xview_moveto((board_x * scale - event.x) / (self.columns * scale + 1))
+        self.board_frame.yview_moveto((board_y * scale - event.y) / (self.rows * scale + 1))
+        self.request_draw()
+
+    def follow_growth(self, origin:tuple[int, int]):
+        """ Fits the board canvas to a current board that has grown (or
+            shrunk back when rewound), scrolling by the rows and columns
+            added above and to the left so the same cells stay in view.
+
+            Args:
+                origin (tuple[int, int]): the world's origin at the current board.
+            Returns:
+                None
+        """
+        rows, columns = self.current_board.dimensions
+        if (rows, columns) == (self.rows, self.columns) and origin == self.origin:
+            return
+        shift_rows = origin[0] - self.origin[0]
+        shift_columns = origin[1] - self.origin[1]
+        self.rows = rows
+        self.columns = columns
+        self.origin = origin
+        if self.board_frame is None: # not made yet, it is made at the new size
+            return
+
+        scale = self.cell_size / self.block_size
+        left = self.board_frame.canvasx(0) + shift_columns * scale
+        top = self.board_frame.canvasy(0) + shift_rows * scale
+        self.update_scroll_region()
+        self.board_frame.xview_moveto(left / (self.columns * scale + 1))
+        self.board_frame.yview_moveto(top / (self.rows * scale + 1))
 
-    def update_board(self):
-        """ Calculates the next generation of cells and replaces
-            the current generation with this.
+    def update_board(self, count:int=1) -> bool:
+        """ Replaces the current generation of cells with the next one
+            computed by the worker. When more than one generation is
+            due, the generations in between are skipped.
 
             If there is no change from one generation to the
             next, the simulation will end.
 
+            Args:
+                count (int): the number of generations to move forward.
             Returns:
-                None
+                updated (bool): False if the worker had no generation ready.
         """
-        changes_made = False
-        self.new_board = Array2D(self.rows, self.columns, False)
-        for row in range(self.rows):
-            for column in range(self.columns):
-                count = self.count_nearby_active_cells(row, column)
-                if self.current_board[row][column] == False:
-                    if count == 3:
-                        self.new_board[row][column] = True
-                        changes_made = True
-                    else:
-                        self.new_board[row][column] = False
-                else:
-                    if count < 2 or count > 3:
-                        self.new_board[row][column] = False
-                        changes_made = True
-                    else:
-                        self.new_board[row][column] = True
-        self.current_board = self.new_board
+        frame = self.worker.take(count, wait=self.manual)
+        if frame is None:
+            return False
+        self.generation, self.current_board, changes_made, origin, self.ages = frame
+        self.follow_growth(origin)
         if changes_made is False:
             self.end_simulation()
+        return True
 
     def next_frame(self):
         """ Updates and draws board. Action will perform once if 
-            in manual mode and continuously at a specified speed
-            while in automatic mode if moving is true. 
+            in manual mode and, while in automatic mode if moving
+            is true, schedules itself again at a specified speed.
 
             Returns:
                 None
         """
-        self.update_board()
+        self.frame_job = None
+        count = 1
+        self.period = self.frame_period()
+        if self.manual is False:
+            # frames whose deadlines have already passed are dropped rather than drawn late
+            lateness = time.perf_counter() - self.frame_deadline
+            if self.period > 0 and lateness > self.period:
+                skipped = int(lateness / self.period)
+                count += skipped
+                self.frame_deadline += skipped * self.period
+        if self.update_board(count) is False:
+            if self.manual is False and self.moving is True:
+                self.frame_job = self.root.after(1, self.next_frame)
+            return
+        if self.manual is False and self.moving is True:
+            self.measure_rate()
+        start = time.perf_counter()
         self.draw_board()
-        while self.manual is False and self.moving is True:
-            self.root.update_idletasks()
-            time.sleep(self.speed)
-            self.update_board()
-            self.draw_board()
+        self.draw_statistics()
+        self.draw_history()
+        self.draw_cost += (time.perf_counter() - start - self.draw_cost) * .2
+        if self.manual is False and self.moving is True:
+            self.schedule_frame(self.frame_deadline + self.period)
+
+    def schedule_frame(self, deadline:float):
+        """ Schedules the next frame on the event loop for a deadline,
+            so the time spent updating and drawing counts towards the
+            wait. A frame that is already late runs as soon as the
+            window has handled its pending events.
 
-    def count_nearby_active_cells(self, row, column):
-        """ Counts a cell's neighbors given the cell's coordinates.
-            
             Args:
-                row (int): The cell's row number.
-                column (int): The cell's column number.
+                deadline (float): the time.perf_counter() time the frame is due.
             Returns:
-                count (int): the number of neighbors.
+                None
         """
-        count = 0
-        for test_row in range(-1,2):
-            if test_row + row >= 0 and test_row + row < self.rows:
-                for test_column in range(-1,2):
-                    if (test_column + column >= 0 and test_column + column < self.columns) and (test_column != 0 or test_row != 0):
-                        if self.current_board[test_row + row][test_column + column]:
-                            count += 1
-        return count
+        self.cancel_frame()
+        self.frame_deadline = deadline
+        delay = max(0, round((deadline - time.perf_counter()) * 1000))
+        self.frame_job = self.root.after(delay, self.next_frame)
+
+    def cancel_frame(self):
+        """ Cancels the scheduled frame, if there is one.
+
+            Returns:
+                None
+        """
+        if self.frame_job is not None:
+            self.root.after_cancel(self.frame_job)
+            self.frame_job = None
 
     def end_simulation(self, error=None):
         """ Ends the simulation, removing the simulation
@@ -282,15 +830,32 @@ class Simulator:
         """
         # removing simulation panel
         self.moving = False
+        self.cancel_frame()
+        self.stop_worker()
+        if self.jump_target is not None:
+            # ending in the middle of a fast-forward keeps the generation reached
+            self.root.after_cancel(self.jump_job)
+            self.jump_target = None
+            self.current_board = self.world.current_board
+            self.generation = self.world.generation
+            self.ages = self.world.ages
+            self.follow_growth(self.world.origin)
+            self.draw_board()
+            self.draw_statistics()
+            self.draw_history()
         self.control_frame.destroy()
         self.slider_frame.destroy()
         self.manual_frame.destroy()
         self.end_frame.destroy()
+        self.jump_frame.destroy()
+        self.history_frame.destroy()
+        self.history_scale = None
         
         # adding options for how to proceed
         quit_frame = tk.Frame(self.console, highlightbackground=self.foreground_color, highlightthickness=1)
         quit_frame.grid(row=0, padx=10, pady=(20,10))
-        quit_button = tk.Button(quit_frame, text="Quit Window", command=self.quit_window, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 11), width=15, borderwidth=0)
+        quit_text = "Close Tab" if len(self.workspace.simulators) > 1 else "Quit Window"
+        quit_button = tk.Button(quit_frame, text=quit_text, command=self.quit_window, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 11), width=15, borderwidth=0)
         quit_button.pack()
 
         reconf_frame = tk.Frame(self.console, highlightbackground=self.foreground_color, highlightthickness=1)
@@ -314,24 +879,207 @@ class Simulator:
             error_message = tk.Label(error_frame, text=error, bg=self.background_color, fg=self.foreground_color, font=("Helvetica", 9), width=15, borderwidth=0)
             error_message.pack()
 
+    def start_worker(self, stride:int=1):
+        """ Starts a worker computing generations ahead of the one
+            on screen.
+
+            Args:
+                stride (int): the generations per frame (see set_stride).
+            Returns:
+                None
+        """
+        if self.ages is not None:
+            # the ages on screen may be the world's own, which the worker changes as it steps
+            self.ages = self.ages.copy()
+        self.worker = StepWorker(self.world, checkpointer=self.checkpointer, pool=self.workspace.pool, stride=stride)
+
+    def stop_worker(self):
+        """ Stops the worker and rewinds the world to the generation
+            on screen, dropping generations computed ahead.
+
+            Returns:
+                None
+        """
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+            self.world.restore(self.current_board, self.generation, self.origin, self.ages)
+
+    def jump_action(self, relative:bool):
+        """ Action for advance and go to button press. Pauses the
+            simulation and fast-forwards to a generation without
+            drawing the generations in between. Pressing either
+            button while fast-forwarding cancels it.
+
+            Args:
+                relative (bool): True to advance by the entered number of
+                generations, False to go to the entered generation.
+            Returns:
+                None
+        """
+        if self.jump_target is not None:
+            self.jump_cancelled = True
+            return
+        if self.jump_text.get() == "" or self.world is None:
+            return
+        if relative is True:
+            target = self.generation + int(self.jump_text.get())
+        else:
+            target = int(self.jump_text.get())
+        if target <= self.generation:
+            self.jump_label.config(text=f"Already at generation {self.generation}")
+            return
+
+        if self.moving is True:
+            self.control_button.config(text="Paused")
+            self.moving = False
+            self.cancel_frame()
+        self.stop_worker()
+        self.jump_start = self.generation
+        self.jump_target = target
+        self.jump_cancelled = False
+        self.control_button.config(state=tk.DISABLED)
+        self.manual_button.config(state=tk.DISABLED)
+        self.goto_button.config(state=tk.DISABLED)
+        self.previous_button.config(state=tk.DISABLED)
+        self.history_scale.config(state=tk.DISABLED)
+        self.advance_button.config(text="Cancel")
+        self.jump_step()
+
+    def jump_step(self):
+        """ Steps the world towards the fast-forward target for a short
+            slice of time, then yields to the event loop so the window
+            stays responsive, until the target is reached, the world
+            stops changing or the fast-forward is cancelled.
+
+            Returns:
+                None
+        """
+        stable = False
+        slice_end = time.perf_counter() + .05
+        while self.world.generation < self.jump_target and self.jump_cancelled is False and time.perf_counter() < slice_end:
+            if self.world.step() is False:
+                stable = True
+                break
+            if self.checkpointer is not None:
+                self.checkpointer.update(self.world)
+
+        done = self.world.generation - self.jump_start
+        total = self.jump_target - self.jump_start
+        self.jump_label.config(text=f"Generation {self.world.generation} of {self.jump_target} ({done / total:.0%})")
+        if self.world.generation < self.jump_target and self.jump_cancelled is False and stable is False:
+            self.jump_job = self.root.after(1, self.jump_step)
+            return
+
+        # only the generation reached is drawn
+        self.jump_target = None
+        self.current_board = self.world.current_board
+        self.generation = self.world.generation
+        self.ages = self.world.ages
+        self.follow_growth(self.world.origin)
+        self.control_button.config(state=tk.NORMAL)
+        self.manual_button.config(state=tk.NORMAL)
+        self.goto_button.config(state=tk.NORMAL)
+        self.previous_button.config(state=tk.NORMAL)
+        self.history_scale.config(state=tk.NORMAL)
+        self.advance_button.config(text="Advance")
+        self.draw_board()
+        self.draw_statistics()
+        self.draw_history()
+        if stable is True:
+            self.end_simulation()
+        else:
+            self.start_worker()
+
+    def close(self):
+        """ Stops the simulation and every job it has scheduled, for
+            when its tab or window is closed.
+
+            Returns:
+                None
+        """
+        self.moving = False
+        self.cancel_frame()
+        if self.draw_job is not None:
+            self.root.after_cancel(self.draw_job)
+            self.draw_job = None
+        if self.canvas_job is not None:
+            self.root.after_cancel(self.canvas_job)
+            self.canvas_job = None
+        if self.jump_target is not None:
+            self.root.after_cancel(self.jump_job)
+            self.jump_target = None
+        self.stop_worker()
+
+    def previous_action(self):
+        """ Action for previous button press. Pauses the simulation
+            and goes back one generation.
+
+            Returns:
+                None
+        """
+        self.show_generation(self.generation - 1)
+
+    def scrub_action(self, event:object=None):
+        """ Action for dragging the rewind slider. Pauses the simulation
+            and goes to the generation the slider is at.
+
+            Args:
+                event: the mouse event which called the function.
+            Returns:
+                None
+        """
+        self.show_generation(int(self.history_scale.get()))
+
+    def show_generation(self, generation:int):
+        """ Goes to a generation kept in the world's history without
+            computing it again. The simulation carries on from there
+            when played.
+
+            Args:
+                generation (int): the generation to go to.
+            Returns:
+                None
+        """
+        if self.world is None or self.world.history is None or self.jump_target is not None or generation == self.generation:
+            return
+        snapshot = self.world.history.get(generation)
+        if snapshot is None:
+            return
+        board, origin = snapshot
+        if self.moving is True:
+            self.control_button.config(text="Paused")
+            self.moving = False
+            self.cancel_frame()
+        self.stop_worker()
+        self.world.restore(Array2D.from_numpy(board), generation, origin)
+        self.current_board = self.world.current_board
+        self.generation = generation
+        self.ages = self.world.ages
+        self.follow_growth(origin)
+        self.draw_board()
+        self.draw_statistics()
+        self.draw_history()
+        self.start_worker()
+
     def quit_window(self):
-        """ Exits out of the simulation window, completing 
-            the program.
+        """ Closes the simulation's tab, exiting out of the window
+            and completing the program if it was the last one.
             
             Returns:
                 None
         """
-        self.root.destroy()
+        self.workspace.close_tab(self)
 
     def reconfigure(self):
-        """ Exits out of the simulation window and starts a
-            new configuration window.
+        """ Closes the simulation and shows the configuration
+            options, in the same window rather than a new one.
             
             Returns:
                 None        
         """
-        self.root.destroy()
-        config.Config(cell_size=self.cell_size, rows=self.rows, columns=self.columns)
+        self.workspace.close_tab(self, keep_window=True)
+        self.workspace.new_world(self.cell_size, self.rows, self.columns)
 
     def save_state(self, initial=False):
         """ Saves the state of the world.
@@ -344,21 +1092,9 @@ class Simulator:
             Return:
                 None
         """
-        if initial is False:
-            board = self.current_board
-        else:
-            board = self.initial_board
         filepath = filedialog.asksaveasfilename(initialdir="./worlds", defaultextension=".txt", confirmoverwrite=True)
         if filepath:
-            with open(filepath, 'w') as world:
-                world.write(f"size:{self.cell_size}\nrows:{self.rows}\ncols:{self.columns}\n")
-                for row in range(self.rows):
-                    for column in range(self.columns):
-                        if board[row][column]:
-                            world.write("X")
-                        else:
-                            world.write("-")
-                    world.write("\n")
+            self.world.save(filepath, initial)
 
     def save_initial_world(self):
         """ Calls upon the save_state method with
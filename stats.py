@@ -0,0 +1,137 @@
+""" File: stats.py
+
+    This module holds the Statistics class.
+"""
+import sys
+import threading
+from collections import deque
+
+class Statistics:
+    """ This class keeps per-generation counts of a world (population,
+        births, deaths and the bounding box of live cells) for the most
+        recent generations, dropping the oldest once full.
+
+        Records are dictionaries with the keys in Statistics.FIELDS. The
+        bounding box is (top, left, bottom, right), inclusive, or None
+        when no cells are alive. Records may be added from a worker
+        thread while the window reads them.
+    """
+    FIELDS = ("generation", "population", "births", "deaths", "bbox")
+
+    def __init__(self, capacity:int=1000) -> None:
+        """ Initializes an instance of the Statistics.
+
+            Args:
+                capacity (int): the number of generations kept.
+            Returns:
+                None
+        """
+        self.capacity = capacity
+        self.history = deque(maxlen=capacity)
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """ Gets the state copied or pickled with a world, without the lock.
+
+            Returns:
+                state (dict): the capacity and the records.
+        """
+        with self.lock:
+            return {"capacity": self.capacity, "history": deque(self.history, maxlen=self.capacity)}
+
+    def __setstate__(self, state:dict) -> None:
+        """ Restores a copied or unpickled state with a new lock of its own.
+
+            Args:
+                state (dict): the state from __getstate__.
+            Returns:
+                None
+        """
+        self.capacity = state["capacity"]
+        self.history = state["history"]
+        self.lock = threading.Lock()
+
+    def record(self, generation:int, population:int, births:int, deaths:int, bbox:tuple[int, int, int, int]|None) -> None:
+        """ Adds the counts of a generation.
+
+            Args:
+                generation (int): the generation number.
+                population (int): the number of live cells.
+                births (int): the number of cells that came to life.
+                deaths (int): the number of cells that died.
+                bbox (tuple[int, int, int, int]|None): the bounding box of live cells.
+            Returns:
+                None
+        """
+        with self.lock:
+            self.history.append({"generation": generation, "population": population, "births": births, "deaths": deaths, "bbox": bbox})
+
+    @property
+    def nbytes(self) -> int:
+        """ Property for getting the bytes of memory the kept records take.
+
+            Returns:
+                nbytes (int): the bytes of the records and their bounding boxes.
+        """
+        with self.lock:
+            return sys.getsizeof(self.history) + sum(sys.getsizeof(record) + sys.getsizeof(record["bbox"]) for record in self.history)
+
+    @property
+    def latest(self) -> dict|None:
+        """ Property for getting the most recent record.
+
+            Returns:
+                record (dict|None): the latest record, or None if there are none.
+        """
+        with self.lock:
+            if self.history:
+                return self.history[-1]
+            return None
+
+    def records(self, until:int|None=None) -> list[dict]:
+        """ Copies the kept records, oldest first.
+
+            Args:
+                until (int|None): the last generation to include, all if None.
+            Returns:
+                records (list[dict]): the records.
+        """
+        with self.lock:
+            records = list(self.history)
+        if until is not None:
+            while records and records[-1]["generation"] > until:
+                records.pop()
+        return records
+
+    def series(self, field:str, until:int|None=None) -> list:
+        """ Copies one field of the kept records, oldest first.
+
+            Args:
+                field (str): one of Statistics.FIELDS.
+                until (int|None): the last generation to include, all if None.
+            Returns:
+                values (list): the field of each record.
+        """
+        return [record[field] for record in self.records(until)]
+
+    def truncate(self, generation:int) -> None:
+        """ Removes the records of generations after a generation, for
+            when a world is rewound.
+
+            Args:
+                generation (int): the last generation kept.
+            Returns:
+                None
+        """
+        with self.lock:
+            while self.history and self.history[-1]["generation"] > generation:
+                self.history.pop()
+
+    def clear(self) -> None:
+        """ Removes every record.
+
+            Returns:
+                None
+        """
+        with self.lock:
+            self.history.clear()
@@ -0,0 +1,295 @@
+""" File: sweep.py
+
+    This module runs many worlds without a window, spread over a pool of
+    processes, and records how each run turned out.
+
+    Each run steps a world until it settles into a still or repeating
+    state (or reaches a generation cap) and writes one result line with
+    its lifetime, final population, period, peak population and wall
+    time. Results are written as each run finishes, and runs already in
+    the output file are skipped, so an interrupted sweep can be started
+    again with the same command to finish it.
+
+    To run 1000 random 64x64 soups at two densities, type:
+    >>> python -m sweep --seeds 0-999 --densities 0.3,0.5 --sizes 64x64 --output soups.jsonl
+
+    To run every preset, type:
+    >>> python -m sweep --worlds worlds/*.txt --output presets.csv
+"""
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+import numpy as np
+from census import Census
+from memory import MemoryProfiler
+from world import World
+
+FIELDS = ["run", "file", "seed", "density", "rows", "columns", "rule", "edge", "stable", "lifetime", "period",
+          "final_population", "peak_population", "wall_time", "census",
+          "peak_memory", "steady_memory", "allocated_per_generation"]
+# the number of recent boards kept to confirm a repeat found by its digest
+RECENT_BOARDS = 64
+
+def board_state(world:World) -> tuple[bytes, bytes]:
+    """ Packs the board of a world and hashes it, so earlier states can be
+        remembered by a short digest instead of a copy of the board.
+
+        Args:
+            world (World): the world.
+        Returns:
+            digest (bytes): a 16 byte digest of the board and its size.
+            packed (bytes): the board packed to one bit per cell, with its size.
+    """
+    cells = world.current_board.to_numpy()
+    packed = np.array(cells.shape, dtype=np.uint32).tobytes() + np.packbits(cells).tobytes()
+    return hashlib.blake2b(packed, digest_size=16).digest(), packed
+
+def make_runs(seeds:list[int], densities:list[float], sizes:list[tuple[int, int]], worlds:list[str], rules:list[str]|None=None,
+              edge:str|None=None) -> list[dict]:
+    """ Lists every combination of the sweep's parameters as a run.
+
+        Args:
+            seeds (list[int]): the seeds of random worlds.
+            densities (list[float]): the densities of random worlds.
+            sizes (list[tuple[int, int]]): the rows and columns of random worlds.
+            worlds (list[str]): the filepaths of world files.
+            rules (list[str]|None): the rules every world is run under, or None
+            to run random worlds under B3/S23 and world files under their own rule.
+            edge (str|None): the boundary every world is run with, or None to run
+            random worlds with dead edges and world files with their own.
+        Returns:
+            runs (list[dict]): each run's parameters, with a "run" name unique to them.
+    """
+    runs = []
+    for rule in rules or [None]:
+        suffix = "" if rule is None else f",rule={rule}"
+        if edge is not None:
+            suffix += f",edge={edge}"
+        for filepath in worlds:
+            runs.append({"run": f"file={filepath}{suffix}", "file": filepath, "rule": rule, "edge": edge})
+        for rows, columns in sizes:
+            for density in densities:
+                for seed in seeds:
+                    runs.append({"run": f"seed={seed},density={density},size={rows}x{columns}{suffix}", "seed": seed, "density": density,
+                                 "rows": rows, "columns": columns, "rule": rule, "edge": edge})
+    return runs
+
+def run_one(run:dict, generations:int, census:bool=False, profile_memory:bool=False) -> dict:
+    """ Runs a world until it repeats an earlier state or reaches a
+        generation cap. This is what each process of the pool does.
+
+        Args:
+            run (dict): the run's parameters, from make_runs.
+            generations (int): the generation cap.
+            census (bool): True to count the objects left on the final board.
+            profile_memory (bool): True to trace the memory allocated by each generation.
+        Returns:
+            result (dict): the run's parameters and results. "lifetime" is the
+            generation the repeating state started at (the cap if there was none)
+            and "period" is how many generations it repeats after, 0 if it never did.
+            "census" is the objects left, like "block:3, blinker:2", if counted.
+            "peak_memory" and "steady_memory" are the most and the mean bytes traced,
+            and "allocated_per_generation" the mean bytes allocated by a generation,
+            if profiled.
+    """
+    start = time.perf_counter()
+    if "file" in run:
+        world = World.from_file(run["file"])
+    else:
+        world = World.random(run["rows"], run["columns"], seed=run["seed"], density=run["density"])
+    if run["rule"] is not None:
+        world.set_rule(run["rule"])
+    if run["edge"] is not None:
+        world.set_boundary(run["edge"])
+
+    # the digest of every state seen so far, so a repeat of any earlier state is caught
+    # without keeping every board, and the latest boards to rule out a digest collision
+    digest, packed = board_state(world)
+    seen = {digest: world.generation}
+    recent = deque([(world.generation, packed)], maxlen=RECENT_BOARDS)
+    population = world.statistics.latest["population"]
+    peak_population = population
+    lifetime = generations
+    period = 0
+    profiler = MemoryProfiler() if profile_memory is True else None
+    if profiler is not None:
+        profiler.start()
+    while world.generation < generations:
+        if profiler is None:
+            world.step()
+        else:
+            profiler.step(world)
+        population = world.statistics.latest["population"]
+        peak_population = max(peak_population, population)
+        digest, packed = board_state(world)
+        if digest in seen:
+            earlier = seen[digest]
+            # a 128 bit digest only collides by chance, but a recent board can be checked outright
+            if all(board == packed for generation, board in recent if generation == earlier):
+                lifetime = earlier
+                period = world.generation - earlier
+                break
+        seen[digest] = world.generation
+        recent.append((world.generation, packed))
+    if profiler is not None:
+        profiler.stop()
+
+    result = dict(run)
+    result.update({"rows": world.rows, "columns": world.columns, "rule": world.rule, "edge": world.boundary, "stable": period > 0, "lifetime": lifetime, "period": period,
+                   "final_population": population, "peak_population": peak_population, "wall_time": round(time.perf_counter() - start, 4)})
+    if census is True:
+        result["census"] = Census.format(Census(world.rule).count(world.current_board.to_numpy(), world.statistics.latest["bbox"]))
+    if profiler is not None:
+        summary = profiler.summary()
+        result.update({"peak_memory": summary["peak_traced"], "steady_memory": summary["steady_traced"], "allocated_per_generation": summary["steady_step"]})
+    return result
+
+def run_one_with_cap(arguments:tuple[dict, int, bool, bool]) -> dict:
+    """ Unpacks the arguments of run_one for the pool.
+
+        Args:
+            arguments (tuple[dict, int, bool, bool]): the run, the generation cap, whether to take
+            a census and whether to profile memory.
+        Returns:
+            result (dict): the result of run_one.
+    """
+    return run_one(*arguments)
+
+def complete_length(filepath:str) -> int:
+    """ Finds the length of an output file up to the end of its last
+        complete line. Results are written a line at a time, so a last
+        line without a newline was cut off by an interruption.
+
+        Args:
+            filepath (str): the output filepath.
+        Returns:
+            length (int): the number of bytes of complete lines, 0 if there is no file.
+    """
+    if not os.path.exists(filepath):
+        return 0
+    with open(filepath, "rb") as output:
+        data = output.read()
+    return data.rfind(b"\n") + 1
+
+def finished_runs(filepath:str) -> set[str]:
+    """ Reads the names of runs already in an output file, leaving out a
+        last line cut off by an interruption.
+
+        Args:
+            filepath (str): the output filepath.
+        Returns:
+            runs (set[str]): the names of finished runs.
+    """
+    length = complete_length(filepath)
+    if length == 0:
+        return set()
+    with open(filepath, "rb") as output:
+        lines = output.read(length).decode().splitlines()
+    runs = set()
+    if filepath.endswith(".csv"):
+        for row in csv.DictReader(lines):
+            # a row missing columns was not written whole
+            if None not in row.values():
+                runs.add(row["run"])
+    else:
+        for line in lines:
+            try:
+                runs.add(json.loads(line)["run"])
+            except (ValueError, KeyError):
+                pass # a line damaged some other way
+    return runs
+
+def sweep(runs:list[dict], generations:int, filepath:str, processes:int|None=None, census:bool=False,
+          profile_memory:bool=False) -> int:
+    """ Runs every run not already in the output file on a pool of
+        processes, appending each result as it arrives.
+
+        Args:
+            runs (list[dict]): the runs, from make_runs.
+            generations (int): the generation cap of each run.
+            filepath (str): the output filepath, CSV if it ends in ".csv", otherwise JSON lines.
+            processes (int|None): the number of processes, one per CPU if None.
+            census (bool): True to count the objects left at the end of each run.
+            profile_memory (bool): True to trace the memory allocated by each run.
+        Returns:
+            count (int): the number of runs done.
+    """
+    done = finished_runs(filepath)
+    runs = [run for run in runs if run["run"] not in done]
+    if not runs:
+        return 0
+
+    is_csv = filepath.endswith(".csv")
+    if os.path.exists(filepath):
+        # drop a line cut off by an interruption, so its run is done again on a line of its own
+        os.truncate(filepath, complete_length(filepath))
+    new_file = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+    with open(filepath, "a", newline="") as output:
+        writer = csv.DictWriter(output, FIELDS, extrasaction="ignore") if is_csv else None
+        if is_csv and new_file:
+            writer.writeheader()
+
+        count = 0
+        with multiprocessing.Pool(processes) as pool:
+            for result in pool.imap_unordered(run_one_with_cap, [(run, generations, census, profile_memory) for run in runs]):
+                if is_csv:
+                    writer.writerow(result)
+                else:
+                    output.write(json.dumps(result) + "\n")
+                output.flush()
+                count += 1
+        return count
+
+def parse_range(text:str) -> list[int]:
+    """ Parses numbers like "1,5,10-20" into a list, ranges inclusive.
+
+        Args:
+            text (str): the comma separated numbers and ranges.
+        Returns:
+            numbers (list[int]): the numbers.
+    """
+    numbers = []
+    for part in text.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            numbers.extend(range(int(first), int(last) + 1))
+        elif part:
+            numbers.append(int(part))
+    return numbers
+
+def main() -> None:
+    """ Parses the command line and runs a sweep.
+
+        Returns:
+            None
+    """
+    parser = argparse.ArgumentParser(description="Run many Game of Life worlds in parallel and record how each turns out.")
+    parser.add_argument("--seeds", default="", help='seeds of random worlds, like "0-999" or "1,5,9"')
+    parser.add_argument("--densities", default="0.5", help='densities of random worlds, like "0.2,0.35,0.5"')
+    parser.add_argument("--sizes", default="50x50", help='sizes of random worlds, like "50x50,100x100"')
+    parser.add_argument("--worlds", nargs="*", default=[], help="world files to run")
+    parser.add_argument("--rules", default="", help='rules to run every world under, like "B3/S23,B36/S23"')
+    parser.add_argument("--edge", choices=World.EDGES, help="how cells beyond the edges behave in every world")
+    parser.add_argument("--generations", type=int, default=5000, help="generation cap of each run")
+    parser.add_argument("--processes", type=int, help="number of processes (one per CPU by default)")
+    parser.add_argument("--output", default="sweep.jsonl", help="results file, .csv or JSON lines")
+    parser.add_argument("--census", action="store_true", help="count the still lifes, oscillators and spaceships left by each run")
+    parser.add_argument("--profile-memory", action="store_true", help="record the peak and steady-state memory of each run (slows the runs)")
+    args = parser.parse_args()
+
+    densities = [float(density) for density in args.densities.split(",") if density]
+    sizes = [tuple(int(length) for length in size.split("x")) for size in args.sizes.split(",") if size]
+    rules = [rule for rule in args.rules.split(",") if rule]
+    runs = make_runs(parse_range(args.seeds), densities, sizes, args.worlds, rules, args.edge)
+
+    start = time.perf_counter()
+    count = sweep(runs, args.generations, args.output, args.processes, args.census, args.profile_memory)
+    print(f"{count} of {len(runs)} runs done in {time.perf_counter() - start:.2f}s, results in {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+""" File: conftest.py
+
+    This module lets the tests import the top level modules of the repository.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
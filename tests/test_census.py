@@ -0,0 +1,25 @@
+""" File: test_census.py
+
+    This module tests naming the objects left on a board.
+"""
+import numpy as np
+from census import Census
+from world import World
+
+def test_count_inside_the_bounding_box_matches_the_whole_board():
+    world = World.random(60, 60, seed=4, density=.4)
+    for _ in range(200):
+        world.step()
+    census = Census()
+    cells = world.current_board.to_numpy()
+    bbox = world.statistics.latest["bbox"]
+    assert census.count(cells, bbox) == census.count(cells)
+    whole = sorted(sorted(map(tuple, coordinates.tolist())) for coordinates in census.objects(cells))
+    cropped = sorted(sorted(map(tuple, coordinates.tolist())) for coordinates in census.objects(cells, bbox))
+    assert cropped == whole
+
+def test_only_cells_inside_the_box_are_looked_at():
+    cells = np.zeros((1000, 1000), dtype=bool)
+    cells[500:502, 500:502] = True
+    cells[0, 0] = True
+    assert Census().count(cells, (500, 500, 501, 501)) == {"block": 1}
@@ -0,0 +1,70 @@
+""" File: test_checkpoint.py
+
+    This module tests writing, listing and pruning checkpoints.
+"""
+import os
+import numpy as np
+from checkpoint import Checkpointer
+from worker import StepWorker
+from world import World
+
+def test_save_writes_a_world_file(tmp_path):
+    world = World.random(8, 9, seed=1)
+    for _ in range(3):
+        world.step()
+    filepath = Checkpointer(str(tmp_path)).save(world)
+    assert os.path.basename(filepath) == "checkpoint-000000003.txt"
+    restored = World.from_file(filepath)
+    assert restored.generation == 3
+    assert np.array_equal(restored.current_board.to_numpy(), world.current_board.to_numpy())
+    # nothing is left behind by the temporary file
+    assert os.listdir(tmp_path) == ["checkpoint-000000003.txt"]
+
+def test_list_and_latest_are_newest_first(tmp_path):
+    directory = str(tmp_path)
+    assert Checkpointer.list(directory) == []
+    assert Checkpointer.latest(directory) is None
+    checkpointer = Checkpointer(directory, keep=5)
+    world = World.random(6, 6, seed=2)
+    for generation in range(3):
+        filepath = checkpointer.save(world)
+        os.utime(filepath, (generation, generation))
+        world.step()
+    (tmp_path / "notes.txt").write_text("not a checkpoint")
+    names = [os.path.basename(filepath) for filepath in Checkpointer.list(directory)]
+    assert names == ["checkpoint-000000002.txt", "checkpoint-000000001.txt", "checkpoint-000000000.txt"]
+    assert Checkpointer.latest(directory) == os.path.join(directory, "checkpoint-000000002.txt")
+
+def test_save_prunes_beyond_keep(tmp_path):
+    checkpointer = Checkpointer(str(tmp_path), keep=2)
+    world = World.random(6, 6, seed=3)
+    for _ in range(5):
+        checkpointer.save(world)
+        world.step()
+    names = sorted(os.listdir(tmp_path))
+    assert names == ["checkpoint-000000003.txt", "checkpoint-000000004.txt"]
+
+def test_update_only_saves_when_due(tmp_path):
+    checkpointer = Checkpointer(str(tmp_path), every_generations=4, every_seconds=None)
+    world = World.random(6, 6, seed=4, density=.3)
+    world.set_boundary("torus")
+    written = []
+    for _ in range(10):
+        world.step()
+        filepath = checkpointer.update(world)
+        if filepath is not None:
+            written.append(os.path.basename(filepath))
+    assert written == ["checkpoint-000000004.txt", "checkpoint-000000008.txt"]
+
+def test_worker_checkpoints_the_frame_taken(tmp_path):
+    world = World.random(30, 30, seed=5, density=.3)
+    world.set_boundary("torus")
+    checkpointer = Checkpointer(str(tmp_path), every_generations=1, every_seconds=None, keep=1)
+    worker = StepWorker(world, capacity=8, checkpointer=checkpointer)
+    try:
+        generation, board = worker.take(wait=True)[:2]
+        filepath = Checkpointer.latest(str(tmp_path))
+        assert os.path.basename(filepath) == f"checkpoint-{generation:09d}.txt"
+        assert np.array_equal(World.from_file(filepath).current_board.to_numpy(), board.to_numpy())
+    finally:
+        worker.stop()
@@ -0,0 +1,80 @@
+""" File: test_export.py
+
+    This module tests the export of worlds as animations.
+"""
+import time
+import numpy as np
+import pytest
+import export
+from export import GifWriter, board_cells, frame_pixels
+from world import World
+
+def reference_pixels(cells:np.ndarray, cell_size:int) -> bytes:
+    """ Scales board cells up one cell at a time, the way export did before it used numpy. """
+    live = b"\x01" * (cell_size - 1) + b"\x00" if cell_size >= 3 else b"\x01" * cell_size
+    dead = b"\x00" * cell_size
+    pixels = bytearray()
+    for line in cells.tolist():
+        pixel_row = b"".join(live if cell else dead for cell in line)
+        if cell_size >= 3:
+            pixels += pixel_row * (cell_size - 1) + bytes(len(pixel_row))
+        else:
+            pixels += pixel_row * cell_size
+    return bytes(pixels)
+
+def read_gif(filepath:str) -> list[np.ndarray]:
+    """ Reads the frames of a GIF back, 1 for foreground pixels. """
+    Image = pytest.importorskip("PIL.Image")
+    frames = []
+    with Image.open(filepath) as image:
+        for index in range(image.n_frames):
+            image.seek(index)
+            frames.append((np.array(image.convert("RGB"))[:, :, 0] == export.FOREGROUND_COLOR[0]).astype(np.uint8))
+    return frames
+
+@pytest.mark.parametrize("cell_size", [1, 2, 3, 10])
+def test_frame_pixels_match_reference(cell_size):
+    cells = (np.random.default_rng(cell_size).random((7, 11)) < .5).astype(np.uint8)
+    pixels = frame_pixels(cells, cell_size)
+    assert pixels.shape == (7 * cell_size, 11 * cell_size)
+    assert pixels.tobytes() == reference_pixels(cells, cell_size)
+
+def test_board_cells_crops_at_origin():
+    world = World.random(12, 15, seed=3)
+    world.origin = (2, 4)
+    cells = board_cells(world, 5, 6)
+    assert cells.dtype == np.uint8
+    assert np.array_equal(cells, world.current_board.to_numpy()[2:7, 4:10])
+
+@pytest.mark.parametrize("pillow", [True, False])
+def test_gif_frames_round_trip(tmp_path, monkeypatch, pillow):
+    if not pillow:
+        monkeypatch.setattr(export, "Image", None)
+    filepath = str(tmp_path / "run.gif")
+    export.export(World.random(20, 30, cell_size=3, seed=5), filepath, 4)
+    world = World.random(20, 30, cell_size=3, seed=5)
+    expected = [frame_pixels(board_cells(world), 3)]
+    for _ in range(4):
+        world.step()
+        expected.append(frame_pixels(board_cells(world), 3))
+    frames = read_gif(filepath)
+    assert len(frames) == len(expected)
+    for frame, pixels in zip(frames, expected):
+        assert np.array_equal(frame, pixels)
+
+def test_frame_is_faster_than_reference(tmp_path):
+    pytest.importorskip("PIL.Image")
+    world = World.random(200, 200, seed=7)
+    writer = GifWriter(str(tmp_path / "bench.gif"), 2000, 2000, 10)
+
+    start = time.perf_counter()
+    cells = world.current_board.to_numpy()
+    reference = reference_pixels(np.array([[1 if cells[row, column] else 0 for column in range(200)] for row in range(200)]), 10)
+    GifWriter.compress(reference, 2)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    writer.write_frame(frame_pixels(board_cells(world), 10))
+    after = time.perf_counter() - start
+    writer.close()
+    assert after * 10 < before
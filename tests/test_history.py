@@ -0,0 +1,62 @@
+""" File: test_history.py
+
+    This module tests keeping compressed boards for rewinding.
+"""
+import numpy as np
+from history import History
+
+def random_board(seed:int, shape:tuple[int, int]=(32, 32)) -> np.ndarray:
+    """ Makes a board that does not compress to nothing. """
+    return np.random.default_rng(seed).random(shape) < .5
+
+def test_get_returns_the_board_and_origin():
+    history = History()
+    boards = [random_board(generation) for generation in range(3)]
+    for generation, board in enumerate(boards):
+        history.record(generation, board, (generation, 2 * generation))
+    assert history.span == (0, 2)
+    board, origin = history.get(1)
+    assert np.array_equal(board, boards[1])
+    assert origin == (1, 2)
+    assert history.get(3) is None
+
+def test_oldest_boards_are_dropped_over_budget():
+    sizes = []
+    history = History(budget=10 ** 9)
+    for generation in range(4):
+        history.record(generation, random_board(generation))
+        sizes.append(history.nbytes)
+    # room for the last two boards only
+    history = History(budget=sizes[3] - sizes[1])
+    for generation in range(4):
+        history.record(generation, random_board(generation))
+    assert history.span == (2, 3)
+    assert history.nbytes <= history.budget
+    assert history.get(1) is None
+    assert np.array_equal(history.get(3)[0], random_board(3))
+
+def test_a_gap_clears_the_boards_kept():
+    history = History()
+    for generation in range(3):
+        history.record(generation, random_board(generation))
+    history.record(7, random_board(7))
+    assert history.span == (7, 7)
+    assert history.get(2) is None
+
+def test_generations_already_kept_are_skipped():
+    history = History()
+    for generation in range(3):
+        history.record(generation, random_board(generation))
+    nbytes = history.nbytes
+    # a world rewound to generation 1 steps to the same boards again
+    history.record(2, random_board(99))
+    assert history.nbytes == nbytes
+    assert np.array_equal(history.get(2)[0], random_board(2))
+    assert history.span == (0, 2)
+
+def test_a_budget_of_zero_keeps_nothing():
+    history = History(budget=0)
+    history.record(0, random_board(0))
+    assert history.span is None
+    assert history.nbytes == 0
+    assert history.get(0) is None
@@ -0,0 +1,25 @@
+""" File: test_memory.py
+
+    This module tests counting the memory a world holds.
+"""
+from history import History
+from library import PatternLibrary
+from memory import MemoryProfiler
+from world import World
+
+def test_holdings_count_the_library_and_other_histories(tmp_path):
+    World.random(20, 30, seed=1).save(str(tmp_path / "soup.txt"))
+    library = PatternLibrary(str(tmp_path))
+    world = library.load(str(tmp_path / "soup.txt"))
+    world.history = History()
+    world.history.record(world.generation, world.current_board.to_numpy())
+    other = History()
+    other.record(0, World.random(40, 40, seed=2).current_board.to_numpy())
+
+    plain = MemoryProfiler.holdings(world)
+    holdings = MemoryProfiler.holdings(world, library, [other, None])
+    assert "library" not in plain and "histories" not in plain
+    assert holdings["library"] == library.cached_bytes == 2 * 20 * 30
+    assert holdings["histories"] == other.nbytes
+    assert holdings["history"] == world.history.nbytes
+    assert holdings["total"] == plain["total"] + library.cached_bytes + other.nbytes
@@ -0,0 +1,62 @@
+""" File: test_worker.py
+
+    This module tests stepping worlds on background threads.
+"""
+import time
+import numpy as np
+from worker import StepWorker
+from world import World
+
+def running_world(seed:int=1) -> World:
+    """ Makes a world that keeps changing for a long time. """
+    world = World.random(40, 40, seed=seed, density=.3)
+    world.set_boundary("torus")
+    return world
+
+def test_frames_follow_the_stride_from_the_first_generation():
+    world = running_world()
+    for _ in range(5):
+        world.step()
+    worker = StepWorker(world, capacity=4, stride=3)
+    try:
+        generations = [worker.take(wait=True)[0] for _ in range(3)]
+    finally:
+        worker.stop()
+    assert generations == [8, 11, 14]
+
+def test_frames_come_in_order_and_the_world_restores_to_the_last_one():
+    world = running_world(2)
+    world.track_ages()
+    worker = StepWorker(world, capacity=8)
+    frames = [worker.take(wait=True) for _ in range(20)]
+    worker.stop()
+    generations = [frame[0] for frame in frames]
+    assert generations == list(range(1, 21))
+    # the worker stepped ahead of the frames taken
+    assert world.generation >= 20
+
+    generation, board, changes_made, origin, ages = frames[-1]
+    world.restore(board, generation, origin, ages)
+    assert world.generation == 20
+    assert np.array_equal(world.current_board.to_numpy(), board.to_numpy())
+    assert np.array_equal(world.ages, ages)
+    assert world.statistics.latest["generation"] == 20
+    assert world.statistics.latest["population"] == np.count_nonzero(board.to_numpy())
+
+    # stepping on from there gives the same generation as a world that never went ahead
+    replay = running_world(2)
+    for _ in range(21):
+        replay.step()
+    world.step()
+    assert np.array_equal(world.current_board.to_numpy(), replay.current_board.to_numpy())
+
+def test_take_without_waiting_returns_the_last_of_several_frames():
+    worker = StepWorker(running_world(3), capacity=4)
+    try:
+        worker.take(wait=True)
+        while len(worker.frames) < 4:
+            time.sleep(.001)
+        assert worker.take(count=3)[0] == 4
+        assert len(worker.frames) <= 2
+    finally:
+        worker.stop()
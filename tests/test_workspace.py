@@ -0,0 +1,57 @@
+""" File: test_workspace.py
+
+    This module tests running several worlds side by side, without a window.
+"""
+import os
+from types import SimpleNamespace
+import numpy as np
+from checkpoint import Checkpointer
+from worker import StepPool, StepWorker
+from workspace import Workspace
+from world import World
+
+def running_world(seed:int) -> World:
+    """ Makes a world that keeps changing for a long time. """
+    world = World.random(40, 40, seed=seed, density=.3)
+    world.set_boundary("torus")
+    return world
+
+def test_closing_one_world_leaves_the_other_running_and_checkpointed(tmp_path):
+    pool = StepPool(threads=2)
+    checkpointer = Checkpointer(str(tmp_path), every_generations=1, every_seconds=None, keep=1)
+    first = running_world(1)
+    second = running_world(2)
+    # the parts of a Simulator the workspace uses, without its window
+    closing = SimpleNamespace(world=first, checkpointer=checkpointer,
+                              worker=StepWorker(first, capacity=4, checkpointer=checkpointer, pool=pool))
+    remaining = SimpleNamespace(world=second, checkpointer=None, worker=StepWorker(second, capacity=4, pool=pool))
+    try:
+        assert closing.worker.take(wait=True) is not None
+        assert remaining.worker.take(wait=True) is not None
+
+        closing.worker.stop()
+        stopped_at = first.generation
+        successor = Workspace.hand_over_checkpoints(closing, [remaining])
+        assert successor is remaining
+        assert remaining.worker.checkpointer is remaining.checkpointer
+        assert remaining.checkpointer.directory == str(tmp_path)
+
+        generations = []
+        for _ in range(10):
+            generation, board = remaining.worker.take(wait=True)[:2]
+            generations.append(generation)
+        assert generations == list(range(generations[0], generations[0] + 10))
+        assert first.generation == stopped_at
+        assert len(closing.worker.frames) == 0
+
+        filepath = Checkpointer.latest(str(tmp_path))
+        assert os.path.basename(filepath) == f"checkpoint-{generation:09d}.txt"
+        assert np.array_equal(World.from_file(filepath).current_board.to_numpy(), board.to_numpy())
+    finally:
+        remaining.worker.stop()
+        pool.stop()
+
+def test_no_world_is_left_to_checkpoint():
+    closing = SimpleNamespace(world=None, checkpointer=Checkpointer(), worker=None)
+    assert Workspace.hand_over_checkpoints(closing, []) is None
+    assert Workspace.hand_over_checkpoints(closing, [SimpleNamespace(world=None, checkpointer=None, worker=None)]) is None
@@ -0,0 +1,86 @@
+""" File: test_world.py
+
+    This module tests stepping worlds, comparing the steps cropped to the
+    live cells with steps of the whole board.
+"""
+import numpy as np
+import pytest
+from datastructures.array2d import Array2D
+from engines.lookup import LookupEngine
+from engines.rule import Rule
+from world import World
+
+GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=bool)
+
+def make_world(cells:np.ndarray, boundary:str, engine:str) -> World:
+    """ Makes a world of a board, keeping the ages of its cells. """
+    world = World(cells.shape[0], cells.shape[1], board=Array2D.from_numpy(cells.copy()), boundary=boundary)
+    world.set_engine(engine)
+    world.track_ages()
+    return world
+
+def spy_on(world:World) -> list[str]:
+    """ Records which of the engine's steps the world calls. """
+    calls = []
+    for name in ("step_counted", "step_padded_counted"):
+        method = getattr(world.engine, name)
+        def spy(*args, method=method, name=name):
+            calls.append(name)
+            return method(*args)
+        setattr(world.engine, name, spy)
+    return calls
+
+@pytest.mark.parametrize("engine", ["lookup", "tile"])
+@pytest.mark.parametrize("boundary", ["dead", "torus", "mirror"])
+@pytest.mark.parametrize("place", ["middle", "edge"])
+def test_cropped_step_matches_full_step(boundary, engine, place):
+    cells = np.zeros((40, 50), dtype=bool)
+    top, left = (18, 24) if place == "middle" else (0, 47)
+    cells[top:top + 3, left:left + 3] = GLIDER
+    world = make_world(cells, boundary, engine)
+    calls = spy_on(world)
+    full = LookupEngine(Rule("B3/S23"), boundary)
+    ages = cells.astype(np.uint8)
+
+    for _ in range(12):
+        new_cells = full.step(cells, ages)
+        world.step()
+        record = world.statistics.latest
+        assert np.array_equal(world.current_board.to_numpy(), new_cells)
+        assert np.array_equal(world.ages, ages)
+        assert record["births"] == np.count_nonzero(new_cells & ~cells)
+        assert record["deaths"] == np.count_nonzero(cells & ~new_cells)
+        assert record["population"] == np.count_nonzero(new_cells)
+        assert record["bbox"] == World.bounding_box(new_cells)
+        cells = new_cells
+    # a pattern away from the edges is always cropped, and one at the edge of a dead board is too
+    if place == "middle" or boundary == "dead":
+        assert set(calls) == {"step_padded_counted"}
+    else:
+        assert "step_counted" in calls
+
+@pytest.mark.parametrize("engine", ["lookup", "tile"])
+def test_grow_follows_a_glider_over_the_edge(engine):
+    cells = np.zeros((12, 12), dtype=bool)
+    # heading down and to the right, towards the bottom right corner
+    cells[7:10, 7:10] = GLIDER
+    world = make_world(cells, "grow", engine)
+    generations = 80
+    for _ in range(generations):
+        world.step()
+    assert (world.rows, world.columns) != (12, 12)
+
+    # the same glider on a board big enough that it never comes near the edges
+    top, left = world.origin
+    reference = np.zeros((world.rows, world.columns), dtype=bool)
+    reference[top + 7:top + 10, left + 7:left + 10] = GLIDER
+    full = LookupEngine(Rule("B3/S23"), "dead")
+    for _ in range(generations):
+        reference = full.step(reference)
+    board = world.current_board.to_numpy()
+    assert np.array_equal(board, reference)
+    assert world.statistics.latest["population"] == 5
+    assert world.statistics.latest["bbox"] == World.bounding_box(board)
+    # the glider has moved a cell down and right every 4 generations, past the first board's corner
+    assert World.bounding_box(board)[:2] == (top + 7 + generations // 4, left + 7 + generations // 4)
+    assert np.count_nonzero(world.ages) == 5
@@ -0,0 +1,258 @@
+""" File: worker.py
+
+    This module holds the StepWorker and StepPool classes.
+"""
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+from checkpoint import Checkpointer
+if TYPE_CHECKING: # only for annotations, so the window can start without loading numpy
+    from world import World
+
+class StepWorker:
+    """ This class steps a world on a background thread, computing
+        generations ahead of the window into a bounded buffer of
+        frames that the window takes from at its own pace.
+
+        Each frame is a (generation, board, changes_made, origin, ages)
+        tuple, the origin telling how far a growing board has moved and
+        ages being a copy of the world's cell ages if it keeps them. With a
+        stride above 1 only every stride-th generation (and the last) is
+        kept as a frame, for windows that show several generations per
+        frame; frames are computed ahead at one stride, so changing it
+        means starting a new worker from the generation shown. World.step
+        builds a new board every generation, so frames share boards with
+        the world instead of copying them.
+
+        A worker either has a thread of its own or is stepped by the
+        threads of a StepPool shared with other workers.
+    """
+    def __init__(self, world:'World', capacity:int=32, checkpointer:Checkpointer|None=None, pool:'StepPool|None'=None, stride:int=1) -> None:
+        """ Initializes an instance of the StepWorker and starts its thread,
+            or adds it to a pool.
+
+            Args:
+                world (World): the world to step. It must not be used elsewhere
+                until the worker is stopped.
+                capacity (int): the most frames computed ahead (at least 1).
+                checkpointer (Checkpointer|None): writes checkpoints of the frames taken, if given.
+                pool (StepPool|None): the pool that steps the worker, None for a thread of its own.
+                stride (int): the generations per frame (at least 1).
+            Returns:
+                None
+        """
+        self.world = world
+        self.capacity = max(capacity, 1)
+        self.checkpointer = checkpointer
+        self.pool = pool
+        self.frames = deque()
+        self.running = True
+        self.finished = False
+        # True while a pool thread is stepping the world
+        self.busy = False
+        self.stride = max(stride, 1)
+        # frames are every stride-th generation from the one the worker starts at
+        self.first_generation = world.generation
+        # a moving average of the seconds World.step takes
+        self.step_cost = 0.0
+
+        if pool is None:
+            self.condition = threading.Condition()
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        else:
+            self.condition = pool.condition
+            self.thread = None
+            pool.add(self)
+
+    def ready(self) -> bool:
+        """ Checks if the worker has room for another frame. Called with
+            the condition held.
+
+            Returns:
+                ready (bool): True if the world should be stepped.
+        """
+        return self.running is True and self.finished is False and len(self.frames) < self.capacity
+
+    def step(self) -> bool:
+        """ Steps the world once and adds the generation to the buffer.
+
+            Returns:
+                changes_made (bool): False if the world stopped changing.
+        """
+        start = time.perf_counter()
+        changes_made = self.world.step()
+        self.step_cost += (time.perf_counter() - start - self.step_cost) * .1
+
+        with self.condition:
+            if self.running is True and (changes_made is False or (self.world.generation - self.first_generation) % self.stride == 0):
+                # the world ages its cells in place, so a frame keeps a copy of them
+                ages = None if self.world.ages is None else self.world.ages.copy()
+                self.frames.append((self.world.generation, self.world.current_board, changes_made, self.world.origin, ages))
+            if changes_made is False:
+                self.finished = True
+            self.condition.notify_all()
+        return changes_made
+
+    def run(self) -> None:
+        """ Steps the world until it stops changing or the worker is
+            stopped, waiting whenever the buffer is full.
+
+            Returns:
+                None
+        """
+        while True:
+            with self.condition:
+                while self.running is True and len(self.frames) >= self.capacity:
+                    self.condition.wait()
+                if self.running is False:
+                    return
+
+            if self.step() is False:
+                return
+
+    def take(self, count:int=1, wait:bool=False) -> tuple|None:
+        """ Takes frames from the buffer in order, keeping only the last
+            one taken so frames a slow window has no time for are dropped.
+            Checkpoints are written of the frame taken, not of the world,
+            which may be generations ahead of it.
+
+            Args:
+                count (int): the most frames to take.
+                wait (bool): True to wait for a frame if the buffer is empty.
+            Returns:
+                frame (tuple|None): the last frame taken, or None if there were none.
+        """
+        with self.condition:
+            if wait is True:
+                while not self.frames and self.running is True and self.finished is False:
+                    self.condition.wait()
+            frame = None
+            while count > 0 and self.frames:
+                frame = self.frames.popleft()
+                count -= 1
+            self.condition.notify_all()
+        if frame is not None and self.checkpointer is not None:
+            self.checkpointer.update(self.world, frame[1], frame[0])
+        return frame
+
+    def stop(self) -> None:
+        """ Stops the thread and discards frames computed ahead.
+
+            Returns:
+                None
+        """
+        with self.condition:
+            self.running = False
+            self.frames.clear()
+            self.condition.notify_all()
+            if self.pool is not None:
+                self.pool.remove(self)
+                # the world is only safe to use once the pool is done with it
+                while self.busy is True:
+                    self.condition.wait()
+        if self.thread is not None and threading.current_thread() is not self.thread:
+            self.thread.join()
+
+class StepPool:
+    """ This class steps the workers of several worlds on a fixed
+        number of threads, so running more worlds does not add more
+        threads.
+
+        Threads take turns over the workers with room in their buffers,
+        stepping each for at most a short time slice before moving on
+        to the next, so a large world cannot starve the others.
+    """
+    def __init__(self, threads:int=2, time_slice:float=.01) -> None:
+        """ Initializes an instance of the StepPool and starts its threads.
+
+            Args:
+                threads (int): the number of threads (at least 1).
+                time_slice (float): the most seconds a worker is stepped for per turn.
+            Returns:
+                None
+        """
+        self.time_slice = time_slice
+        self.workers = deque()
+        self.condition = threading.Condition()
+        self.running = True
+
+        self.threads = [threading.Thread(target=self.run, daemon=True) for _ in range(max(threads, 1))]
+        for thread in self.threads:
+            thread.start()
+
+    def add(self, worker:StepWorker) -> None:
+        """ Adds a worker to be stepped. Called by the worker.
+
+            Args:
+                worker (StepWorker): the worker.
+            Returns:
+                None
+        """
+        with self.condition:
+            self.workers.append(worker)
+            self.condition.notify_all()
+
+    def remove(self, worker:StepWorker) -> None:
+        """ Removes a worker. Called by the worker when stopped.
+
+            Args:
+                worker (StepWorker): the worker.
+            Returns:
+                None
+        """
+        with self.condition:
+            if worker in self.workers:
+                self.workers.remove(worker)
+
+    def next_worker(self) -> StepWorker|None:
+        """ Finds the next worker in turn that is ready and not already
+            being stepped, moving it to the back of the line. Called
+            with the condition held.
+
+            Returns:
+                worker (StepWorker|None): the worker, or None if none are ready.
+        """
+        for _ in range(len(self.workers)):
+            worker = self.workers[0]
+            self.workers.rotate(-1)
+            if worker.busy is False and worker.ready() is True:
+                return worker
+        return None
+
+    def run(self) -> None:
+        """ Steps the workers in turn until the pool is stopped, waiting
+            whenever no worker is ready.
+
+            Returns:
+                None
+        """
+        while True:
+            with self.condition:
+                worker = self.next_worker()
+                while self.running is True and worker is None:
+                    self.condition.wait()
+                    worker = self.next_worker()
+                if self.running is False:
+                    return
+                worker.busy = True
+
+            slice_end = time.perf_counter() + self.time_slice
+            while True:
+                worker.step()
+                with self.condition:
+                    if worker.ready() is False or time.perf_counter() >= slice_end:
+                        worker.busy = False
+                        self.condition.notify_all()
+                        break
+
+    def stop(self) -> None:
+        """ Stops the threads. Workers still in the pool are no longer stepped.
+
+            Returns:
+                None
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
@@ -0,0 +1,201 @@
+""" File: workspace.py
+
+    This module holds the Workspace class.
+"""
+import tkinter as tk
+from tkinter import ttk
+import config
+from checkpoint import Checkpointer
+from worker import StepPool
+
+class Workspace:
+    """ This class starts up a window that runs several simulations
+        side by side, one per tab, so variants of a world can be
+        compared. Every simulation is stepped by one shared pool of
+        threads, so adding tabs does not add threads or windows.
+
+        The window lives for the whole program: the configuration
+        options are shown in it while no simulation is open, and
+        reconfiguring swaps them back in rather than starting over.
+        The simulator (and with it numpy) is only loaded once the
+        first world is opened.
+    """
+    # the number of threads stepping the worlds of every tab
+    THREADS = 2
+
+    def __init__(self, threads:int=THREADS) -> None:
+        """ Initializes an instance of the Workspace. Simulations are
+            added with add and the window is shown with run.
+
+            Args:
+                threads (int): the number of threads stepping the worlds.
+            Returns:
+                None
+        """
+        self.root = tk.Tk()
+        self.background_color = "white"
+        self.foreground_color = "#323232"
+        self.simulators = []
+        self.pool = StepPool(threads)
+        self.opened = 0
+        # the pattern library of every config window, loaded on first use so its cache is shared
+        self.library = None
+        # the open simulation writing checkpoints, if any
+        self.checkpointing = None
+
+        self.root.title("Conway's Game of Life")
+        self.root.iconbitmap("assets/gol.ico")
+        self.root.configure(bg=self.background_color)
+        self.root.grid_rowconfigure(0, weight=1)
+        self.root.grid_columnconfigure(0, weight=1)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        # shown once the first simulation is opened
+        self.notebook = ttk.Notebook(self.root)
+        self.view = None
+
+    def show_view(self) -> tk.Frame:
+        """ Hides the tabs and makes a frame filling the window in their
+            place, for the configuration options. The tabs come back once
+            a simulation is opened.
+
+            Returns:
+                frame (tk.Frame): the frame.
+        """
+        self.notebook.grid_remove()
+        if self.view is not None:
+            self.view.destroy()
+        self.view = tk.Frame(self.root)
+        self.view.grid(row=0, column=0)
+        return self.view
+
+    def add(self, **options) -> 'simulator.Simulator':
+        """ Opens a simulation in a new tab and switches to it. Only one
+            open simulation writes checkpoints at a time, so the checkpoints
+            of different worlds do not mix. Once it is closed, another open
+            simulation takes them over (see hand_over_checkpoints), or the
+            next one opened writes them if there is none.
+
+            Args:
+                options: the arguments of the Simulator, like world or filepath.
+            Returns:
+                simulation (Simulator): the new simulation.
+        """
+        import simulator # loaded on first use, so the options are shown without loading numpy
+        if self.checkpointing is not None:
+            options["checkpoint_dir"] = None
+        self.opened += 1
+        simulation = simulator.Simulator(workspace=self, **options)
+        if simulation.checkpointer is not None:
+            self.checkpointing = simulation
+        return simulation
+
+    def new_tab(self, simulation:'simulator.Simulator') -> tk.Frame:
+        """ Makes a tab for a simulation. Called by the simulation.
+
+            Args:
+                simulation (Simulator): the simulation.
+            Returns:
+                frame (tk.Frame): the frame the simulation is drawn in.
+        """
+        if self.view is not None:
+            self.view.destroy()
+            self.view = None
+        self.notebook.grid(row=0, column=0, sticky="nsew")
+        frame = tk.Frame(self.notebook, bg=self.background_color, highlightcolor=self.foreground_color, highlightthickness=1)
+        self.notebook.add(frame, text=f"World {self.opened}")
+        self.notebook.select(frame)
+        self.simulators.append(simulation)
+        return frame
+
+    def name_tab(self, simulation:'simulator.Simulator', name:str) -> None:
+        """ Changes the text of a simulation's tab.
+
+            Args:
+                simulation (Simulator): the simulation.
+                name (str): the text.
+            Returns:
+                None
+        """
+        self.notebook.tab(simulation.frame, text=name)
+
+    def new_world(self, cell_size:int=10, rows:int=50, columns:int=50) -> None:
+        """ Shows the configuration options, whose world is opened in a
+            new tab. While other simulations are open the options are
+            shown in a window of their own over them.
+
+            Args:
+                cell_size (int): the cell size the options start at.
+                rows (int): the number of rows the options start at.
+                columns (int): the number of columns the options start at.
+            Returns:
+                None
+        """
+        config.Config(cell_size=cell_size, rows=rows, columns=columns, workspace=self)
+
+    def close_tab(self, simulation:'simulator.Simulator', keep_window:bool=False) -> None:
+        """ Stops a simulation and removes its tab, closing the window
+            when it was the last one.
+
+            Args:
+                simulation (Simulator): the simulation.
+                keep_window (bool): True to keep the window open after the last tab.
+            Returns:
+                None
+        """
+        simulation.close()
+        self.simulators.remove(simulation)
+        if simulation is self.checkpointing:
+            self.checkpointing = Workspace.hand_over_checkpoints(simulation, self.simulators)
+        self.notebook.forget(simulation.frame)
+        simulation.frame.destroy()
+        if not self.simulators and keep_window is False:
+            self.close()
+
+    @staticmethod
+    def hand_over_checkpoints(simulation:'simulator.Simulator', simulators:list['simulator.Simulator']) -> 'simulator.Simulator|None':
+        """ Moves the checkpoints of a simulation being closed to the first
+            other open simulation with a world, so a remaining world is
+            still checkpointed. The checkpoints go to the same directory and
+            on the same schedule, counted from the new world's generation.
+
+            Args:
+                simulation (Simulator): the simulation writing checkpoints, already stopped.
+                simulators (list[Simulator]): the other open simulations.
+            Returns:
+                simulation (Simulator|None): the simulation now writing checkpoints,
+                or None if there is none.
+        """
+        checkpointer = simulation.checkpointer
+        for other in simulators:
+            if other.world is not None:
+                other.checkpointer = Checkpointer(checkpointer.directory, checkpointer.every_generations, checkpointer.every_seconds, checkpointer.keep)
+                if other.worker is not None:
+                    other.worker.checkpointer = other.checkpointer
+                return other
+        return None
+
+    def close(self) -> None:
+        """ Stops every simulation and the pool and closes the window.
+
+            Returns:
+                None
+        """
+        for simulation in self.simulators:
+            simulation.close()
+        self.simulators.clear()
+        self.checkpointing = None
+        self.pool.stop()
+        self.root.destroy()
+
+    def run(self) -> None:
+        """ Centers the window and starts the event loop.
+
+            Returns:
+                None
+        """
+        self.root.update_idletasks()
+        window_x = self.root.winfo_screenwidth() // 2 - self.root.winfo_width() // 2
+        window_y = self.root.winfo_screenheight() // 2 - self.root.winfo_height() // 2
+        self.root.geometry(f"+{window_x}+{window_y}")
+        self.root.mainloop()
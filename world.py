@@ -0,0 +1,481 @@
+""" File: world.py
+
+    This module holds the World class.
+"""
+import copy
+import random
+import numpy as np
+from datastructures.array2d import Array2D
+from engines.jit import JitEngine
+from engines.lookup import LookupEngine
+from engines.rule import Rule
+from engines.tile import TileEngine
+from stats import Statistics
+
+class World:
+    """ This class holds the state of a Game of Life simulation
+        (boards, generation and settings) and steps it forward
+        without needing a window, so it can be run headlessly,
+        saved and restored.
+    """
+    SYMMETRIES = ("none", "horizontal", "vertical", "both", "rotational")
+    # the engine boundaries, and "grow" for dead edges the board grows past
+    EDGES = tuple(LookupEngine.BOUNDARIES) + ("grow",)
+    # live cells this close to an edge of a growing board make it grow
+    GROWTH_MARGIN = 2
+    # the most rows or columns a board grows to, after which its edges are dead
+    MAX_GROWN_SIZE = 10000
+    # engine names and classes, every engine steps boards the same way
+    ENGINES = {"tile": TileEngine, "lookup": LookupEngine}
+    if JitEngine.AVAILABLE:
+        ENGINES["jit"] = JitEngine
+    # the engine worlds start with, the compiled one when Numba is installed
+    DEFAULT_ENGINE = "jit" if JitEngine.AVAILABLE else "tile"
+
+    def __init__(self, rows:int, columns:int, cell_size:int=10, board:Array2D|None=None, generation:int=0,
+                 rule:str="B3/S23", boundary:str="dead", seed:int|None=None, density:float=.5, symmetry:str="none", soup:tuple[int, int]|None=None):
+        """ Initializes an instance of the World.
+
+            Args:
+                rows (int): the number of rows.
+                columns (int): the number of columns.
+                cell_size (int): the cell size in pixels.
+                board (Array2D|None): the starting board, or None for an empty board.
+                generation (int): the generation number of the starting board.
+                rule (str): the birth/survival rule in B/S notation.
+                boundary (str): how cells beyond the edges of the board behave,
+                one of World.EDGES.
+                seed (int|None): the seed the board was randomly generated from, if any.
+                density (float): the chance of each cell being alive when randomly generated.
+                symmetry (str): the symmetry of the randomly generated board (see World.SYMMETRIES).
+                soup (tuple[int, int]|None): the rows and columns of the centered box
+                cells were randomly generated in, None if the whole board was used.
+            Returns:
+                None
+        """
+        self.rows = rows
+        self.columns = columns
+        self.cell_size = cell_size
+        self.generation = generation
+        self.initial_generation = generation
+        self.boundary = boundary
+        self.engine_name = World.DEFAULT_ENGINE
+        self.engine_options = {}
+        self.set_rule(rule)
+        # the rows and columns a growing board has added above and to the left of its first board
+        self.origin = (0, 0)
+        self.seed = seed
+        self.density = density
+        self.symmetry = symmetry
+        self.soup = soup
+
+        if board is None:
+            board = Array2D(self.rows, self.columns, False)
+        self.initial_board = board
+        self.current_board = copy.deepcopy(self.initial_board)
+
+        # the only full count of live cells, later generations add births and take away deaths
+        cells = self.current_board.to_numpy()
+        self.statistics = Statistics()
+        self.statistics.record(self.generation, int(np.count_nonzero(cells)), 0, 0, World.bounding_box(cells))
+        # boards of recent generations for rewinding, kept once a History is set
+        self.history = None
+        # how many generations each cell has been alive, kept once track_ages is called
+        self.ages = None
+
+    @staticmethod
+    def random(rows:int, columns:int, cell_size:int=10, seed:int|None=None, density:float=.5, symmetry:str="none",
+               soup:tuple[int, int]|None=None) -> 'World':
+        """ Creates a world where each cell has a chance of being alive, drawing
+            every cell at once from a seeded generator so the same arguments
+            always make the same world.
+
+            Args:
+                rows (int): the number of rows.
+                columns (int): the number of columns.
+                cell_size (int): the cell size in pixels.
+                seed (int|None): the seed for the generator, a new one is picked if None.
+                density (float): the chance of each cell being alive, from 0 to 1.
+                symmetry (str): one of World.SYMMETRIES. "horizontal" mirrors the left
+                half onto the right, "vertical" the top half onto the bottom, "both"
+                does both and "rotational" makes the board the same when turned 180 degrees.
+                soup (tuple[int, int]|None): the rows and columns of a box in the center
+                of the board to fill, leaving the rest dead. None fills the whole board.
+            Returns:
+                world (World): the randomly generated world.
+            Raises:
+                ValueError: if the symmetry is not one of World.SYMMETRIES.
+        """
+        if symmetry not in World.SYMMETRIES:
+            raise ValueError(f'"{symmetry}" is not one of {", ".join(World.SYMMETRIES)}.')
+        if seed is None:
+            seed = random.randrange(2**32)
+        generator = np.random.default_rng(seed)
+
+        if soup is None:
+            box_rows, box_columns = rows, columns
+        else:
+            box_rows, box_columns = min(soup[0], rows), min(soup[1], columns)
+        box = generator.random((box_rows, box_columns), dtype=np.float32) < density
+
+        # copy one half of the box over the other
+        if symmetry in ("horizontal", "both"):
+            box[:, box_columns - box_columns // 2:] = box[:, :box_columns // 2][:, ::-1]
+        if symmetry in ("vertical", "both"):
+            box[box_rows - box_rows // 2:, :] = box[:box_rows // 2, :][::-1, :]
+        if symmetry == "rotational":
+            box[box_rows - box_rows // 2:, :] = box[:box_rows // 2, :][::-1, ::-1]
+            if box_rows % 2 == 1:
+                middle = box_rows // 2
+                box[middle, box_columns - box_columns // 2:] = box[middle, :box_columns // 2][::-1]
+
+        cells = np.zeros((rows, columns), dtype=bool)
+        top = (rows - box_rows) // 2
+        left = (columns - box_columns) // 2
+        cells[top:top + box_rows, left:left + box_columns] = box
+        return World(rows, columns, cell_size, Array2D.from_numpy(cells), seed=seed, density=density, symmetry=symmetry, soup=soup)
+
+    @staticmethod
+    def read(filepath:str) -> tuple[dict[str, str], list[str]]:
+        """ Reads the settings and board lines of a world file without
+            building a board, for when only the text is needed.
+
+            The file starts with "key:value" settings lines (size, rows and cols
+            are required, gen, rule, edge, seed, density, symmetry and soup are
+            optional) followed by
+            one line per row where live cells are "X" and dead cells are "-".
+
+            Args:
+                filepath (str): the filepath of the world file.
+            Returns:
+                settings (dict[str, str]): the settings lines by key.
+                lines (list[str]): the board lines, one per row.
+            Raises:
+                ValueError: if the file is not a valid world file.
+        """
+        with open(filepath) as world_file:
+            lines = world_file.read().splitlines()
+
+        settings = {}
+        index = 0
+        while index < len(lines) and ":" in lines[index]:
+            key, value = lines[index].split(":", 1)
+            settings[key.strip()] = value.strip()
+            index += 1
+
+        try:
+            rows = int(settings["rows"])
+            columns = int(settings["cols"])
+            int(settings["size"])
+        except (KeyError, ValueError):
+            raise ValueError(f'"{filepath}" is missing its size, rows or cols.')
+
+        if len(lines) - index < rows:
+            raise ValueError(f'"{filepath}" has fewer than {rows} rows.')
+
+        lines = [line.rstrip() for line in lines[index:index + rows]]
+        for row in range(rows):
+            if len(lines[row]) != columns:
+                raise ValueError(f'row {row} of "{filepath}" does not have {columns} columns.')
+        return settings, lines
+
+    @staticmethod
+    def from_file(filepath:str) -> 'World':
+        """ Creates a world from a world file.
+
+            Args:
+                filepath (str): the filepath of the world file.
+            Returns:
+                world (World): the world stored in the file.
+            Raises:
+                ValueError: if the file is not a valid world file.
+        """
+        settings, lines = World.read(filepath)
+        rows = int(settings["rows"])
+        columns = int(settings["cols"])
+
+        # every row has one character per column, so the board is read from the text in one go
+        text = "".join(lines).encode("ascii", "replace")
+        board = Array2D.from_numpy(np.frombuffer(text, dtype=np.uint8).reshape(rows, columns) == ord("X"))
+
+        seed = settings.get("seed")
+        soup = settings.get("soup")
+        if soup:
+            soup_rows, soup_columns = soup.split("x")
+            soup = (int(soup_rows), int(soup_columns))
+        return World(rows, columns, int(settings["size"]), board, generation=int(settings.get("gen", 0)), rule=settings.get("rule", "B3/S23"),
+                     boundary=settings.get("edge", "dead"), seed=int(seed) if seed else None, density=float(settings.get("density", .5)),
+                     symmetry=settings.get("symmetry", "none"), soup=soup or None)
+
+    def save(self, filepath:str, initial:bool=False) -> None:
+        """ Writes the world to a world file.
+
+            Args:
+                filepath (str): the filepath to write to.
+                initial (bool): True to write the initial board,
+                otherwise the current board and generation are written.
+            Returns:
+                None
+        """
+        with open(filepath, "w") as world_file:
+            self.write(world_file, initial)
+
+    def write(self, world_file, initial:bool=False, board:Array2D|None=None, generation:int|None=None) -> None:
+        """ Writes the world in the world file format to an open file.
+
+            Args:
+                world_file (file): a file opened for writing text.
+                initial (bool): True to write the initial board,
+                otherwise the current board and generation are written.
+                board (Array2D|None): another board of the world to write, like
+                the one shown while a worker steps ahead, instead of either.
+                generation (int|None): the generation of that board.
+            Returns:
+                None
+        """
+        if board is None and initial is False:
+            board = self.current_board
+            generation = self.generation
+        elif board is None:
+            board = self.initial_board
+            generation = self.initial_generation
+
+        # a growing board may be larger than its initial board
+        rows, columns = board.dimensions
+        world_file.write(f"size:{self.cell_size}\nrows:{rows}\ncols:{columns}\n")
+        if generation != 0:
+            world_file.write(f"gen:{generation}\n")
+        if self.rule != "B3/S23":
+            world_file.write(f"rule:{self.rule}\n")
+        if self.boundary != "dead":
+            world_file.write(f"edge:{self.boundary}\n")
+        if self.seed is not None:
+            # everything needed to regenerate the board with World.random
+            world_file.write(f"seed:{self.seed}\ndensity:{self.density}\n")
+            if self.symmetry != "none":
+                world_file.write(f"symmetry:{self.symmetry}\n")
+            if self.soup is not None:
+                world_file.write(f"soup:{self.soup[0]}x{self.soup[1]}\n")
+        characters = np.array([ord("-"), ord("X")], dtype=np.uint8)
+        for cells in board.to_numpy():
+            world_file.write(characters[cells.view(np.uint8)].tobytes().decode() + "\n")
+
+    def set_rule(self, rule:str) -> None:
+        """ Changes the birth/survival rule the world is stepped with.
+
+            Args:
+                rule (str): the rule in B/S notation, like "B3/S23" or "B36/S23".
+            Returns:
+                None
+            Raises:
+                ValueError: if the rule is not valid B/S notation.
+        """
+        self.engine = World.ENGINES[self.engine_name](Rule(rule), self.engine_boundary(), **self.engine_options)
+        self.rule = str(self.engine.rule)
+
+    def set_boundary(self, boundary:str) -> None:
+        """ Changes how cells beyond the edges of the board behave.
+
+            Args:
+                boundary (str): "dead" for empty space, "torus" to wrap each
+                edge around to the opposite one, "mirror" to reflect the
+                board back onto itself or "grow" for empty space the board
+                grows into as live cells near its edges.
+            Returns:
+                None
+            Raises:
+                ValueError: if the boundary is not one of World.EDGES.
+        """
+        if boundary not in World.EDGES:
+            raise ValueError(f'"{boundary}" is not one of {", ".join(World.EDGES)}.')
+        self.boundary = boundary
+        self.engine = World.ENGINES[self.engine_name](self.engine.rule, self.engine_boundary(), **self.engine_options)
+
+    def track_ages(self, enabled:bool=True) -> None:
+        """ Starts (or stops) keeping how many generations each cell has
+            been alive, counted from 1 for cells alive now and up to 255.
+            The ages are one array updated in place each step, so anything
+            kept of a generation must copy them.
+
+            Args:
+                enabled (bool): True to keep ages, False to drop them.
+            Returns:
+                None
+        """
+        self.ages = self.current_board.to_numpy().astype(np.uint8) if enabled is True else None
+
+    def engine_boundary(self) -> str:
+        """ Gets the boundary the engine steps the board with, since a
+            growing board has dead edges between growths.
+
+            Returns:
+                boundary (str): one of LookupEngine.BOUNDARIES.
+        """
+        return "dead" if self.boundary == "grow" else self.boundary
+
+    def set_engine(self, engine:str, **options) -> None:
+        """ Changes the engine the world is stepped with. Every engine
+            computes the same generations, only how fast differs.
+
+            Args:
+                engine (str): one of World.ENGINES, "tile" steps 2x2 blocks
+                of cells at a time, "lookup" one cell and "jit" (only there
+                when Numba is installed) loops over the cells in compiled code.
+                World.DEFAULT_ENGINE is the one worlds start with.
+                options: passed on to the engine, like memo_size for "tile".
+            Returns:
+                None
+            Raises:
+                KeyError: if the engine is not one of World.ENGINES.
+        """
+        self.engine = World.ENGINES[engine](self.engine.rule, self.engine_boundary(), **options)
+        self.engine_name = engine
+        self.engine_options = options
+
+    def step(self) -> bool:
+        """ Calculates the next generation of cells and replaces
+            the current generation with this.
+
+            Returns:
+                changes_made (bool): False if the board did not change.
+        """
+        board = self.current_board.to_numpy()
+        bbox = self.statistics.latest["bbox"]
+        if self.boundary == "grow":
+            board, bbox = self.grow(board, bbox)
+        population = self.statistics.latest["population"]
+        new_board, births, deaths, new_bbox = self.step_cells(board, bbox)
+        changes_made = births > 0 or deaths > 0
+        self.new_board = Array2D.from_numpy(new_board)
+        self.current_board = self.new_board
+        self.generation += 1
+
+        population += births - deaths
+        self.statistics.record(self.generation, population, births, deaths, new_bbox)
+        if self.history is not None:
+            self.history.record(self.generation, new_board, self.origin)
+        return changes_made
+
+    def step_cells(self, board:np.ndarray, bbox:tuple[int, int, int, int]|None) -> tuple[np.ndarray, int, int, tuple[int, int, int, int]|None]:
+        """ Steps a board, only looking at the cells in and next to the
+            bounding box of its live cells when that is well under the
+            whole board, so the time taken follows the size of the
+            pattern rather than the board. Ages, if kept, are updated in
+            place by the engine over the same cells, the cells beyond them
+            being dead with an age of 0 before and after. The engine counts
+            births and deaths and finds the new bounding box as part of the
+            step (see LookupEngine.step_counted).
+
+            Args:
+                board (np.ndarray): a 2D boolean array of live cells.
+                bbox (tuple[int, int, int, int]|None): the bounding box of its live cells.
+            Returns:
+                new_board (np.ndarray): the next generation.
+                births (int): the number of cells born.
+                deaths (int): the number of cells that died.
+                new_bbox (tuple[int, int, int, int]|None): the bounding box of the next generation.
+        """
+        rows, columns = board.shape
+        # without births from nothing, cells more than one away from every live cell stay dead
+        if 0 not in self.engine.rule.birth:
+            if bbox is None:
+                return np.zeros_like(board), 0, 0, None
+            top = max(bbox[0] - 1, 0)
+            left = max(bbox[1] - 1, 0)
+            bottom = min(bbox[2] + 2, rows)
+            right = min(bbox[3] + 2, columns)
+            # cells beyond the box are dead, which is only true of the edges for dead edges
+            inside = top > 0 and left > 0 and bottom < rows and right < columns
+            if (inside is True or self.engine_boundary() == "dead") and (bottom - top) * (right - left) * 2 <= rows * columns:
+                cells = board[top:bottom, left:right]
+                ages = None if self.ages is None else self.ages[top:bottom, left:right]
+                new_cells, births, deaths, new_bbox = self.engine.step_padded_counted(np.pad(cells.astype(np.uint16), 1), ages)
+                new_board = np.zeros_like(board)
+                new_board[top:bottom, left:right] = new_cells
+                if new_bbox is not None:
+                    new_bbox = (new_bbox[0] + top, new_bbox[1] + left, new_bbox[2] + top, new_bbox[3] + left)
+                return new_board, births, deaths, new_bbox
+
+        return self.engine.step_counted(board, self.ages)
+
+    def grow(self, board:np.ndarray, bbox:tuple[int, int, int, int]|None) -> tuple[np.ndarray, tuple[int, int, int, int]|None]:
+        """ Adds dead rows or columns on each side of a board that live
+            cells have come within World.GROWTH_MARGIN of. Each side grows
+            by half the board at a time, so a pattern travelling outwards
+            costs a copy of the board only every so often.
+
+            Args:
+                board (np.ndarray): a 2D boolean array of live cells.
+                bbox (tuple[int, int, int, int]|None): the bounding box of its live cells.
+            Returns:
+                board (np.ndarray): the board, grown or not.
+                bbox (tuple[int, int, int, int]|None): the bounding box on that board.
+        """
+        if bbox is None:
+            return board, bbox
+        rows, columns = board.shape
+        margin = World.GROWTH_MARGIN
+
+        def growth(size:int, near_start:bool, near_end:bool) -> tuple[int, int]:
+            room = World.MAX_GROWN_SIZE - size
+            step = max(size // 2, 16)
+            start = min(step, room) if near_start else 0
+            end = min(step, room - start) if near_end else 0
+            return start, end
+
+        grow_top, grow_bottom = growth(rows, bbox[0] < margin, bbox[2] >= rows - margin)
+        grow_left, grow_right = growth(columns, bbox[1] < margin, bbox[3] >= columns - margin)
+        if grow_top == grow_bottom == grow_left == grow_right == 0:
+            return board, bbox
+
+        grown = np.zeros((rows + grow_top + grow_bottom, columns + grow_left + grow_right), dtype=bool)
+        grown[grow_top:grow_top + rows, grow_left:grow_left + columns] = board
+        if self.ages is not None:
+            ages = np.zeros(grown.shape, dtype=np.uint8)
+            ages[grow_top:grow_top + rows, grow_left:grow_left + columns] = self.ages
+            self.ages = ages
+        self.rows, self.columns = grown.shape
+        self.origin = (self.origin[0] + grow_top, self.origin[1] + grow_left)
+        return grown, (bbox[0] + grow_top, bbox[1] + grow_left, bbox[2] + grow_top, bbox[3] + grow_left)
+
+    def restore(self, board:Array2D, generation:int, origin:tuple[int, int]|None=None, ages:np.ndarray|None=None) -> None:
+        """ Sets the world back (or forward) to an earlier board of its
+            own, like one kept in its history, dropping the statistics of
+            later generations.
+
+            Args:
+                board (Array2D): the board.
+                generation (int): the generation number of the board.
+                origin (tuple[int, int]|None): the origin of the board if it
+                may have grown since, None to keep the current one.
+                ages (np.ndarray|None): the ages of the board's cells if ages
+                are kept and known, otherwise they start over from the board.
+            Returns:
+                None
+        """
+        self.current_board = board
+        self.rows, self.columns = board.dimensions
+        if origin is not None:
+            self.origin = origin
+        if self.ages is not None:
+            # ages are updated in place as the world steps, so the ones given are left as they are
+            self.ages = ages.copy() if ages is not None else board.to_numpy().astype(np.uint8)
+        self.generation = generation
+        self.statistics.truncate(generation)
+        latest = self.statistics.latest
+        if latest is None or latest["generation"] != generation:
+            # the counts of the generation are not kept, so count again to carry on from
+            cells = board.to_numpy()
+            self.statistics.record(generation, int(np.count_nonzero(cells)), 0, 0, World.bounding_box(cells))
+
+    @staticmethod
+    def bounding_box(cells:np.ndarray) -> tuple[int, int, int, int]|None:
+        """ Finds the smallest box holding every live cell.
+
+            Args:
+                cells (np.ndarray): a 2D boolean array of live cells.
+            Returns:
+                bbox (tuple[int, int, int, int]|None): the top row, left column,
+                bottom row and right column of the box, or None if no cells are alive.
+        """
+        return LookupEngine.bounding_box(cells)